@@ -2,11 +2,479 @@
 import random
 import time
 import os
+import shutil
+import json
+import struct
+import re
+import bisect
+import threading
 from termcolor import colored, cprint
-from pyfiglet import figlet_format
-import pygame
+from appdirs import user_data_dir, user_cache_dir
 import sys
-import keyboard
+
+# Heavy dependencies (pygame, pyfiglet, keyboard, numpy, asyncio) are imported
+# by the features that use them, so headless tools and quick commands start fast.
+
+
+def user_data_path(*parts):
+    """
+    Build a path inside the per-user data folder, creating parent folders as needed.
+
+    Args:
+        *parts (str): Path components relative to the data folder
+
+    Returns:
+        str: The absolute path
+    """
+    path = os.path.join(user_data_dir("Battleships", "ZYLO-X"), *parts)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    return path
+
+
+def user_cache_path(*parts):
+    """
+    Build a path inside the per-user cache folder, creating parent folders as needed.
+
+    Args:
+        *parts (str): Path components relative to the cache folder
+
+    Returns:
+        str: The absolute path
+    """
+    path = os.path.join(user_cache_dir("Battleships", "ZYLO-X"), *parts)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    return path
+
+
+class Metrics:
+    """
+    Process-wide counters and histograms with a Prometheus text export.
+    Every thread updates its own shard without taking a lock, and shards are
+    only added together when the metrics are scraped, so instrumented hot
+    paths stay cheap even with many worker threads.
+    """
+    # Upper bounds (seconds) of the histogram buckets, 10us up to ~10s
+    BUCKETS = [0.00001 * (2 ** i) for i in range(21)]
+    
+    def __init__(self):
+        """Initialize an empty registry."""
+        self._local = threading.local()
+        self._shards = []
+        self._lock = threading.Lock()  # Only guards adding a new thread's shard
+        self._descriptions = {}
+        self._gauges = {}
+    
+    def describe(self, name, kind, help_text):
+        """
+        Register a metric's type and help text for the export.
+        
+        Args:
+            name (str): Metric name
+            kind (str): "counter", "gauge" or "histogram"
+            help_text (str): One-line description
+        """
+        self._descriptions[name] = (kind, help_text)
+    
+    def inc(self, name, value=1, **labels):
+        """
+        Add to a counter.
+        
+        Args:
+            name (str): Metric name
+            value (float): Amount to add
+            **labels: Label values
+        """
+        try:
+            shard = self._local.shard
+        except AttributeError:
+            shard = self._new_shard()
+        key = (name, tuple(labels.items()))  # Label order is normalized when collecting
+        shard[key] = shard.get(key, 0) + value
+    
+    def observe(self, name, value, **labels):
+        """
+        Record one sample in a histogram.
+        
+        Args:
+            name (str): Metric name
+            value (float): The sample, in seconds for timings
+            **labels: Label values
+        """
+        try:
+            shard = self._local.shard
+        except AttributeError:
+            shard = self._new_shard()
+        key = (name, tuple(labels.items()))
+        counts = shard.get(key)
+        if counts is None:
+            # One slot per bucket, then the overflow bucket, the sum and the count
+            counts = shard[key] = [0] * (len(self.BUCKETS) + 3)
+        counts[bisect.bisect_left(self.BUCKETS, value)] += 1
+        counts[-2] += value
+        counts[-1] += 1
+    
+    def gauge(self, name, function):
+        """
+        Register a gauge whose value is read when the metrics are scraped.
+        
+        Args:
+            name (str): Metric name
+            function (callable): Returns the current value
+        """
+        self._gauges[name] = function
+    
+    def collect(self):
+        """
+        Add up the shards of every thread.
+        
+        Returns:
+            dict: (name, labels) -> counter value or histogram slots
+        """
+        totals = {}
+        for shard in list(self._shards):
+            for (name, labels), value in shard.copy().items():
+                key = (name, tuple(sorted(labels)))
+                if isinstance(value, list):
+                    slots = totals.setdefault(key, [0] * len(value))
+                    for i, count in enumerate(list(value)):
+                        slots[i] += count
+                else:
+                    totals[key] = totals.get(key, 0) + value
+        return totals
+    
+    def render(self):
+        """
+        Format every metric in the Prometheus text exposition format.
+        
+        Returns:
+            str: The exposition text
+        """
+        by_name = {}
+        for (name, labels), value in self.collect().items():
+            by_name.setdefault(name, []).append((labels, value))
+        for name, function in list(self._gauges.items()):
+            try:
+                by_name[name] = [((), function())]
+            except Exception:
+                continue  # A failing gauge must not break the whole scrape
+        
+        lines = []
+        for name in sorted(by_name):
+            kind, help_text = self._descriptions.get(name, ("untyped", name))
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, value in sorted(by_name[name]):
+                if not isinstance(value, list):
+                    lines.append(f"{name}{self._labels(labels)} {value}")
+                    continue
+                cumulative = 0
+                for bound, count in zip(self.BUCKETS + ["+Inf"], value):
+                    cumulative += count
+                    le = bound if bound == "+Inf" else f"{bound:.6g}"
+                    lines.append(f"{name}_bucket{self._labels(labels + (('le', le),))} {cumulative}")
+                lines.append(f"{name}_sum{self._labels(labels)} {value[-2]}")
+                lines.append(f"{name}_count{self._labels(labels)} {value[-1]}")
+        return "\n".join(lines) + "\n"
+    
+    def write(self, path):
+        """
+        Dump the metrics to a text file, replacing it atomically.
+        
+        Args:
+            path (str): Destination file, e.g. for a node exporter textfile collector
+        """
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            f.write(self.render())
+        os.replace(temp_path, path)
+    
+    def write_periodically(self, path, interval=5.0):
+        """
+        Keep rewriting the metrics file from a background thread.
+        
+        Args:
+            path (str): Destination file
+            interval (float): Seconds between dumps
+        """
+        def dump():
+            while True:
+                try:
+                    self.write(path)
+                except OSError as e:
+                    print(f"Warning: metrics file not written: {e}", file=sys.stderr)
+                time.sleep(interval)
+        
+        threading.Thread(target=dump, name="metrics-file", daemon=True).start()
+    
+    def serve(self, port, host="127.0.0.1"):
+        """
+        Serve the metrics over HTTP at /metrics from a background thread.
+        
+        Args:
+            port (int): TCP port, 0 picks a free one
+            host (str): Interface to listen on
+            
+        Returns:
+            http.server.ThreadingHTTPServer: The running server
+        """
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+        
+        metrics = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = metrics.render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+            
+            def log_message(self, format, *args):
+                pass  # Scrapes are too frequent to log
+        
+        server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+        return server
+    
+    def _new_shard(self):
+        """Create the calling thread's shard on its first update."""
+        shard = self._local.shard = {}
+        with self._lock:
+            self._shards.append(shard)
+        return shard
+    
+    @staticmethod
+    def _labels(labels):
+        """Format label pairs as {name="value",...}."""
+        if not labels:
+            return ""
+        return "{" + ",".join(f'{name}="{value}"' for name, value in labels) + "}"
+
+
+# Shared registry for the whole process
+METRICS = Metrics()
+METRICS.describe("battleships_games_active", "gauge", "Games currently in progress")
+METRICS.describe("battleships_turns_total", "counter", "Rounds played (a player shot and an AI shot)")
+METRICS.describe("battleships_attacks_total", "counter", "Attacks registered on a board, by outcome")
+METRICS.describe("battleships_ai_think_seconds", "histogram", "Time the AI spent choosing a target")
+METRICS.describe("battleships_render_seconds", "histogram", "Time spent composing a battle screen frame")
+METRICS.describe("battleships_cache_requests_total", "counter", "Cache lookups, by cache and result")
+
+
+class Pacer:
+    """
+    Central scheduler for every presentation delay in the game.
+    Delays are scaled by a speed multiplier, can be skipped by pressing a key
+    (Enter on POSIX terminals) and vanish entirely in zero-delay mode.
+    """
+    def __init__(self, speed=1.0, instant=False, skip_on_keypress=True):
+        """
+        Initialize the pacer.
+        
+        Args:
+            speed (float): Speed multiplier, 2.0 halves every delay
+            instant (bool): Zero-delay mode for automated runs
+            skip_on_keypress (bool): Whether a keypress skips the running animation
+        """
+        self.speed = speed
+        self.instant = instant or speed <= 0
+        self.skip_on_keypress = skip_on_keypress
+        self.skipping = False  # Set by a keypress, cleared when the game next asks for input
+    
+    def sleep(self, seconds):
+        """
+        Pause for a scaled delay, returning early if a key is pressed.
+        
+        Args:
+            seconds (float): The delay at normal speed
+        """
+        if self.instant or self.skipping:
+            return
+        delay = seconds / self.speed
+        if not self.skip_on_keypress or not sys.stdin.isatty():
+            time.sleep(delay)
+            return
+        if self._wait_for_key(delay):
+            self.skipping = True
+    
+    async def sleep_async(self, seconds):
+        """
+        Awaitable version of sleep() that leaves the event loop free.
+        
+        Args:
+            seconds (float): The delay at normal speed
+        """
+        if self.instant or self.skipping:
+            return
+        import asyncio
+        await asyncio.to_thread(self.sleep, seconds)
+    
+    def resume(self):
+        """End a keypress skip; called whenever the game waits for player input."""
+        self.skipping = False
+    
+    def _wait_for_key(self, delay):
+        """
+        Wait up to delay seconds for a keypress, consuming it.
+        
+        Returns:
+            bool: True if a key was pressed
+        """
+        deadline = time.monotonic() + delay
+        if os.name == "nt":
+            import msvcrt
+            while True:
+                if msvcrt.kbhit():
+                    msvcrt.getwch()
+                    return True
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                time.sleep(min(0.02, remaining))
+        else:
+            import select
+            remaining = delay
+            while remaining > 0:
+                ready, _, _ = select.select([sys.stdin], [], [], remaining)
+                if ready:
+                    # Canonical mode delivers whole lines; drop it so it never reaches a prompt
+                    sys.stdin.readline()
+                    return True
+                remaining = deadline - time.monotonic()
+            return False
+
+
+class FrameRenderer:
+    """
+    Redraws full-screen frames by rewriting only the lines that changed.
+    Keeps the previously drawn frame and uses ANSI cursor positioning instead
+    of clearing the terminal, which avoids flicker and process spawns.
+    """
+    # Lines kept free below the frame for prompts and attack results
+    PROMPT_RESERVE = 8
+    
+    def __init__(self, stream=None):
+        """
+        Initialize the renderer.
+        
+        Args:
+            stream: Text stream to draw on, defaults to sys.stdout
+        """
+        self.stream = stream or sys.stdout
+        self.previous = None  # Lines of the frame currently on screen
+    
+    def invalidate(self):
+        """Forget the frame on screen, forcing the next draw to repaint everything."""
+        self.previous = None
+    
+    def clear(self):
+        """Clear the terminal and home the cursor."""
+        self.stream.write("\033[2J\033[H")
+        self.stream.flush()
+        self.invalidate()
+    
+    def update_line(self, index, line):
+        """
+        Rewrite one line of the frame on screen without moving the cursor.
+        
+        Args:
+            index (int): Line index within the frame
+            line (str): The new, already colored line
+        """
+        if self.previous is None or index >= len(self.previous):
+            return
+        # Save the cursor so text the player is typing stays where it is
+        self.stream.write(f"\0337\033[{index + 1};1H{line}\033[K\0338")
+        self.stream.flush()
+        self.previous[index] = line
+    
+    def draw(self, lines):
+        """
+        Draw a frame anchored at the top-left corner of the terminal.
+        
+        Args:
+            lines (list): The frame's lines, already colored
+        """
+        # If prompts below the frame could scroll the screen, absolute rows are unreliable
+        height = shutil.get_terminal_size().lines
+        if len(lines) + self.PROMPT_RESERVE > height:
+            self.invalidate()
+        
+        # Compose the whole update in one buffer so it reaches the terminal in a single write
+        if self.previous is None:
+            buffer = ["\033[2J\033[H", "\n".join(lines), "\n"]
+        else:
+            buffer = []
+            for index, line in enumerate(lines):
+                if index >= len(self.previous) or self.previous[index] != line:
+                    buffer.append(f"\033[{index + 1};1H{line}\033[K")
+            for index in range(len(lines), len(self.previous)):
+                buffer.append(f"\033[{index + 1};1H\033[K")
+            # Park the cursor under the frame and wipe the previous turn's prompts
+            buffer.append(f"\033[{len(lines) + 1};1H\033[J")
+        self.stream.write("".join(buffer))
+        self.stream.flush()
+        self.previous = list(lines)
+
+
+class ConsoleInput:
+    """
+    Reads player input interactively from the console.
+    """
+    # Interactive sources get prompts and "press Enter" pauses
+    interactive = True
+    
+    def read_line(self):
+        """
+        Read one line of input.
+        
+        Returns:
+            str: The entered line without the trailing newline
+            
+        Raises:
+            EOFError: If input has ended
+        """
+        return input()
+
+
+class ScriptInput:
+    """
+    Reads player commands from a script file or a pipe.
+    Blank lines and lines starting with "#" are ignored, and no prompts or
+    "press Enter" pauses are expected, so a script only lists the choices.
+    """
+    interactive = False
+    
+    def __init__(self, stream):
+        """
+        Initialize the script reader.
+        
+        Args:
+            stream (file): Open text stream to read commands from
+        """
+        self.stream = stream
+        self.line_number = 0
+    
+    def read_line(self):
+        """
+        Read the next command.
+        
+        Returns:
+            str: The command line without surrounding whitespace
+            
+        Raises:
+            EOFError: If the script has no commands left
+        """
+        for line in self.stream:
+            self.line_number += 1
+            line = line.strip()
+            if line and not line.startswith("#"):
+                return line
+        raise EOFError("end of input script")
 
 
 class UI:
@@ -19,16 +487,18 @@ class UI:
         Set the terminal to exclusive fullscreen mode using the keyboard library.
         Simulates pressing F11 to trigger fullscreen mode.
         """
+        if not self.input.interactive:
+            return
         try:
+            import keyboard
             keyboard.press('f11')
             # Brief pause to allow the fullscreen transition to complete
-            import time
-            time.sleep(0.5)
+            self.pacer.sleep(0.5)
             self.clear_screen()  # Clear screen to utilize the new display area
         except Exception as e:
             # Fallback if keyboard library fails
             print("For the best experience, press F11 to enter fullscreen mode.")
-            time.sleep(2)
+            self.pacer.sleep(2)
     # ASCII art resources
     SHIP_ART = """ 
 
@@ -60,13 +530,108 @@ class UI:
                             ▀▄▄▄▄▀▀▄▄▀▄▄▀▀▄▄▄▀▀▀▄▄▄▀▀▄▄▄▄▄▀▄▄▄▄▄▀▄▄▄▄▄▀▄▀▄▀▄▄▄▀▄▄▄▀▀▀
                             """
     
-    def __init__(self, sound_manager):
-        """Initialize the UI with a sound manager for audio feedback."""
+    def __init__(self, sound_manager, pacer=None, input_source=None):
+        """
+        Initialize the UI with a sound manager for audio feedback.
+        
+        Args:
+            sound_manager (SoundManager): Sound manager for audio feedback
+            pacer (Pacer): Scheduler for all screen delays
+            input_source (ConsoleInput): Where player input comes from, defaults to the console
+        """
         self.sound_manager = sound_manager
+        self.pacer = pacer or Pacer()
+        self.input = input_source or ConsoleInput()
+        self.renderer = FrameRenderer()
+        self.last_frame_build_time = 0.0  # Seconds spent composing the last board frame
+        if os.name == 'nt':
+            # An empty shell command switches the Windows console into ANSI (VT) mode
+            os.system('')
     
     def clear_screen(self):
         """Clear the console screen for a clean display."""
-        os.system('cls' if os.name == 'nt' else 'clear')
+        self.renderer.clear()
+    
+    def read_line(self):
+        """
+        Read one line of player input.
+        Any animation skip ends here, so the next screen plays normally.
+        
+        Returns:
+            str: The entered line without the trailing newline
+        """
+        self.pacer.resume()
+        return self.input.read_line()
+    
+    def ask(self, prompt, color="cyan", attrs=None):
+        """
+        Prompt the player and read their answer.
+        The prompt is only shown for interactive input.
+        
+        Args:
+            prompt (str): The question to show
+            color (str): Prompt color
+            attrs (list): Extra termcolor attributes for the prompt
+            
+        Returns:
+            str: The entered line
+        """
+        if self.input.interactive:
+            cprint(prompt, color, attrs=attrs)
+        return self.read_line()
+    
+    def wait_for_enter(self):
+        """Wait for the player to press Enter, skipped for scripted input."""
+        if self.input.interactive:
+            self.read_line()
+    
+    @staticmethod
+    def parse_coordinates(text):
+        """
+        Parse a complete target such as "3,7", "3 7" or "D7".
+        Letters A-J name rows 0-9, so "D7" is row 3, column 7.
+        
+        Args:
+            text (str): The entered target
+            
+        Returns:
+            tuple: (row, col), or None if the text is not a complete target
+        """
+        match = re.fullmatch(r"\s*([0-9A-Ja-j])\s*[,\s]?\s*([0-9])\s*", text)
+        if match is None:
+            return None
+        row, col = match.groups()
+        if row.isdigit():
+            # Plain digits need a separator, "37" is not a target
+            if not re.search(r"[,\s]", text.strip()):
+                return None
+            return int(row), int(col)
+        return ord(row.upper()) - ord("A"), int(col)
+    
+    @classmethod
+    def parse_placement(cls, text):
+        """
+        Parse a ship placement such as "Carrier 0 0 H", "0,0,V" or "D7 H".
+        
+        Args:
+            text (str): The entered placement
+            
+        Returns:
+            tuple: (ship name or None, row, col, orientation) where orientation is
+                "horizontal" or "vertical", or None if the text is not a complete placement
+        """
+        parts = text.split()
+        name = None
+        if parts and parts[0].capitalize() in Ship.SHIP_SIZES:
+            name = parts.pop(0).capitalize()
+        match = re.fullmatch(r"(.*?)[,\s]*\b(H|V|HORIZONTAL|VERTICAL)", " ".join(parts).upper())
+        if match is None:
+            return None
+        target = cls.parse_coordinates(match.group(1))
+        if target is None:
+            return None
+        orientation = "horizontal" if match.group(2).startswith("H") else "vertical"
+        return name, target[0], target[1], orientation
     
     def loading_screen(self):
         """
@@ -75,12 +640,54 @@ class UI:
         """
         print("\n" * 6)  # Create vertical space
         # Display the game title in ASCII art with blinking effect
-        cprint(figlet_format('    ZYLO_ X', font='starwars'), 'white', 'on_black', attrs=['blink'])
-        cprint(figlet_format('STUDIOS', font='slant'), 'light_green', 'on_black', attrs=['blink'])
+        cprint(self.figlet_banner('    ZYLO_ X', 'starwars'), 'white', 'on_black', attrs=['blink'])
+        cprint(self.figlet_banner('STUDIOS', 'slant'), 'light_green', 'on_black', attrs=['blink'])
         print()
-        time.sleep(1.5)   # Pause for 1 second
+        self.pacer.sleep(1.5)   # Pause for 1 second
         self.clear_screen()
 
+    # Rendered figlet banners, keyed by (text, font)
+    _banner_cache = {}
+    
+    @classmethod
+    def figlet_banner(cls, text, font):
+        """
+        Render text as a figlet banner, reusing earlier renders.
+        Banners are cached in memory and on disk, so pyfiglet and its fonts
+        are only loaded the first time a banner is ever shown.
+        
+        Args:
+            text (str): The banner text
+            font (str): The figlet font name
+            
+        Returns:
+            str: The rendered banner
+        """
+        key = (text, font)
+        banner = cls._banner_cache.get(key)
+        if banner is not None:
+            METRICS.inc("battleships_cache_requests_total", cache="figlet", result="hit")
+            return banner
+        
+        import hashlib
+        digest = hashlib.sha1(f"{font}\0{text}".encode("utf-8")).hexdigest()[:16]
+        path = user_cache_path("figlet", f"{font}-{digest}.txt")
+        try:
+            with open(path, encoding="utf-8") as f:
+                banner = f.read()
+            METRICS.inc("battleships_cache_requests_total", cache="figlet", result="hit")
+        except OSError:
+            METRICS.inc("battleships_cache_requests_total", cache="figlet", result="miss")
+            from pyfiglet import figlet_format
+            banner = figlet_format(text, font=font)
+            try:
+                with open(path, "w", encoding="utf-8") as f:
+                    f.write(banner)
+            except OSError:
+                pass  # Caching is optional
+        cls._banner_cache[key] = banner
+        return banner
+    
     def ship_screen(self):
         """
         Display the ship ASCII art as part of the intro sequence.
@@ -90,7 +697,7 @@ class UI:
         cprint(self.LOGO_ART, "red")
         print(self.SHIP_ART)
         cprint(self.WATER_ART, "cyan")
-        time.sleep(3)
+        self.pacer.sleep(3)
         self.clear_screen()
 
     def display_rules(self):
@@ -108,9 +715,9 @@ class UI:
         cprint("\n[SYSTEM INITIALIZED]", "green")
         for _ in range(3):
             cprint(".", "green", end="", flush=True)
-            time.sleep(0.3)
+            self.pacer.sleep(0.3)
         cprint(" LOADING MISSION BRIEFING", "green")
-        time.sleep(0.5)
+        self.pacer.sleep(0.5)
     
         # Top border
         cprint("\n╔════════════════════════════════════════════════════════════════════════════╗", "cyan")
@@ -157,17 +764,17 @@ class UI:
     
         # Final instructions with vintage computer effect
         cprint("\n[TRANSMISSION]", "green")
-        time.sleep(0.3)
+        self.pacer.sleep(0.3)
     
         message = "PLAN YOUR ATTACKS STRATEGICALLY, ADMIRAL. THE FATE OF THE FLEET RESTS IN YOUR HANDS."
         for char in message:
             cprint(char, "green", end="", flush=True)
-            time.sleep(0.02)
+            self.pacer.sleep(0.02)
     
         cprint("\n\n[END OF BRIEFING]", "green")
         cprint("\n[PRESS ENTER TO BEGIN DEPLOYMENT]", "yellow", attrs=["blink"])
     
-        input()  # Wait for the player to press Enter
+        self.wait_for_enter()
     
     def select_difficulty(self):
         """
@@ -221,8 +828,7 @@ class UI:
             cprint("╚══════════════════════════════════════════════════════════════════════════════╝", "yellow")
         
             # Get player input
-            cprint("\n[AWAITING COMMAND] Enter your selection (1 or 2): ", "cyan", attrs=["bold"])
-            difficulty = input()
+            difficulty = self.ask("\n[AWAITING COMMAND] Enter your selection (1 or 2): ", attrs=["bold"]).strip()
         
             if difficulty == "1":
                 self.clear_screen()
@@ -231,7 +837,7 @@ class UI:
                 cprint("╚══════════════════════════════════════════════════════════════════════╝", "green")
                 cprint("\nPreparing for standard naval operations...", "white")
                 cprint("The enemy fleet appears to be using conventional tactics.", "white")
-                time.sleep(2)
+                self.pacer.sleep(2)
                 return "normal"
             elif difficulty == "2":
                 self.clear_screen()
@@ -241,11 +847,11 @@ class UI:
                 cprint("\nInitiating advanced combat simulation...", "white")
                 cprint("Intelligence reports the enemy commander is highly skilled.", "white")
                 cprint("Steel yourself for a challenging engagement, Admiral.", "white")
-                time.sleep(2)
+                self.pacer.sleep(2)
                 return "hard"
             else:
                 cprint("\nInvalid selection. Please enter 1 for Normal or 2 for Hard.", "red")
-                time.sleep(1.5)
+                self.pacer.sleep(1.5)
     def get_placement_choice(self):
         """
         Ask the player how they want to place their ships with detailed explanations.
@@ -304,8 +910,7 @@ class UI:
         
 
             # Input prompt
-            cprint("\n[AWAITING COMMAND] Enter deployment protocol (1 or 2): ", "cyan", attrs=["bold"])
-            choice = input().strip()
+            choice = self.ask("\n[AWAITING COMMAND] Enter deployment protocol (1 or 2): ", attrs=["bold"]).strip()
         
             if choice == "1":
                 self.clear_screen()
@@ -314,7 +919,7 @@ class UI:
                 cprint("╚══════════════════════════════════════════════════════════════════════╝", "blue")
                 cprint("\nComputer algorithms positioning fleet...", "white")
                 cprint("Randomizing vessel coordinates for optimal unpredictability...", "white")
-                time.sleep(1.5)
+                self.pacer.sleep(1.5)
                 return "random"
             elif choice == "2":
                 self.clear_screen()
@@ -323,11 +928,11 @@ class UI:
                 cprint("╚══════════════════════════════════════════════════════════════════════╝", "magenta")
                 cprint("\nInitializing tactical grid interface...", "white")
                 cprint("Prepare to position your vessels, Admiral.", "white")
-                time.sleep(1.5)
+                self.pacer.sleep(1.5)
                 return "manual"
             else:
                 cprint("\nInvalid selection. Please enter 1 for Automatic or 2 for Manual Deployment.", "red")
-                time.sleep(1.5)
+                self.pacer.sleep(1.5)
     
     def display_manual_placement_instructions(self):
         """Display instructions for manual ship placement."""
@@ -344,7 +949,7 @@ class UI:
         cprint("║ Remember, strategic positioning is critical for naval victory!             ║", "white")
         cprint("╚════════════════════════════════════════════════════════════════════════════╝", "cyan")
         cprint("\n[PRESS ENTER TO BEGIN DEPLOYMENT]", "yellow", attrs=["blink"])
-        input()
+        self.wait_for_enter()
 
     def display_ship_placement_board(self, board, ship_name, ship_size):
         """
@@ -355,47 +960,135 @@ class UI:
             ship_name (str): Name of the ship being placed
             ship_size (int): Size of the ship being placed
         """
-        self.clear_screen()
-        
-        # Display current board
-        cprint("\n╔══════════════════════════════════════════════════════════════╗", "cyan")
-        cprint("║                   FLEET DEPLOYMENT INTERFACE                 ║", "cyan", attrs=["bold"])
-        cprint("╚══════════════════════════════════════════════════════════════╝", "cyan")
+        chrome = self._chrome()
+        glyphs = self._glyphs()
         
-        # Column headers
-        cprint("    " + "  ".join(f"{i}" for i in range(10)), "yellow")
+        # Current board
+        lines = list(chrome["placement_header"])
         
-        # Grid border
-        cprint("  ┌" + "─" * 31 + "┐", "cyan")
-        
-        # Print rows
         for idx, row in enumerate(board.visible_grid):
-            formatted_row = " ".join(self._format_cell(cell) for cell in row)
-            cprint(f"{idx} │ {formatted_row} │", "cyan")
+            formatted_row = " ".join([glyphs.get(cell) or self._format_cell(cell) for cell in row])
+            lines.append(colored(f"{idx} │ {formatted_row} │", "cyan"))
         
-        # Bottom grid border
-        cprint("  └" + "─" * 31 + "┘", "cyan")
+        lines.append(chrome["placement_footer"])
         
         # Special case for "All ships" display
+        lines.append("")
         if ship_name == "All ships":
-            cprint(f"\nFleet deployment complete!", "green", attrs=["bold"])
-            cprint(f"All ships have been positioned on the grid.", "yellow")
+            lines.append(colored("Fleet deployment complete!", "green", attrs=["bold"]))
+            lines.append(colored("All ships have been positioned on the grid.", "yellow"))
         else:
             # Display ship information for normal placement
-            cprint(f"\nCurrently placing: {ship_name} (Size: {ship_size})", "green", attrs=["bold"])
+            lines.append(colored(f"Currently placing: {ship_name} (Size: {ship_size})", "green", attrs=["bold"]))
             emoji = Ship.SHIP_EMOJIS[ship_name]
-            cprint(f"Ship symbol: {emoji}", "yellow")
+            lines.append(colored(f"Ship symbol: {emoji}", "yellow"))
+        
+        self.renderer.draw(lines)
+    
+    # Pre-colored cell glyphs and static frame lines, built on first use
+    _glyph_cache = None
+    _chrome_cache = None
     
     def _format_cell(self, cell):
-        """Format a single cell for display during ship placement."""
-        if cell == "X":  # Hit
-            return colored("💥", "red", attrs=["bold"])
-        elif cell == "O":  # Miss
-            return colored("⭕", "white")
-        elif cell in Ship.SHIP_EMOJIS.values():  # Ship
-            return colored(cell, "yellow")
-        else:  # Water
-            return colored("🟦", "blue")
+        """
+        Format a single grid cell, caching the colored glyph.
+        
+        Args:
+            cell (str): Grid symbol ("X", "O", a ship emoji or water)
+            
+        Returns:
+            str: The colored glyph
+        """
+        glyphs = self._glyphs()
+        glyph = glyphs.get(cell)
+        if glyph is None:
+            if cell == "X":  # Hit
+                glyph = colored("💥", "red", attrs=["bold"])
+            elif cell == "O":  # Miss
+                glyph = colored("⭕", "white")
+            elif cell in Ship.SHIP_EMOJIS.values():  # Ship
+                glyph = colored(cell, "yellow")
+            else:  # Water
+                glyph = colored("🟦", "blue")
+            glyphs[cell] = glyph
+        return glyph
+    
+    @classmethod
+    def _glyphs(cls):
+        """Get the shared glyph cache."""
+        if cls._glyph_cache is None:
+            cls._glyph_cache = {}
+        return cls._glyph_cache
+    
+    @classmethod
+    def _chrome(cls):
+        """
+        Get the pre-colored static lines shared by every frame.
+        
+        Returns:
+            dict: Template name to a colored line (or list of lines)
+        """
+        if cls._chrome_cache is not None:
+            return cls._chrome_cache
+        
+        numbers = "  ".join(f"{i}" for i in range(10))
+        cls._chrome_cache = {
+            "header": [
+                colored("╔══════════════════════════════════════════════════════════════════════════════╗", "cyan"),
+                colored("║                          NAVAL COMMAND INTERFACE                             ║", "cyan"),
+                colored("╚══════════════════════════════════════════════════════════════════════════════╝", "cyan"),
+                "",
+                colored("╔═════════════════════════════════╗", "green") +
+                colored("          ╔═════════════════════════════════╗", "red"),
+                colored("║       FRIENDLY WATERS           ║", "green") +
+                colored("          ║        ENEMY WATERS             ║", "red"),
+                colored("╚═════════════════════════════════╝", "green") +
+                colored("          ╚═════════════════════════════════╝", "red"),
+                colored("    " + numbers, "yellow") + colored("                 " + numbers, "yellow"),
+                colored(" ┌" + "─" * 31 + "┐", "cyan") + colored("            ┌" + "─" * 31 + "┐", "cyan")
+            ],
+            "row_labels": [colored(f"{idx}│", "yellow") for idx in range(10)],
+            "row_end": colored("│", "cyan"),
+            "readout": [
+                colored(" └" + "─" * 31 + "┘", "cyan") + colored("            └" + "─" * 31 + "┘", "cyan"),
+                "",
+                colored("╔══════════════════════════════════════════════════════════════════════════════╗", "yellow"),
+                colored("║                             TACTICAL READOUT                                 ║", "yellow"),
+                colored("╠══════════════════════════════════════════════════════════════════════════════╣", "yellow"),
+                colored("║  RADAR SYMBOLS:  ", "white") +
+                colored("💥 ", "red") +
+                colored("= CONFIRMED HIT    ", "white") +
+                colored("⭕ ", "white") +
+                colored("= MISS    ", "white") +
+                colored("🟦 ", "blue") +
+                colored("= UNSCANNED WATERS    ║", "white"),
+                colored("╠══════════════════════════════════════════════════════════════════════════════╣", "yellow")
+            ],
+            "fleet_header": [
+                colored("╠══════════════════════════════════════════════════════════════════════════════╣", "yellow"),
+                colored("║                           ENEMY FLEET STATUS                                 ║", "yellow")
+            ],
+            "ship_status": {
+                "DESTROYED": colored("DESTROYED", "red", attrs=["bold"]),
+                "DAMAGED": colored("DAMAGED", "yellow", attrs=["bold"]),
+                "OPERATIONAL": colored("OPERATIONAL", "green", attrs=["bold"])
+            },
+            "footer": [
+                colored("╚══════════════════════════════════════════════════════════════════════════════╝", "yellow"),
+                "",
+                colored("[SELECT TARGET COORDINATES]", "green", attrs=["bold"])
+            ],
+            "placement_header": [
+                "",
+                colored("╔══════════════════════════════════════════════════════════════╗", "cyan"),
+                colored("║                   FLEET DEPLOYMENT INTERFACE                 ║", "cyan", attrs=["bold"]),
+                colored("╚══════════════════════════════════════════════════════════════╝", "cyan"),
+                colored("    " + numbers, "yellow"),
+                colored("  ┌" + "─" * 31 + "┐", "cyan")
+            ],
+            "placement_footer": colored("  └" + "─" * 31 + "┘", "cyan")
+        }
+        return cls._chrome_cache
     
     def get_ship_placement_coordinates(self, ship_name, ship_size):
         """
@@ -408,36 +1101,38 @@ class UI:
         Returns:
             tuple: (row, col, orientation) where orientation is "horizontal" or "vertical"
         """
-        # Input row
+        # Input row, or the whole placement at once
         while True:
+            entry = self.ask(f"Enter starting ROW for {ship_name} (0-9), or a full placement such as 0 0 H: ")
+            placement = self.parse_placement(entry)
+            if placement is not None:
+                name, row, col, orientation = placement
+                if name in (None, ship_name):
+                    return row, col, orientation
+                cprint(f"That placement is for the {name}, now placing the {ship_name}.", "red")
+                continue
             try:
-                cprint(f"Enter starting ROW for {ship_name} (0-9): ", "cyan")
-                row_input = input().strip()
-                if row_input.isdigit() and 0 <= int(row_input) < 10:
-                    row = int(row_input)
+                if entry.strip().isdigit() and 0 <= int(entry) < 10:
+                    row = int(entry)
                     break
-                else:
-                    cprint("Invalid input. Please enter a number between 0 and 9.", "red")
-            except:
-                cprint("Invalid input. Please enter a number between 0 and 9.", "red")
+            except ValueError:
+                pass
+            cprint("Invalid input. Please enter a number between 0 and 9.", "red")
         
         # Input column
         while True:
+            entry = self.ask(f"Enter starting COLUMN for {ship_name} (0-9): ")
             try:
-                cprint(f"Enter starting COLUMN for {ship_name} (0-9): ", "cyan")
-                col_input = input().strip()
-                if col_input.isdigit() and 0 <= int(col_input) < 10:
-                    col = int(col_input)
+                if entry.strip().isdigit() and 0 <= int(entry) < 10:
+                    col = int(entry)
                     break
-                else:
-                    cprint("Invalid input. Please enter a number between 0 and 9.", "red")
-            except:
-                cprint("Invalid input. Please enter a number between 0 and 9.", "red")
+            except ValueError:
+                pass
+            cprint("Invalid input. Please enter a number between 0 and 9.", "red")
         
         # Input orientation
         while True:
-            cprint("Enter orientation (H for horizontal, V for vertical): ", "cyan")
-            orientation_input = input().strip().upper()
+            orientation_input = self.ask("Enter orientation (H for horizontal, V for vertical): ").strip().upper()
             if orientation_input == "H":
                 orientation = "horizontal"
                 break
@@ -453,29 +1148,18 @@ class UI:
         """
         Display both player and CPU boards in retro command console style.
         Creates an immersive naval battle station aesthetic.
+        The frame is composed from cached glyphs and chrome into one buffer,
+        and only the lines that changed since the last frame are redrawn.
     
         Args:
             player_board (Board): The player's board object
             cpu_board (Board): The CPU's board object
             cpu_ship_parts (dict): Optional tracking of CPU ship parts for display
         """
-        self.clear_screen()
-    
-        # Command console header
-        cprint("╔══════════════════════════════════════════════════════════════════════════════╗", "cyan")
-        cprint("║                          NAVAL COMMAND INTERFACE                             ║", "cyan")
-        cprint("╚══════════════════════════════════════════════════════════════════════════════╝", "cyan")
-    
-        def format_cell(cell):
-            """Render cells with military-style indicators."""
-            if cell == "X":  # Hit
-                return colored("💥", "red", attrs=["bold"])
-            elif cell == "O":  # Miss
-                return colored("⭕", "white")
-            elif cell in Ship.SHIP_EMOJIS.values():  # Ship (only visible on player's board)
-                return colored(cell, "yellow")
-            else:  # Water
-                return colored("🟦", "blue")
+        build_start = time.perf_counter()
+        chrome = self._chrome()
+        glyphs = self._glyphs()
+        format_cell = self._format_cell
     
         # Get the grid representations
         player_grid = player_board.visible_grid
@@ -490,73 +1174,33 @@ class UI:
         cpu_misses = sum(row.count("O") for row in player_grid)
         cpu_accuracy = cpu_hits / (cpu_hits + cpu_misses) * 100 if (cpu_hits + cpu_misses) > 0 else 0
     
-        # Battle grids header
-        cprint("\n╔═════════════════════════════════╗", "green", end="")
-        cprint("          ╔═════════════════════════════════╗", "red")
-        cprint("║       FRIENDLY WATERS           ║", "green", end="")
-        cprint("          ║        ENEMY WATERS             ║", "red")
-        cprint("╚═════════════════════════════════╝", "green", end="")
-        cprint("          ╚═════════════════════════════════╝", "red")
-    
-        # Column headers
-        cprint("    " + "  ".join(f"{i}" for i in range(10)), "yellow", end="")
-        cprint("                 " + "  ".join(f"{i}" for i in range(10)), "yellow")
+        # Command console header, battle grid headers and column numbers
+        lines = list(chrome["header"])
     
-        # Grid borders
-        cprint(" ┌" + "─" * 31 + "┐", "cyan", end="")
-        cprint("            ┌" + "─" * 31 + "┐", "cyan")
-    
-        # Print rows with radar-style formatting
+        # Rows with radar-style formatting
+        row_end = chrome["row_end"]
         for idx in range(10):
-            player_row = " ".join(format_cell(cell) for cell in player_grid[idx])
-            cpu_row = " ".join(format_cell(cell) for cell in cpu_grid[idx])
-        
-            cprint(f"{idx}│", "yellow", end=" ")
-            cprint(f"{player_row}", end=" ")
-            cprint("│", "cyan", end="")
-            cprint("           ", end="")
-            cprint(f"{idx}│", "yellow", end=" ")
-            cprint(f"{cpu_row}", end=" ")
-            cprint("│", "cyan")
-    
-        # Bottom grid borders
-        cprint(" └" + "─" * 31 + "┘", "cyan", end="")
-        cprint("            └" + "─" * 31 + "┘", "cyan")
-    
-        # Battle status display
-        cprint("\n╔══════════════════════════════════════════════════════════════════════════════╗", "yellow")
-        cprint("║                             TACTICAL READOUT                                 ║", "yellow")
-        cprint("╠══════════════════════════════════════════════════════════════════════════════╣", "yellow")
+            player_row = " ".join([glyphs.get(cell) or format_cell(cell) for cell in player_grid[idx]])
+            cpu_row = " ".join([glyphs.get(cell) or format_cell(cell) for cell in cpu_grid[idx]])
+            label = chrome["row_labels"][idx]
+            lines.append(f"{label} {player_row} {row_end}           {label} {cpu_row} {row_end}")
     
-        # Combat indicators
-        cprint("║  RADAR SYMBOLS:  ", "white", end="")
-        cprint("💥 ", "red", end="")
-        cprint("= CONFIRMED HIT    ", "white", end="")
-        cprint("⭕ ", "white", end="")
-        cprint("= MISS    ", "white", end="")
-        cprint("🟦 ", "blue", end="")
-        cprint("= UNSCANNED WATERS    ║", "white")
-    
-        # Combat statistics - FIXED VERSION
-        cprint("╠══════════════════════════════════════════════════════════════════════════════╣", "yellow")
+        # Bottom grid borders and the tactical readout header
+        lines.extend(chrome["readout"])
     
         # Fix 1: Properly format the player statistics line
         padding = " " * (24 - len(f"{player_accuracy:.1f}"))
         player_stats = f"║  YOUR STATISTICS: Hits: {player_hits} | Misses: {player_misses} | Accuracy: {player_accuracy:.1f}%{padding}  ║"
-        cprint(player_stats, "white")
+        lines.append(colored(player_stats, "white"))
     
         # Fix 2: Properly format the enemy statistics line
         padding = " " * (23 - len(f"{cpu_accuracy:.1f}"))
         enemy_stats = f"║  ENEMY STATISTICS: Hits: {cpu_hits} | Misses: {cpu_misses} | Accuracy: {cpu_accuracy:.1f}%{padding}  ║"
-        cprint(enemy_stats, "white")
+        lines.append(colored(enemy_stats, "white"))
     
         # Remaining enemy fleet status
         if cpu_ship_parts:
-            cprint("╠══════════════════════════════════════════════════════════════════════════════╣", "yellow")
-            cprint("║                           ENEMY FLEET STATUS                                 ║", "yellow")
-        
-            # Initialize status indicators
-            status_indicators = []
+            lines.extend(chrome["fleet_header"])
         
             for ship_name, positions in cpu_ship_parts.items():
                 emoji = Ship.SHIP_EMOJIS[ship_name]
@@ -568,24 +1212,44 @@ class UI:
                 health_bar = "█" * remaining + "░" * hits
             
                 if remaining == 0:
-                    status = colored("DESTROYED", "red", attrs=["bold"])
+                    status = chrome["ship_status"]["DESTROYED"]
                 elif hits > 0:
-                    status = colored("DAMAGED", "yellow", attrs=["bold"])
+                    status = chrome["ship_status"]["DAMAGED"]
                 else:
-                    status = colored("OPERATIONAL", "green", attrs=["bold"]) 
+                    status = chrome["ship_status"]["OPERATIONAL"]
             
                 # Format: Ship emoji, name, health bar, status
                 ship_status = f"║  {emoji} {ship_name.ljust(10)} {health_bar.ljust(6)} {status.ljust(68)}║"
-                status_indicators.append(ship_status)
-        
-            # Print all ship statuses
-            for indicator in status_indicators:
-                cprint(indicator, "white")
+                lines.append(colored(ship_status, "white"))
     
-        cprint("╚══════════════════════════════════════════════════════════════════════════════╝", "yellow")
+        # Closing border and retro-style prompt
+        lines.extend(chrome["footer"])
+        self.last_frame_build_time = time.perf_counter() - build_start
+        METRICS.observe("battleships_render_seconds", self.last_frame_build_time)
+    
+        self.renderer.draw(lines)
     
-        # Show a retro-style prompt
-        cprint("\n[SELECT TARGET COORDINATES]", "green", attrs=["bold"])
+    async def animate_status(self, label):
+        """
+        Animate the frame's bottom status line until cancelled.
+        Keeps the screen alive while waiting for input or for the AI.
+        
+        Args:
+            label (str): Text shown in front of the spinner
+        """
+        if not sys.stdout.isatty():
+            return
+        import asyncio
+        spinner = "◐◓◑◒"
+        start = time.monotonic()
+        tick = 0
+        while self.renderer.previous:
+            elapsed = int(time.monotonic() - start)
+            status = f"{label} {spinner[tick % len(spinner)]} {elapsed // 60:02d}:{elapsed % 60:02d}"
+            self.renderer.update_line(len(self.renderer.previous) - 1,
+                                      colored(status, "green", attrs=["bold"]))
+            tick += 1
+            await asyncio.sleep(0.25)
     
     def get_attack_coordinates(self):
         """
@@ -594,35 +1258,32 @@ class UI:
         Returns:
             tuple: (row, col) coordinates for attack
         """
-        # Input row from player
+        # Input row from player, or the whole target at once
         while True:
+            entry = self.ask("Enter a Row number from the grid (0 to 9), or a full target such as 3,7: ")
+            target = self.parse_coordinates(entry)
+            if target is not None:
+                return target
             try:
-                cprint("Enter a Row number from the grid (0 to 9): ", "cyan")
-                row_input = input()
-                if row_input.isdigit() and 0 <= int(row_input) < 10:
-                    row = int(row_input)
+                if entry.strip().isdigit() and 0 <= int(entry) < 10:
+                    row = int(entry)
                     break
-                else:
-                    cprint("Invalid input. Please select a valid row between 0 and 9.", "red")
-                    time.sleep(0.5)
-            except:
-                cprint("Invalid input. Please select a valid row between 0 and 9.", "red")
-                time.sleep(0.5)
+            except ValueError:
+                pass
+            cprint("Invalid input. Please select a valid row between 0 and 9.", "red")
+            self.pacer.sleep(0.5)
 
         # Input column from player
         while True:
+            entry = self.ask("Enter a Column number from the grid (0 to 9): ")
             try:
-                cprint("Enter a Column number from the grid (0 to 9): ", "cyan")
-                col_input = input()
-                if col_input.isdigit() and 0 <= int(col_input) < 10:
-                    col = int(col_input)
+                if entry.strip().isdigit() and 0 <= int(entry) < 10:
+                    col = int(entry)
                     break
-                else:
-                    cprint("Invalid input. Please select a valid column between 0 and 9.", "red")
-                    time.sleep(0.5)
-            except:
-                cprint("Invalid input. Please select a valid column between 0 and 9.", "red")
-                time.sleep(0.5)
+            except ValueError:
+                pass
+            cprint("Invalid input. Please select a valid column between 0 and 9.", "red")
+            self.pacer.sleep(0.5)
         return row, col
     
     def ask_play_again(self):
@@ -632,22 +1293,201 @@ class UI:
         Returns:
             bool: True if player wants to play again, False otherwise
         """
-        cprint("Do you want to play again? (Y/N): ", "cyan", attrs=["bold"])
-        answer = input().strip().lower()
+        answer = self.ask("Do you want to play again? (Y/N): ", attrs=["bold"]).strip().lower()
+        return answer in ["y", "yes"]
+    
+    def ask_resume_game(self):
+        """
+        Ask the player if they want to continue an interrupted mission.
+        
+        Returns:
+            bool: True if the saved game should be resumed
+        """
+        self.clear_screen()
+        cprint("\n╔══════════════════════════════════════════════════════════════════════════════╗", "yellow")
+        cprint("║                       INTERRUPTED MISSION DETECTED                           ║", "yellow", attrs=["bold"])
+        cprint("╚══════════════════════════════════════════════════════════════════════════════╝", "yellow")
+        answer = self.ask("\nResume the engagement where you left off? (Y/N): ", attrs=["bold"]).strip().lower()
         return answer in ["y", "yes"]
 
 
-class SoundManager:
+class AudioBackend:
     """
-    Manages all game sounds and sound effects.
-    Centralizes audio handling for consistent sound experience.
+    Interface between the SoundManager and an audio library.
+    Backends open the output device and turn sound files into playable
+    objects with play() and stop() methods.
     """
-    def __init__(self):
-        """Initialize pygame mixer and load all game sounds from Assets folder."""
-        import os
+    # False for backends that never produce sound, so callers can skip loading entirely
+    enabled = True
+    
+    def open(self):
+        """
+        Open the audio output device.
+        
+        Returns:
+            bool: True if sounds can be played
+        """
+        raise NotImplementedError
+    
+    def load(self, filepath):
+        """
+        Load a sound file.
+        
+        Args:
+            filepath (str): Path of the sound file
+            
+        Returns:
+            object: A sound with play() and stop() methods
+        """
+        raise NotImplementedError
+
+
+class NullAudioBackend(AudioBackend):
+    """
+    Backend that plays nothing.
+    Used when no audio device is available and for headless simulations.
+    """
+    enabled = False
+    
+    class NullSound:
+        """Sound that does nothing, to prevent crashes when audio is missing."""
+        def play(self): pass
+        def stop(self): pass
+    
+    SILENCE = NullSound()
+    
+    def open(self):
+        """Nothing to open, always succeeds."""
+        return True
+    
+    def load(self, filepath):
+        """Return the shared silent sound."""
+        return self.SILENCE
+
+
+class PygameAudioBackend(AudioBackend):
+    """
+    Backend that plays sounds through pygame.mixer.
+    Decoded audio is cached on disk so later launches skip MP3 decoding.
+    """
+    def open(self):
+        """
+        Initialize pygame mixer.
+        
+        Returns:
+            bool: False if there is no usable audio device
+        """
+        import pygame
+        
+        try:
+            pygame.mixer.init()
+        except pygame.error as e:
+            print("Warning: Could not initialize audio, sounds are disabled")
+            print(f"Error details: {e}")
+            return False
+        return True
+    
+    def load(self, filepath):
+        """
+        Load a sound, reusing decoded PCM from an earlier launch when possible.
+        The decoded samples are kept as a WAV file in the user cache folder,
+        keyed by the source file and the mixer format.
+        
+        Args:
+            filepath (str): Path of the compressed sound file
+            
+        Returns:
+            pygame.mixer.Sound: The loaded sound
+            
+        Raises:
+            OSError: If the sound file cannot be read or decoded
+        """
+        import pygame
+        import wave
+        
+        frequency, size, channels = pygame.mixer.get_init()
+        stat = os.stat(filepath)
+        name = os.path.splitext(os.path.basename(filepath))[0]
+        cache_path = user_cache_path(
+            "sounds", f"{name}-{stat.st_size}-{int(stat.st_mtime)}-{frequency}x{channels}.wav")
+        if os.path.exists(cache_path):
+            try:
+                sound = pygame.mixer.Sound(cache_path)
+                METRICS.inc("battleships_cache_requests_total", cache="sound", result="hit")
+                return sound
+            except pygame.error:
+                pass  # Damaged cache entry, decode the original again
+        METRICS.inc("battleships_cache_requests_total", cache="sound", result="miss")
+        
+        try:
+            sound = pygame.mixer.Sound(filepath)
+        except pygame.error as e:
+            raise OSError(str(e)) from e
+        if size == -16:
+            # WAV stores 16-bit samples as signed, which matches this mixer format
+            try:
+                temp_path = f"{cache_path}.{os.getpid()}.tmp"
+                with wave.open(temp_path, "wb") as f:
+                    f.setnchannels(channels)
+                    f.setsampwidth(2)
+                    f.setframerate(frequency)
+                    f.writeframes(sound.get_raw())
+                os.replace(temp_path, cache_path)
+            except OSError:
+                pass  # Caching is optional
+        return sound
+
+
+class SoundManager:
+    """
+    Manages all game sounds and sound effects.
+    Centralizes audio handling for consistent sound experience.
+    """
+    # Sound attribute -> asset file, in loading order (the intro plays first)
+    SOUND_FILES = {
+        "intro_sound": "intro.mp3",
+        "hit_sound": "Hit.mp3",
+        "miss_sound": "miss.mp3",
+        "win_sound": "win.mp3",
+        "gameover_sound": "gameover.mp3",
+        "place_ship_sound": "miss.mp3",  # Ship placement reuses the miss splash
+    }
+    
+    def __init__(self, backend=None):
+        """
+        Initialize the sound manager. Audio is set up on first use.
         
-        # Initialize pygame mixer
-        pygame.mixer.init()
+        Args:
+            backend (AudioBackend): Audio library to play through, defaults to pygame
+        """
+        self.backend = backend or PygameAudioBackend()
+        self._sounds = {}
+        self._loader = None
+        self._loader_done = False  # Set by the loader however it ends, so waiters never outlast it
+        self._loaded = threading.Condition()
+    
+    def load(self):
+        """Start loading all game sounds on a background thread."""
+        with self._loaded:
+            if self._loader is None and self.backend.enabled:
+                self._loader = threading.Thread(target=self._load_sounds, name="sound-loader", daemon=True)
+                self._loader.start()
+    
+    def _load_sounds(self):
+        """Load the sounds on the loader thread, then wake anyone still waiting for one."""
+        try:
+            self._load_assets()
+        finally:
+            with self._loaded:
+                self._loader_done = True
+                self._loaded.notify_all()
+    
+    def _load_assets(self):
+        """Open the audio device and load all game sounds from Assets folder."""
+        if not self.backend.open():
+            # No audio device, fall back to silence for the rest of the session
+            self.backend = NullAudioBackend()
+            return
         
         # Define the assets folder path
         if getattr(sys, 'frozen', False):
@@ -658,57 +1498,98 @@ class SoundManager:
             base_path = os.path.dirname(os.path.abspath(__file__))
 
         assets_folder = os.path.join(base_path, "Assets")
-
         
-        # Function to load a sound file with error handling
-        def load_sound(filename):
+        # Decode each file once, even if several sounds share it
+        for filename in dict.fromkeys(self.SOUND_FILES.values()):
             filepath = os.path.join(assets_folder, filename)
             try:
-                return pygame.mixer.Sound(filepath)
-            except pygame.error as e:
+                sound = self.backend.load(filepath)
+            except OSError as e:
                 print(f"Warning: Could not load sound file {filepath}")
                 print(f"Error details: {e}")
-                # Return a dummy sound object that does nothing to prevent crashes
-                class DummySound:
-                    def play(self): pass
-                    def stop(self): pass
-                return DummySound()
-        
-        # Load all sounds
-        self.intro_sound = load_sound("intro.mp3")
-        self.hit_sound = load_sound("Hit.mp3")
-        self.miss_sound = load_sound("miss.mp3")
-        self.win_sound = load_sound("win.mp3")
-        self.gameover_sound = load_sound("gameover.mp3")
-        self.place_ship_sound = load_sound("miss.mp3")  # New sound for ship placement
+                continue
+            with self._loaded:
+                self._sounds[filename] = sound
+                self._loaded.notify_all()
+    
+    def _sound(self, name, wait=0.0):
+        """
+        Look up a loaded sound, falling back to silence if it is not ready yet.
+        
+        Args:
+            name (str): Sound attribute name from SOUND_FILES
+            wait (float): Seconds to wait for the sound if it is still loading
+            
+        Returns:
+            object: The sound, or a silent stand-in
+        """
+        self.load()
+        filename = self.SOUND_FILES[name]
+        with self._loaded:
+            if wait and self._loader is not None:
+                self._loaded.wait_for(lambda: filename in self._sounds or self._loader_done, timeout=wait)
+            return self._sounds.get(filename, NullAudioBackend.SILENCE)
     
     def play_intro(self):
         """Play the introduction sound."""
-        self.intro_sound.play()
+        # The intro is loaded first, give it a moment rather than skipping it
+        self._sound("intro_sound", wait=1.0).play()
     
     def stop_intro(self):
         """Stop the introduction sound."""
-        self.intro_sound.stop()
+        self._sound("intro_sound").stop()
     
     def play_hit(self):
         """Play the hit sound effect."""
-        self.hit_sound.play()
+        self._sound("hit_sound").play()
     
     def play_miss(self):
         """Play the miss sound effect."""
-        self.miss_sound.play()
+        self._sound("miss_sound").play()
     
     def play_win(self):
         """Play the winning sound."""
-        self.win_sound.play()
+        self._sound("win_sound").play()
     
     def play_gameover(self):
         """Play the game over sound."""
-        self.gameover_sound.play()
+        self._sound("gameover_sound").play()
         
     def play_place_ship(self):
         """Play the ship placement sound."""
-        self.place_ship_sound.play()
+        self._sound("place_ship_sound").play()
+
+
+class AudioQueue:
+    """
+    Stand-in for a SoundManager that hands sound triggers to an asyncio task.
+    Callers (including worker threads) only enqueue the request, so playing
+    audio never delays rendering, input or AI computation.
+    """
+    def __init__(self, sound_manager):
+        """
+        Initialize the queue. Must be created inside a running event loop.
+        
+        Args:
+            sound_manager (SoundManager): The sound manager that actually plays audio
+        """
+        import asyncio
+        
+        self.sound_manager = sound_manager
+        self._loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue()
+    
+    def __getattr__(self, name):
+        """Turn play_*/stop_* calls into queued requests."""
+        if not name.startswith(("play_", "stop_")):
+            raise AttributeError(name)
+        return lambda: self._loop.call_soon_threadsafe(self._queue.put_nowait, name)
+    
+    async def run(self):
+        """Play queued sounds until cancelled."""
+        while True:
+            name = await self._queue.get()
+            getattr(self.sound_manager, name)()
 
 
 class Ship:
@@ -745,6 +1626,7 @@ class Ship:
         self.size = self.SHIP_SIZES[name]
         self.emoji = self.SHIP_EMOJIS[name]
         self.positions = set()  # Will store (row, col) tuples
+        self.placement = None  # (row, col, orientation) of the bow once placed
         
     def is_sunk(self):
         """
@@ -770,12 +1652,48 @@ class Ship:
             self.positions.remove((row, col))
             return True
         return False
+    
+    def reset(self):
+        """Take the ship off the board so it can be placed again."""
+        self.positions.clear()
+        self.placement = None
+
+
+class BoardView:
+    """
+    Immutable picture of a board at one moment.
+    Rows are tuples and the last attack is stored by value, so a view can be
+    handed to any thread and read without locks while the game moves on.
+    """
+    __slots__ = ("visible", "hidden", "last_attack", "version")
+    
+    def __init__(self, visible, hidden, last_attack, version):
+        """
+        Initialize a view.
+        
+        Args:
+            visible (tuple): Rows of the visible grid, each a tuple of cells
+            hidden (tuple): Rows of the hidden grid, each a tuple of cells
+            last_attack (tuple): (row, col, outcome, ship name or None) of the
+                most recent valid attack, or None
+            version (int): Number of views the board published before this one
+        """
+        self.visible = visible
+        self.hidden = hidden
+        self.last_attack = last_attack
+        self.version = version
 
 
 class Board:
     """
     Represents a game board with ship placement and attack tracking.
     Manages the state of a player's grid.
+    
+    Concurrency: a board belongs to one game, and only that game's thread
+    may change it (a server session holds its lock while it does). Every
+    change publishes a new BoardView in the view attribute with a single
+    assignment, so renderers and spectators on other threads read
+    board.view without taking any lock and never see a half-applied attack.
     """
     def __init__(self, is_player=True):
         """
@@ -788,10 +1706,104 @@ class Board:
         self.hidden_grid = [["~" for _ in range(10)] for _ in range(10)]
         self.visible_grid = [["~" for _ in range(10)] for _ in range(10)]
         self.ships = {}  # Will store Ship objects
+        self.last_attack = None  # (row, col, hit_ship) of the most recent valid attack
+        self.placed_by_hand = False  # True once the fleet was deployed with place_ships_manually()
+        
+        # Cells not attacked yet (row * 10 + col) in no particular order, and each
+        # cell's position in that list or -1, for O(1) sampling, lookup and removal
+        self.untried = list(range(100))
+        self._untried_slot = list(range(100))
         
         # Initialize ships
         for ship_name in Ship.SHIP_SIZES:
             self.ships[ship_name] = Ship(ship_name)
+        
+        self.view = None
+        self._publish()
+    
+    def reset(self):
+        """Clear both grids and all ships in place, ready for a new game."""
+        for grid in (self.hidden_grid, self.visible_grid):
+            for row in grid:
+                row[:] = "~" * len(row)
+        for ship in self.ships.values():
+            ship.reset()
+        self.last_attack = None
+        self.placed_by_hand = False
+        self.untried[:] = range(100)
+        self._untried_slot[:] = range(100)
+        self._publish()
+    
+    def _publish(self, *rows):
+        """
+        Publish a new view after the grids changed.
+        
+        Args:
+            *rows (int): Rows that changed, every row if none are given
+        """
+        view = self.view
+        if rows and view is not None:
+            visible = list(view.visible)
+            hidden = list(view.hidden)
+            for r in rows:
+                visible[r] = tuple(self.visible_grid[r])
+                hidden[r] = tuple(self.hidden_grid[r])
+            visible = tuple(visible)
+            hidden = tuple(hidden)
+        else:
+            visible = tuple(map(tuple, self.visible_grid))
+            hidden = tuple(map(tuple, self.hidden_grid))
+        last_attack = None
+        if self.last_attack is not None:
+            row, col, hit_ship = self.last_attack
+            last_attack = (row, col, self.last_attack_outcome(), hit_ship.name if hit_ship else None)
+        self.view = BoardView(visible, hidden, last_attack, 0 if view is None else view.version + 1)
+    
+    def is_untried(self, row, col):
+        """
+        Check whether a cell has not been attacked yet.
+        
+        Args:
+            row (int): Row coordinate
+            col (int): Column coordinate
+            
+        Returns:
+            bool: True if the cell can still be attacked, False if it was or lies off the board
+        """
+        # Checked first, the flat index would wrap (0, 10) onto (1, 0) and negatives onto the last row
+        if not (0 <= row < 10 and 0 <= col < 10):
+            return False
+        return self._untried_slot[row * 10 + col] >= 0
+    
+    def random_untried(self):
+        """
+        Pick a uniformly random cell that has not been attacked yet.
+        
+        Returns:
+            tuple: (row, col), or None if every cell has been attacked
+        """
+        if not self.untried:
+            return None
+        return divmod(random.choice(self.untried), 10)
+    
+    def rebuild_untried(self):
+        """Recompute the untried cells and the view from the grids, after they were replaced wholesale."""
+        self.untried[:] = [r * 10 + c for r in range(10) for c in range(10)
+                           if self.visible_grid[r][c] not in ["X", "O"]]
+        self._untried_slot[:] = [-1] * 100
+        for slot, cell in enumerate(self.untried):
+            self._untried_slot[cell] = slot
+        self._publish()
+    
+    def _mark_tried(self, row, col):
+        """Remove an attacked cell from the untried cells by swapping the last one into its slot."""
+        cell = row * 10 + col
+        slot = self._untried_slot[cell]
+        last = self.untried.pop()
+        if last != cell:
+            self.untried[slot] = last
+            self._untried_slot[last] = slot
+        self._untried_slot[cell] = -1
     
     def place_ships_randomly(self):
         """
@@ -800,6 +1812,7 @@ class Board:
         """
         for ship_name, ship in self.ships.items():
             self._place_single_ship(ship)
+        self._publish()
             
     def place_ships_manually(self, ui, sound_manager):
         """
@@ -835,18 +1848,19 @@ class Board:
                     placed = True
                     sound_manager.play_place_ship()
                     cprint(f"{ship_name} placed successfully!", "green", attrs=["bold"])
-                    time.sleep(0.5)
+                    ui.pacer.sleep(0.5)
                 else:
                     # Invalid placement
                     cprint("Invalid placement! Ship would overlap or extend beyond grid boundaries.", "red", attrs=["bold"])
-                    time.sleep(0.5)
+                    ui.pacer.sleep(0.5)
         
         # Show the final fleet deployment
         ui.display_ship_placement_board(self, "All ships", 0)
+        self.placed_by_hand = True
         cprint("\nFleet deployment complete!", "green", attrs=["bold"])
         cprint("Your ships are positioned and ready for battle.", "green")
         cprint("\n[PRESS ENTER TO BEGIN COMBAT]", "yellow", attrs=["blink"])
-        input()
+        ui.wait_for_enter()
         
         return True
     
@@ -879,6 +1893,7 @@ class Board:
                     if self.is_player:
                         self.visible_grid[row][c] = ship_emoji
                     ship.positions.add((row, c))
+                ship.placement = (row, col, direction)
                 break
                 
             elif direction == "vertical":
@@ -893,6 +1908,7 @@ class Board:
                     if self.is_player:
                         self.visible_grid[r][col] = ship_emoji
                     ship.positions.add((r, col))
+                ship.placement = (row, col, direction)
                 break
     
     def _place_single_ship_manually(self, ship, row, col, orientation):
@@ -944,22 +1960,26 @@ class Board:
                     self.visible_grid[r][col] = ship_emoji
                 ship.positions.add((r, col))
         
+        ship.placement = (row, col, orientation)
+        self._publish()
         return True
     
-    def register_attack(self, row, col, sound_manager):
+    def register_attack(self, row, col, sound_manager=None):
         """
         Register an attack on the board.
         
         Args:
             row (int): Row coordinate of the attack
             col (int): Column coordinate of the attack
-            sound_manager (SoundManager): Sound manager for audio feedback
+            sound_manager (SoundManager): Sound manager for audio feedback, None for silent play
             
         Returns:
             tuple: (result message, hit_ship) where hit_ship is the ship that was hit or None
         """
-        # Check if the cell has already been attacked
-        if self.visible_grid[row][col] in ["X", "O"]:
+        # Check if the cell is on the board and has not been attacked yet
+        if not (0 <= row < 10 and 0 <= col < 10):
+            return (colored("Out of range!", "yellow"), None)
+        if not self.is_untried(row, col):
             return (colored("Already guessed!", "yellow"), None)
         
         # Check if there's a ship at the position
@@ -978,9 +1998,14 @@ class Board:
                 # Update grids
                 self.hidden_grid[row][col] = "X"
                 self.visible_grid[row][col] = "X"
+                self._mark_tried(row, col)
+                self.last_attack = (row, col, hit_ship)
+                self._publish(row)
+                METRICS.inc("battleships_attacks_total", outcome="sunk" if hit_ship.is_sunk() else "hit")
                 
                 # Play sound
-                sound_manager.play_hit()
+                if sound_manager is not None:
+                    sound_manager.play_hit()
                 
                 # Check if ship is sunk
                 if hit_ship.is_sunk():
@@ -991,11 +2016,30 @@ class Board:
         # Otherwise it's a miss
         if self.hidden_grid[row][col] == "~":
             self.visible_grid[row][col] = "O"
-            sound_manager.play_miss()
+            self._mark_tried(row, col)
+            self.last_attack = (row, col, None)
+            self._publish(row)
+            METRICS.inc("battleships_attacks_total", outcome="miss")
+            if sound_manager is not None:
+                sound_manager.play_miss()
             return (colored("Miss!", "red", attrs=["bold"]), None)
         
         return (colored("Invalid attack!", "red"), None)
     
+    def last_attack_outcome(self):
+        """
+        Classify the most recent valid attack.
+        
+        Returns:
+            str: "miss", "hit" or "sunk", or None if nothing has been attacked yet
+        """
+        if self.last_attack is None:
+            return None
+        hit_ship = self.last_attack[2]
+        if hit_ship is None:
+            return "miss"
+        return "sunk" if hit_ship.is_sunk() else "hit"
+    
     def all_ships_sunk(self):
         """
         Check if all ships on the board have been sunk.
@@ -1022,6 +2066,10 @@ class Player:
         self.name = name
         self.is_human = is_human  # Store is_human as an attribute
         self.board = Board(is_player=is_human)
+    
+    def reset(self):
+        """Clear the player's board in place for a new game."""
+        self.board.reset()
         
     def setup(self, placement_method="random", ui=None, sound_manager=None):
         """
@@ -1042,25 +2090,477 @@ class Player:
         return True
 
 
+class ShipConstraints:
+    """
+    Bitmask reasoning about where ships can lie on the 10x10 board.
+    Cell (row, col) is bit row * 10 + col, so a set of cells is a single int
+    and testing a ship placement against known hits is one AND.
+    The placement tables are shared by every thread: each is built in full
+    before it is stored and never changed afterwards, so they need no lock.
+    """
+    SIZE = 10
+    FULL = (1 << (SIZE * SIZE)) - 1
+    
+    # Ship length -> cell index -> masks of every placement covering that cell
+    _covering = {}
+    
+    # Ship length -> masks of every placement on the board
+    _placements = {}
+    
+    @classmethod
+    def placements(cls, length):
+        """
+        Get every straight placement of a ship.
+        
+        Args:
+            length (int): Ship length
+            
+        Returns:
+            list: Placement masks
+        """
+        masks = cls._placements.get(length)
+        if masks is None:
+            masks = sorted({mask for cell in range(cls.SIZE * cls.SIZE)
+                            for mask in cls.covering(length, cell)})
+            cls._placements[length] = masks
+        return masks
+    
+    @classmethod
+    def covering(cls, length, cell):
+        """
+        Get every straight placement of a ship that covers a cell.
+        
+        Args:
+            length (int): Ship length
+            cell (int): Cell index, row * 10 + col
+            
+        Returns:
+            list: Placement masks
+        """
+        table = cls._covering.get(length)
+        if table is None:
+            table = [[] for _ in range(cls.SIZE * cls.SIZE)]
+            for r in range(cls.SIZE):
+                for c in range(cls.SIZE):
+                    starts = []
+                    if c + length <= cls.SIZE:
+                        starts.append([r * cls.SIZE + c + i for i in range(length)])
+                    if r + length <= cls.SIZE:
+                        starts.append([(r + i) * cls.SIZE + c for i in range(length)])
+                    for cells in starts:
+                        mask = sum(1 << i for i in cells)
+                        for i in cells:
+                            table[i].append(mask)
+            cls._covering[length] = table
+        return table[cell]
+    
+    @classmethod
+    def mask(cls, cells):
+        """
+        Convert (row, col) cells to a mask.
+        
+        Args:
+            cells (iterable): (row, col) tuples
+            
+        Returns:
+            int: The mask
+        """
+        mask = 0
+        for row, col in cells:
+            mask |= 1 << (row * cls.SIZE + col)
+        return mask
+    
+    @classmethod
+    def contains(cls, mask, row, col):
+        """
+        Check whether a cell is in a mask.
+        
+        Returns:
+            bool: True if (row, col) is set
+        """
+        return (mask >> (row * cls.SIZE + col)) & 1 == 1
+    
+    @classmethod
+    def attribute_sinks(cls, sinks):
+        """
+        Work out which hits belong to the ships reported sunk.
+        Every sunk ship lies on a straight line through the shot that sank
+        it, on cells that were all hits by then, and no two ships overlap.
+        Enumerating the placements that satisfy this for all sunk ships
+        together separates hits that must be on a sunk ship from hits that
+        could still belong to a ship afloat, which matters when ships touch
+        or lie side by side.
+        
+        Args:
+            sinks (list): (cell, length, hits) per sunk ship, where cell is the
+                sinking shot, length the ship's size and hits the mask of all
+                hits at that moment
+            
+        Returns:
+            tuple: (certain, possible) masks of cells on a sunk ship in every
+                consistent placement and in at least one of them
+        """
+        layouts = cls.sink_layouts(sinks)
+        if not layouts:
+            # No consistent layout means the assumptions were broken, so resolve nothing
+            return 0, 0
+        certain = cls.FULL
+        possible = 0
+        for used in layouts:
+            certain &= used
+            possible |= used
+        return certain, possible
+    
+    @classmethod
+    def sink_layouts(cls, sinks):
+        """
+        Enumerate the cells the sunk ships can occupy together.
+        
+        Args:
+            sinks (list): (cell, length, hits) per sunk ship, as for attribute_sinks()
+            
+        Returns:
+            dict: Mask of all sunk ship cells -> number of ways to place the sunk
+                ships on exactly those cells, empty if no placement is consistent
+        """
+        layouts = {}
+        # Ships with the fewest candidate placements first keeps the search small
+        options = sorted(([m for m in cls.covering(length, cell) if m & hits == m]
+                          for cell, length, hits in sinks), key=len)
+        
+        def search(index, used):
+            if index == len(options):
+                layouts[used] = layouts.get(used, 0) + 1
+                return
+            for placement in options[index]:
+                if not placement & used:
+                    search(index + 1, used | placement)
+        
+        search(0, 0)
+        return layouts
+
+
+class BoardSymmetry:
+    """
+    Rotations and reflections of the board as permutations of cell indices.
+    A square board has eight symmetries and a rectangular one four. Positions
+    that are symmetric to each other share a canonical form, the smallest of
+    their transformed masks, so caches keyed on it hold each position once
+    and answer for all its mirror images. Masks are transformed a byte at a
+    time through lookup tables, which are built on first use.
+    """
+    def __init__(self, rows=10, cols=10):
+        """
+        Precompute the cell permutations for a board size.
+        
+        Args:
+            rows (int): Board rows
+            cols (int): Board columns
+        """
+        self.rows = rows
+        self.cols = cols
+        last_row, last_col = rows - 1, cols - 1
+        maps = [
+            lambda r, c: (r, c),
+            lambda r, c: (last_row - r, c),
+            lambda r, c: (r, last_col - c),
+            lambda r, c: (last_row - r, last_col - c),
+        ]
+        if rows == cols:
+            maps += [
+                lambda r, c: (c, r),
+                lambda r, c: (c, last_row - r),
+                lambda r, c: (last_col - c, r),
+                lambda r, c: (last_col - c, last_row - r),
+            ]
+        # permutations[t][cell] is where transform t moves the cell, inverses[t] undoes it
+        self.permutations = []
+        self.inverses = []
+        for transform in maps:
+            permutation = [0] * (rows * cols)
+            for r in range(rows):
+                for c in range(cols):
+                    tr, tc = transform(r, c)
+                    permutation[r * cols + c] = tr * cols + tc
+            inverse = [0] * len(permutation)
+            for cell, image in enumerate(permutation):
+                inverse[image] = cell
+            self.permutations.append(permutation)
+            self.inverses.append(inverse)
+        self._tables = [None] * len(maps)
+    
+    def transform(self, index, mask):
+        """
+        Move every cell of a mask with one symmetry.
+        
+        Args:
+            index (int): Index into permutations
+            mask (int): Cell mask
+            
+        Returns:
+            int: The transformed mask
+        """
+        tables = self._tables[index] or self._build_tables(index)
+        result = 0
+        for table in tables:
+            if not mask:
+                break
+            result |= table[mask & 0xFF]
+            mask >>= 8
+        return result
+    
+    def canonical(self, masks):
+        """
+        Find the canonical form of a position given as several masks.
+        
+        Args:
+            masks (tuple): Cell masks describing the position
+            
+        Returns:
+            tuple: (index, canonical masks) where index is the symmetry that maps
+                the position onto its canonical form
+        """
+        best_index, best = 0, masks
+        for index in range(1, len(self.permutations)):
+            candidate = tuple(self.transform(index, mask) for mask in masks)
+            if candidate < best:
+                best_index, best = index, candidate
+        return best_index, best
+    
+    def original_cell(self, index, cell):
+        """
+        Map a cell chosen in the canonical frame back onto the real board.
+        
+        Args:
+            index (int): Symmetry returned by canonical()
+            cell (int): Cell index in the canonical frame
+            
+        Returns:
+            int: Cell index on the real board
+        """
+        return self.inverses[index][cell]
+    
+    def _build_tables(self, index):
+        """Build the per-byte lookup tables of one symmetry."""
+        permutation = self.permutations[index]
+        tables = []
+        for start in range(0, len(permutation), 8):
+            table = [0] * 256
+            for value in range(1, 256):
+                # Reuse the entry without the lowest bit, then add that bit's image
+                low = (value & -value).bit_length() - 1
+                image = 1 << permutation[start + low] if start + low < len(permutation) else 0
+                table[value] = table[value & (value - 1)] | image
+            tables.append(table)
+        self._tables[index] = tables
+        return tables
+
+
+class EndgameSolver:
+    """
+    Exact targeting once few ship layouts remain.
+    Enumerates every layout of the ships still afloat that agrees with the
+    shots so far, for every way the sunk ships can lie, and fires at the open
+    cell covered by the most layouts, which is the shot most likely to hit. The search gives up beyond
+    MAX_LAYOUTS, so its cost per move stays bounded. Results are cached by
+    the canonical form of the observed state, so a position and its rotations
+    and reflections are solved once.
+    """
+    # Layouts enumerated before the position counts as too open to solve exactly
+    MAX_LAYOUTS = 10000
+    
+    # Largest product of per-ship placement counts worth starting a search for
+    MAX_BOUND = 10000
+    
+    # Solved positions kept, oldest dropped first. Lookups need no lock, the
+    # lock only keeps concurrent evictions from racing each other
+    CACHE_SIZE = 4096
+    _cache = {}
+    _cache_lock = threading.Lock()
+    _UNSOLVED = object()
+    
+    # Symmetries of the board, built on first use to keep importing the game cheap
+    _symmetry = None
+    
+    @classmethod
+    def target(cls, hits, misses, lengths, sunk=((0, 1),)):
+        """
+        Find the best shot if the position is small enough to solve.
+        
+        Args:
+            hits (int): Mask of every hit so far
+            misses (int): Mask of misses
+            lengths (tuple): Lengths of the ships still afloat
+            sunk (tuple): (cells, ways) pairs from ShipConstraints.sink_layouts(),
+                one per set of cells the sunk ships can occupy together
+            
+        Returns:
+            tuple: (row, col) of the shot, or None if there are too many layouts
+        """
+        # Open positions are turned away before paying for canonicalization
+        if any(cls._options(hits & ~cells, cells | misses, lengths) is None for cells, _ in sunk):
+            return None
+        
+        symmetry = cls._symmetry
+        if symmetry is None:
+            # Threads racing here build identical tables, whichever lands last is kept
+            symmetry = cls._symmetry = BoardSymmetry(ShipConstraints.SIZE, ShipConstraints.SIZE)
+        index, (hits, misses) = symmetry.canonical((hits, misses))
+        sunk = tuple(sorted((symmetry.transform(index, cells), ways) for cells, ways in sunk))
+        key = (hits, misses, lengths, sunk)
+        cell = cls._cache.get(key, cls._UNSOLVED)
+        if cell is cls._UNSOLVED:
+            # Every full layout is equally likely, so each way of placing the sunk ships
+            # adds the layouts of the ships afloat around it
+            weights = {}
+            for cells, ways in sunk:
+                layout_weights = cls.cell_weights(hits & ~cells, cells | misses, lengths)
+                if layout_weights is None:
+                    weights = None
+                    break
+                for open_cell, count in layout_weights.items():
+                    weights[open_cell] = weights.get(open_cell, 0) + count * ways
+            cell = max(weights, key=lambda cell: (weights[cell], -cell)) if weights else None
+            with cls._cache_lock:
+                while len(cls._cache) >= cls.CACHE_SIZE:
+                    del cls._cache[next(iter(cls._cache))]
+                cls._cache[key] = cell
+        
+        if cell is None:
+            return None
+        return divmod(symmetry.original_cell(index, cell), ShipConstraints.SIZE)
+    
+    @classmethod
+    def cell_weights(cls, hits, closed, lengths):
+        """
+        Count the layouts covering each open cell.
+        
+        Args:
+            hits (int): Mask of cells the ships afloat must cover between them
+            closed (int): Mask of cells no ship afloat can use
+            lengths (tuple): Lengths of the ships still afloat
+            
+        Returns:
+            dict: Open cell index -> number of layouts with a ship on it, empty if
+                no layout fits, or None if there are more than MAX_LAYOUTS
+        """
+        open_cells = ShipConstraints.FULL & ~closed & ~hits
+        options = cls._options(hits, closed, lengths)
+        if options is None:
+            return None
+        
+        # Placement mask -> number of layouts using it
+        ships = {}
+        budget = [cls.MAX_LAYOUTS]
+        
+        def place_free(remaining, used, floor, placed):
+            # Every hit is covered, the other ships go on open cells only.
+            # Ships of equal length are placed in increasing mask order so each layout counts once.
+            if not remaining:
+                count = 1
+            elif len(remaining) == 1:
+                # The last ship is counted in a loop rather than one call per layout
+                count = 0
+                for mask in options[remaining[0]]:
+                    if mask > floor and not mask & used:
+                        ships[mask] = ships.get(mask, 0) + 1
+                        count += 1
+            else:
+                length = remaining[0]
+                rest = remaining[1:]
+                for mask in options[length]:
+                    if mask <= floor or mask & used:
+                        continue
+                    next_floor = mask if rest[0] == length else 0
+                    if not place_free(rest, used | mask, next_floor, placed + (mask,)):
+                        return False
+                return True
+            for mask in placed:
+                ships[mask] = ships.get(mask, 0) + count
+            budget[0] -= count
+            return budget[0] >= 0
+        
+        def cover_hits(remaining, used, uncovered, placed):
+            if not uncovered:
+                return place_free(tuple(sorted(remaining, reverse=True)), used, 0, placed)
+            cell = (uncovered & -uncovered).bit_length() - 1
+            for length in set(remaining):
+                rest = list(remaining)
+                rest.remove(length)
+                for mask in ShipConstraints.covering(length, cell):
+                    if mask & closed or mask & used or not mask & open_cells:
+                        continue
+                    if not cover_hits(rest, used | mask, uncovered & ~mask, placed + (mask,)):
+                        return False
+            return True
+        
+        if not cover_hits(list(lengths), 0, hits, ()):
+            return None
+        
+        weights = {}
+        for mask, count in ships.items():
+            cells = mask & open_cells
+            while cells:
+                low = cells & -cells
+                cell = low.bit_length() - 1
+                weights[cell] = weights.get(cell, 0) + count
+                cells ^= low
+        return weights
+    
+    @classmethod
+    def _options(cls, hits, closed, lengths):
+        """
+        List the placements each remaining ship could still have.
+        
+        Args:
+            hits (int): Mask of cells the ships afloat must cover between them
+            closed (int): Mask of cells no ship afloat can use
+            lengths (tuple): Lengths of the ships still afloat
+            
+        Returns:
+            dict: Ship length -> placement masks, or None if the product of their
+                counts exceeds MAX_BOUND
+        """
+        open_cells = ShipConstraints.FULL & ~closed & ~hits
+        options = {}
+        bound = 1
+        for length in set(lengths):
+            # A ship afloat still has at least one cell that has not been hit
+            options[length] = [mask for mask in ShipConstraints.placements(length)
+                               if not mask & closed and mask & open_cells]
+        for length in lengths:
+            bound *= len(options[length])
+        return options if bound <= cls.MAX_BOUND else None
+
+
 class AIPlayer(Player):
     """
     Computer player with different difficulty levels.
     Implements AI attack strategies.
     """
-    def __init__(self, difficulty="normal"):
+    def __init__(self, difficulty="normal", heatmaps=None, placements=None):
         """
         Initialize an AI player with specified difficulty.
         
         Args:
             difficulty (str): The AI difficulty - "normal" or "hard"
+            heatmaps (HeatmapStore): Optional store to seed targeting priors from
+            placements (PlacementStore): Optional model of human fleet layouts, preferred over heatmaps
         """
         super().__init__("CPU", is_human=False)
         self.difficulty = difficulty
+        self.heatmaps = heatmaps
+        self.placements = placements
+        
+        # Learned ship-density weights, refreshed on every reset
+        self.prior_map = self._learned_priors()
         
         # For tracking AI attack strategy
-        self.hits = []
+        self.hits = []  # Hits not known to belong to a sunk ship
         self.potential_targets = []
-        self.probability_map = [[1 for _ in range(10)] for _ in range(10)]
+        self.probability_map = self._initial_probability_map()
+        self.hit_mask = 0  # Every hit so far, as a ShipConstraints mask
+        self.sinks = []  # (cell, length, hit_mask) for each ship sunk so far
     
     def attack(self, opponent_board, sound_manager):
         """
@@ -1078,228 +2578,1346 @@ class AIPlayer(Player):
         else:
             return self._hard_attack(opponent_board, sound_manager)
     
-    def _normal_attack(self, opponent_board, sound_manager):
+    def choose_target(self, opponent_board):
+        """
+        Pick the next cell to attack without firing.
+        Only reads the opponent's board, so it can run ahead of time (for
+        example while the human is still typing) and be fired later with fire_at().
+        
+        Args:
+            opponent_board (Board): The opponent's board to attack
+            
+        Returns:
+            tuple: (row, col) coordinates for attack
+        """
+        started = time.perf_counter()
+        if self.difficulty == "normal":
+            target = self._normal_target(opponent_board)
+        else:
+            target = self._hard_target(opponent_board)
+        METRICS.observe("battleships_ai_think_seconds", time.perf_counter() - started,
+                        difficulty=self.difficulty)
+        return target
+    
+    def observe(self, opponent_board):
+        """
+        Capture everything choose_target() reads in a compact, picklable form.
+        Lets the target be chosen elsewhere (for example in a worker process)
+        without shipping Board or Ship objects.
+        
+        Args:
+            opponent_board (Board): The opponent's board
+            
+        Returns:
+            tuple: (difficulty, cells, hits, potential_targets, probabilities, sinks) where
+                cells is the visible grid as 100 bytes (0 unknown, 1 hit, 2 miss),
+                probabilities is the flattened probability map and sinks the ships sunk so far
+        """
+        cells = bytes(1 if cell == "X" else 2 if cell == "O" else 0
+                      for row in opponent_board.visible_grid for cell in row)
+        return (self.difficulty, cells, tuple(self.hits), tuple(self.potential_targets),
+                tuple(p for row in self.probability_map for p in row), tuple(self.sinks))
+    
+    @classmethod
+    def plan(cls, observation):
+        """
+        Choose a target from an observation made with observe().
+        
+        Args:
+            observation (tuple): The observed AI and board state
+            
+        Returns:
+            tuple: (row, col, hits, potential_targets), the target plus the
+                targeting state that choose_target() left behind
+        """
+        difficulty, cells, hits, potential_targets, probabilities, sinks = observation
+        ai = cls(difficulty)
+        ai.hits = list(hits)
+        ai.potential_targets = list(potential_targets)
+        ai.sinks = list(sinks)
+        ai.probability_map = [list(probabilities[r * 10:(r + 1) * 10]) for r in range(10)]
+        
+        opponent_board = Board()
+        symbols = "~XO"
+        opponent_board.visible_grid = [[symbols[cells[r * 10 + c]] for c in range(10)] for r in range(10)]
+        opponent_board.rebuild_untried()
+        row, col = ai.choose_target(opponent_board)
+        return row, col, ai.hits, ai.potential_targets
+    
+    def adopt_plan(self, plan):
+        """
+        Take over the targeting state of a plan made with plan().
+        
+        Args:
+            plan (tuple): (row, col, hits, potential_targets)
+            
+        Returns:
+            tuple: (row, col) coordinates for attack
+        """
+        row, col, hits, potential_targets = plan
+        self.hits = list(hits)
+        self.potential_targets = list(potential_targets)
+        return row, col
+    
+    def fire_at(self, row, col, opponent_board, sound_manager=None, announce=True):
+        """
+        Announce and execute an attack on a chosen cell, then learn from the result.
+        
+        Args:
+            row (int): Target row
+            col (int): Target column
+            opponent_board (Board): The opponent's board to attack
+            sound_manager (SoundManager): Sound manager for audio feedback, None for silent play
+            announce (bool): Whether to print the attack coordinates
+            
+        Returns:
+            tuple: (attack result message, attack coordinates)
+        """
+        if announce:
+            cprint(f"AI attacks at ({row}, {col})", "magenta", attrs=["bold"])
+        result, hit_ship = opponent_board.register_attack(row, col, sound_manager)
+        if self.difficulty != "normal":
+            self._record_result(row, col, hit_ship, opponent_board)
+        return result, (row, col)
+    
+    def _normal_attack(self, opponent_board, sound_manager):
+        """
+        Execute a random attack strategy.
+        
+        Args:
+            opponent_board (Board): The opponent's board to attack
+            sound_manager (SoundManager): Sound manager for audio feedback
+            
+        Returns:
+            tuple: (attack result message, attack coordinates)
+        """
+        row, col = self._normal_target(opponent_board)
+        return self.fire_at(row, col, opponent_board, sound_manager)
+    
+    def _normal_target(self, opponent_board):
+        """
+        Choose a random unattacked cell.
+        
+        Args:
+            opponent_board (Board): The opponent's board
+            
+        Returns:
+            tuple: (row, col) coordinates for attack
+        """
+        return opponent_board.random_untried()
+    
+    def _hard_attack(self, opponent_board, sound_manager):
+        """
+        Execute an intelligent attack strategy that targets ships.
+        
+        Args:
+            opponent_board (Board): The opponent's board to attack
+            sound_manager (SoundManager): Sound manager for audio feedback
+            
+        Returns:
+            tuple: (attack result message, attack coordinates)
+        """
+        row, col = self._hard_target(opponent_board)
+        return self.fire_at(row, col, opponent_board, sound_manager)
+    
+    def _hard_target(self, opponent_board):
+        """
+        Choose a target by hunting around hits or by probability density.
+        
+        Args:
+            opponent_board (Board): The opponent's board
+            
+        Returns:
+            tuple: (row, col) coordinates for attack
+        """
+        # Print debug info
+        #print(f"DEBUG: Hard AI is thinking...")
+        #print(f"DEBUG: Current hits: {self.hits}")
+        #print(f"DEBUG: Potential targets: {self.potential_targets}")
+        
+        # Once few layouts remain, shoot where a ship is most likely
+        target = self._endgame_target(opponent_board)
+        if target is not None:
+            return target
+        
+        # With two or more hits in a line, extending the line comes first
+        if self.hits:
+            #print("DEBUG: Analyzing ship direction...")
+            self._analyze_ship_direction(opponent_board)
+        
+        # If we have potential targets, use the highest priority one still open
+        while self.potential_targets:
+            row, col = self.potential_targets.pop(0)
+            if opponent_board.is_untried(row, col):
+                return row, col
+        
+        # Otherwise use probability-based targeting
+        #print("DEBUG: Using probability-based targeting")
+        return self._probability_based_attack(opponent_board)
+    
+    def _endgame_target(self, opponent_board):
+        """
+        Ask the exact solver for a target.
+        
+        Args:
+            opponent_board (Board): The opponent's board
+            
+        Returns:
+            tuple: (row, col) coordinates for attack, or None while too many layouts remain
+        """
+        lengths = list(Ship.SHIP_SIZES.values())
+        for _, length, _ in self.sinks:
+            lengths.remove(length)
+        
+        shot_hits = misses = 0
+        bit = 1
+        for row in opponent_board.visible_grid:
+            for cell in row:
+                if cell == "X":
+                    shot_hits |= bit
+                elif cell == "O":
+                    misses |= bit
+                bit <<= 1
+        # Hits that may be on a sunk ship are not forced onto the ships afloat,
+        # each way the sunk ships can lie is solved as its own position
+        sunk = ShipConstraints.sink_layouts(self.sinks)
+        if not sunk:
+            return None
+        return EndgameSolver.target(shot_hits, misses, tuple(sorted(lengths)), tuple(sunk.items()))
+    
+    def _record_result(self, row, col, hit_ship, opponent_board):
+        """
+        Update AI tracking after an attack.
+        
+        Args:
+            row (int): Row that was attacked
+            col (int): Column that was attacked
+            hit_ship (Ship): The ship that was hit, or None
+            opponent_board (Board): The opponent's board
+        """
+        if hit_ship:
+            #print(f"DEBUG: Hit confirmed at ({row}, {col})")
+            self.hits.append((row, col))
+            self.hit_mask |= ShipConstraints.mask([(row, col)])
+            
+            # Add adjacent cells as potential targets
+            self._update_potential_targets(row, col, opponent_board)
+            
+            # If a ship was completely destroyed, clear related targets
+            if hit_ship.is_sunk():
+                self.sinks.append((row * 10 + col, hit_ship.size, self.hit_mask))
+                self._clear_sunk_ship_targets()
+        else:
+            # Update probability map for misses
+            if opponent_board.visible_grid[row][col] == "O":
+                self._update_probability_map(row, col, -1)
+        
+        #print(f"DEBUG: After attack - Hits: {self.hits}, Targets: {self.potential_targets}")
+    
+    def _analyze_ship_direction(self, opponent_board):
+        """
+        Analyze hit patterns to determine ship direction.
+        Every run of two or more adjacent hits is treated as a ship lying along
+        it, so the open cells at both ends of each run move to the front of
+        the potential targets, longest runs first. Several ships at once,
+        touching or side by side, each get their own runs.
+        
+        Args:
+            opponent_board (Board): The opponent's board
+        """
+        if len(self.hits) < 2:
+            return
+        
+        hits = set(self.hits)
+        ends = {}
+        for row, col in self.hits:
+            for dr, dc in [(0, 1), (1, 0)]:
+                # Only start from the first cell of a run along this axis
+                if (row - dr, col - dc) in hits or (row + dr, col + dc) not in hits:
+                    continue
+                length = 1
+                while (row + dr * length, col + dc * length) in hits:
+                    length += 1
+                for end in [(row - dr, col - dc), (row + dr * length, col + dc * length)]:
+                    if 0 <= end[0] < 10 and 0 <= end[1] < 10 and opponent_board.is_untried(*end):
+                        ends[end] = max(ends.get(end, 0), length)
+        
+        if ends:
+            prioritized = sorted(ends, key=lambda end: -ends[end])
+            self.potential_targets = prioritized + [target for target in self.potential_targets
+                                                    if target not in ends]
+    
+    def _update_potential_targets(self, row, col, opponent_board):
+        """
+        Add adjacent cells to potential targets after a hit.
+        
+        Args:
+            row (int): Row of the hit
+            col (int): Column of the hit
+            opponent_board (Board): The opponent's board
+        """
+        # Check cells in four directions (up, right, down, left)
+        for dr, dc in [(-1, 0), (0, 1), (1, 0), (0, -1)]:
+            nr, nc = row + dr, col + dc
+            if (0 <= nr < 10 and 0 <= nc < 10 and 
+                opponent_board.is_untried(nr, nc) and
+                (nr, nc) not in self.potential_targets):
+                self.potential_targets.append((nr, nc))
+    
+    def _clear_sunk_ship_targets(self):
+        """
+        Clear targeting data after sinking a ship.
+        Only the hits that must belong to a sunk ship are dropped, so hits on
+        other ships that are damaged but afloat keep being hunted. Targets are
+        kept only while they still border one of those remaining hits.
+        """
+        sunk, _ = ShipConstraints.attribute_sinks(self.sinks)
+        self.hits = [hit for hit in self.hits if not ShipConstraints.contains(sunk, *hit)]
+        remaining = set(self.hits)
+        self.potential_targets = [target for target in self.potential_targets
+                                  if any((target[0] + dr, target[1] + dc) in remaining
+                                         for dr, dc in [(-1, 0), (0, 1), (1, 0), (0, -1)])]
+    
+    def _probability_based_attack(self, opponent_board):
+        """
+        Choose a target based on probability density.
+        Higher probability cells are more likely to contain ships.
+        
+        Args:
+            opponent_board (Board): The opponent's board
+            
+        Returns:
+            tuple: (row, col) coordinates for attack
+        """
+        # Find valid cells (not already attacked), in board order so the draw
+        # does not depend on the order the untried index happens to be in
+        valid_cells = []
+        for cell in sorted(opponent_board.untried):
+            r, c = divmod(cell, 10)
+            valid_cells.append((r, c, self.probability_map[r][c]))
+        
+        # If using checkerboard pattern for efficiency
+        if not self.hits:
+            # Prioritize cells with even parity (checkerboard pattern)
+            parity_cells = [(r, c, prob*1.5) for r, c, prob in valid_cells if (r + c) % 2 == 0]
+            if parity_cells:
+                valid_cells = parity_cells
+        
+        # Select cell based on probability weighting
+        if valid_cells:
+            total_prob = sum(prob for _, _, prob in valid_cells)
+            target_value = random.uniform(0, total_prob)
+            cumulative = 0
+            
+            for r, c, prob in valid_cells:
+                cumulative += prob
+                if cumulative >= target_value:
+                    return r, c
+        
+        # Fallback to random selection if no valid cells (shouldn't happen)
+        return random.randint(0, 9), random.randint(0, 9)
+    
+    def _update_probability_map(self, row, col, change):
+        """
+        Update the probability map based on attack results.
+        
+        Args:
+            row (int): Row of the attack
+            col (int): Column of the attack
+            change (int): Value to add to probability (negative for miss)
+        """
+        # Update the targeted cell
+        self.probability_map[row][col] = max(0, self.probability_map[row][col] + change)
+        
+        # For misses, also reduce probability in adjacent cells
+        if change < 0:
+            for dr in [-1, 0, 1]:
+                for dc in [-1, 0, 1]:
+                    nr, nc = row + dr, col + dc
+                    if 0 <= nr < 10 and 0 <= nc < 10:
+                        self.probability_map[nr][nc] = max(0, self.probability_map[nr][nc] + change//2)
+    
+    def _initial_probability_map(self):
+        """
+        Build the starting probability map, seeded from learned priors when available.
+        
+        Returns:
+            list: 10x10 grid of cell weights
+        """
+        if self.prior_map is not None:
+            return [row[:] for row in self.prior_map]
+        return [[1 for _ in range(10)] for _ in range(10)]
+    
+    def _learned_priors(self):
+        """
+        Get the best available ship-density weights for the human's board.
+        
+        Returns:
+            list: Shared rows of weights, or None if nothing has been learned yet
+        """
+        key = HeatmapStore.key(10, 10, "human")
+        if self.placements is not None:
+            prior_map = self.placements.priors(key)
+            if prior_map is not None:
+                return prior_map
+        if self.heatmaps is not None:
+            return self.heatmaps.priors(key)
+        return None
+    
+    def reset(self):
+        """Reset the board and AI tracking data in place for a new game."""
+        super().reset()
+        self.hits.clear()
+        self.potential_targets.clear()
+        self.hit_mask = 0
+        self.sinks.clear()
+        self.prior_map = self._learned_priors()
+        for r, row in enumerate(self.probability_map):
+            row[:] = self.prior_map[r] if self.prior_map is not None else [1] * len(row)
+
+
+class GamePool:
+    """
+    Free list of player pairs for back-to-back games.
+    Released players are reset in place and handed out again, so repeated
+    games reuse the same boards, ships and probability maps instead of
+    allocating new ones every round. Acquiring and releasing are safe from
+    any thread.
+    """
+    def __init__(self, heatmaps=None, max_size=64, placements=None):
+        """
+        Initialize an empty pool.
+        
+        Args:
+            heatmaps (HeatmapStore): Store new AI players take their priors from
+            max_size (int): Released pairs kept for reuse, extras are dropped
+            placements (PlacementStore): Fleet layout model new AI players prefer for priors
+        """
+        self.heatmaps = heatmaps
+        self.placements = placements
+        self.max_size = max_size
+        self._free = []
+    
+    def acquire(self, difficulty="normal"):
+        """
+        Get a human player and an AI player with empty boards.
+        
+        Args:
+            difficulty (str): The AI difficulty - "normal" or "hard"
+            
+        Returns:
+            tuple: (player, ai)
+        """
+        try:
+            # A single pop, so sessions on several threads never hand out the same pair
+            player, ai = self._free.pop()
+        except IndexError:
+            return Player("Player"), AIPlayer(difficulty, self.heatmaps, self.placements)
+        player.reset()
+        ai.difficulty = difficulty
+        # Pairs restored from a save come back without stores, bind them before reset() reads the priors
+        ai.heatmaps = self.heatmaps
+        ai.placements = self.placements
+        ai.reset()
+        return player, ai
+    
+    def release(self, player, ai):
+        """
+        Return a pair whose game is over.
+        
+        Args:
+            player (Player): The human player
+            ai (AIPlayer): The computer player
+        """
+        if len(self._free) < self.max_size:
+            self._free.append((player, ai))
+
+
+
+def simulate_game(difficulty="normal", heatmaps=None, pool=None):
+    """
+    Play one silent game of the AI against a randomly placed fleet.
+    Nothing is printed and no audio is touched, so it is cheap enough to run
+    in bulk for tuning and benchmarking the AI.
+    
+    Args:
+        difficulty (str): The AI difficulty - "normal" or "hard"
+        heatmaps (HeatmapStore): Optional store to seed targeting priors from
+        pool (GamePool): Pool to reuse players from across many simulated games
+        
+    Returns:
+        int: Number of shots the AI needed to sink the whole fleet
+    """
+    pool = pool or GamePool(heatmaps)
+    player, ai = pool.acquire(difficulty)
+    target = player.board
+    target.place_ships_randomly()
+    shots = 0
+    while not target.all_ships_sunk():
+        row, col = ai.choose_target(target)
+        ai.fire_at(row, col, target, announce=False)
+        shots += 1
+    pool.release(player, ai)
+    return shots
+
+
+class GameRecorder:
+    """
+    Records every shot of a game as JSON lines for later replay analysis.
+    Each line is one self-contained record so files can be streamed and split freely.
+    """
+    def __init__(self, directory=None):
+        """
+        Initialize the recorder.
+        
+        Args:
+            directory (str): Folder for replay files, defaults to the user data folder
+        """
+        self.directory = directory or os.path.dirname(user_data_path("replays", "replays.jsonl"))
+        self.game_id = None
+        self.difficulty = None
+        self.turn = 0
+        self._file = None
+    
+    def start_game(self, difficulty):
+        """
+        Begin recording a new game.
+        
+        Args:
+            difficulty (str): The AI difficulty for this game
+        """
+        import uuid
+        
+        self.game_id = uuid.uuid4().hex
+        self.difficulty = difficulty
+        self.turn = 0
+        self._open()
+        self._write({"type": "start", "game": self.game_id, "difficulty": difficulty})
+    
+    def resume_game(self, game_id, difficulty, turn):
+        """
+        Continue recording a game restored from a save file.
+        
+        Args:
+            game_id (str): The replay id of the saved game, None to start a new id
+            difficulty (str): The AI difficulty for this game
+            turn (int): The last completed turn
+        """
+        if game_id is None:
+            self.start_game(difficulty)
+        else:
+            self.game_id = game_id
+            self.difficulty = difficulty
+            self._open()
+        self.turn = turn
+    
+    def next_turn(self):
+        """Advance the turn counter (one turn is a player shot followed by an AI shot)."""
+        self.turn += 1
+        METRICS.inc("battleships_turns_total")
+    
+    def record_shot(self, shooter, board, think_time):
+        """
+        Record the most recent attack registered on a board.
+        
+        Args:
+            shooter (str): "player" or "cpu"
+            board (Board): The board that was attacked
+            think_time (float): Seconds spent choosing the target
+        """
+        if board.last_attack is None:
+            return
+        row, col, hit_ship = board.last_attack
+        outcome = board.last_attack_outcome()
+        self._write({
+            "type": "shot",
+            "game": self.game_id,
+            "turn": self.turn,
+            "shooter": shooter,
+            "difficulty": self.difficulty,
+            "row": row,
+            "col": col,
+            "outcome": outcome,
+            "ship": hit_ship.name if hit_ship else None,
+            "think_ms": round(think_time * 1000, 3)
+        })
+    
+    def end_game(self, winner):
+        """
+        Record the end of the current game and close the replay file.
+        
+        Args:
+            winner (str): "player" or "cpu"
+        """
+        self._write({"type": "end", "game": self.game_id, "winner": winner,
+                     "turns": self.turn, "difficulty": self.difficulty})
+        if self._file:
+            self._file.close()
+            self._file = None
+    
+    def _open(self):
+        """Open today's replay file for appending."""
+        if self._file:
+            self._file.close()
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            filename = time.strftime("replays-%Y%m%d.jsonl")
+            self._file = open(os.path.join(self.directory, filename), "a", encoding="utf-8")
+        except OSError as e:
+            # Recording is best-effort and must never stop the game
+            print(f"Warning: Could not open replay file in {self.directory}")
+            print(f"Error details: {e}")
+            self._file = None
+    
+    def _write(self, record):
+        """Append a single record as one JSON line."""
+        if self._file:
+            self._file.write(json.dumps(record, separators=(",", ":")) + "\n")
+            self._file.flush()
+
+
+class HeatmapStore:
+    """
+    Persistent cumulative shot and hit heatmaps backed by NumPy memmap files.
+    One file per key (board size and opponent type) holds two int64 grids:
+    shots fired at each cell and hits scored on it. Readers map the file
+    read-only without copying; writers batch updates in memory and add them
+    to the file under an exclusive lock, so many processes can share a store.
+    Within a process one store is shared by every session: buffering and
+    flushing take a lock, and cached priors are read-only and replaced
+    wholesale, so reading them needs none. Cached priors remember the file's
+    modification time and size, so writes by other processes are picked up.
+    """
+    SHOTS = 0
+    HITS = 1
+    
+    # Files modified this recently (ns) are not cached, a second write in the same
+    # timestamp tick (up to 2 s on FAT) would leave their stamp unchanged
+    RACY_NS = 2_000_000_000
+    
+    def __init__(self, directory=None, batch_size=1):
+        """
+        Initialize the store.
+        
+        Args:
+            directory (str): Folder for heatmap files, defaults to the user data folder
+            batch_size (int): Number of recorded boards to buffer before writing
+        """
+        self.directory = directory or os.path.dirname(user_data_path("heatmaps", "v1.dat"))
+        self.batch_size = batch_size
+        self._pending = {}  # key -> (2, rows, cols) int64 array of unwritten counts
+        self._pending_boards = 0
+        self._priors = {}  # key -> (file stamp, priors), shared by every AI
+        self._lock = threading.RLock()  # Guards the pending counts, taken again by flush() from record_board()
+    
+    @staticmethod
+    def key(rows, cols, opponent):
+        """
+        Build the store key for a board configuration and opponent type.
+        
+        Args:
+            rows (int): Board rows
+            cols (int): Board columns
+            opponent (str): Who owns the board being shot at, e.g. "human" or "cpu"
+            
+        Returns:
+            str: The key
+        """
+        return f"{rows}x{cols}-{opponent}"
+    
+    def _path(self, key):
+        """Get the memmap file path for a key."""
+        return os.path.join(self.directory, f"{key}.v1.dat")
+    
+    @staticmethod
+    def _shape(key):
+        """Recover the (2, rows, cols) array shape from a key."""
+        rows, cols = key.split("-", 1)[0].split("x")
+        return (2, int(rows), int(cols))
+    
+    def _stamp(self, key):
+        """
+        Identify the stored contents of a key, so cached priors notice writes by other processes.
+        
+        Args:
+            key (str): Store key
+            
+        Returns:
+            tuple: (st_mtime_ns, st_size) of the file, or None if it is missing or
+                so recently modified that its stamp cannot be trusted yet
+        """
+        try:
+            stat = os.stat(self._path(key))
+        except OSError:
+            return None
+        if time.time_ns() - stat.st_mtime_ns < self.RACY_NS:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+    
+    def view(self, key):
+        """
+        Map a heatmap read-only without copying it into memory.
+        
+        Args:
+            key (str): Store key
+            
+        Returns:
+            numpy.memmap: (2, rows, cols) array of [shots, hits], or None if nothing is stored yet
+        """
+        import numpy as np
+        
+        path = self._path(key)
+        if not os.path.exists(path):
+            return None
+        return np.memmap(path, dtype="<i8", mode="r", shape=self._shape(key))
+    
+    def record_board(self, key, board):
+        """
+        Buffer the shots and hits visible on a finished board.
+        
+        Args:
+            key (str): Store key
+            board (Board): The board that was shot at
+        """
+        import numpy as np
+        
+        with self._lock:
+            counts = self._pending.get(key)
+            if counts is None:
+                counts = self._pending[key] = np.zeros(self._shape(key), dtype="<i8")
+            for r, row in enumerate(board.view.visible):
+                for c, cell in enumerate(row):
+                    if cell in ["X", "O"]:
+                        counts[self.SHOTS, r, c] += 1
+                        if cell == "X":
+                            counts[self.HITS, r, c] += 1
+            
+            self._pending_boards += 1
+            if self._pending_boards >= self.batch_size:
+                self.flush()
+    
+    def flush(self):
+        """Add all buffered counts to the heatmap files."""
+        with self._lock:
+            if not self._pending:
+                return
+            pending = self._pending
+            self._pending = {}
+            self._pending_boards = 0
+            import numpy as np
+            
+            try:
+                os.makedirs(self.directory, exist_ok=True)
+                for key, counts in pending.items():
+                    path = self._path(key)
+                    with open(path + ".lock", "a+b") as lock_file:
+                        _lock_file(lock_file)
+                        try:
+                            if not os.path.exists(path):
+                                # Allocate the zeroed file before mapping it for update
+                                with open(path, "wb") as f:
+                                    f.truncate(counts.nbytes)
+                            heatmap = np.memmap(path, dtype="<i8", mode="r+", shape=counts.shape)
+                            heatmap += counts
+                            heatmap.flush()
+                            del heatmap
+                        finally:
+                            _unlock_file(lock_file)
+            except OSError as e:
+                # Learning is optional, never interrupt a game because of it
+                print(f"Warning: Could not update heatmaps in {self.directory}")
+                print(f"Error details: {e}")
+            # Replaced rather than cleared, so readers holding the old cache are unaffected
+            self._priors = {}
+    
+    def priors(self, key):
+        """
+        Turn a stored heatmap into relative ship-density weights with mean 1.
+        Each cell's hit rate is shrunk towards the overall hit rate, so rarely
+        shot cells stay close to a neutral weight.
+        
+        Args:
+            key (str): Store key
+            
+        Returns:
+            list: Rows of float weights, or None if nothing is stored yet.
+                The rows are cached and shared, callers must copy before changing them.
+        """
+        cache = self._priors
+        # Taken before reading, so a write in between only makes the next call recompute
+        stamp = self._stamp(key)
+        cached = cache.get(key)
+        if stamp is not None and cached is not None and cached[0] == stamp:
+            METRICS.inc("battleships_cache_requests_total", cache="priors", result="hit")
+            return cached[1]
+        METRICS.inc("battleships_cache_requests_total", cache="priors", result="miss")
+        heatmap = self.view(key)
+        if heatmap is None or not heatmap[self.SHOTS].any():
+            weights = None
+        else:
+            shots = heatmap[self.SHOTS]
+            hits = heatmap[self.HITS]
+            overall = (hits.sum() + 1.0) / (shots.sum() + 2.0)
+            density = (hits + 2.0 * overall) / (shots + 2.0)
+            weights = (density / density.mean()).tolist()
+        if stamp is not None:
+            cache[key] = (stamp, weights)
+        return weights
+
+
+class PlacementStore(HeatmapStore):
+    """
+    Learned model of where opponents deploy their fleet.
+    One file per key holds, for every ship, how often its bow was placed on
+    each cell in each orientation, a 5x2x10x10 table of counts. Keys use the
+    same scheme as heatmaps, so a population table ("10x10-human") and
+    per-player tables ("10x10-human-alice") can live side by side. Files are
+    shared and updated exactly like heatmaps.
+    """
+    ORIENTATIONS = ["horizontal", "vertical"]
+    
+    # Pseudo-count added to every legal placement, so the model starts out
+    # as uniformly random placement and only gradually trusts recorded fleets
+    PSEUDO_COUNT = 0.05
+    
+    def __init__(self, directory=None, batch_size=1):
+        """
+        Initialize the store.
+        
+        Args:
+            directory (str): Folder for placement files, defaults to the user data folder
+            batch_size (int): Number of recorded fleets to buffer before writing
+        """
+        super().__init__(directory or os.path.dirname(user_data_path("placements", "v1.dat")), batch_size)
+    
+    @staticmethod
+    def _shape(key):
+        """Recover the (ships, 2, rows, cols) table shape from a key."""
+        rows, cols = key.split("-", 1)[0].split("x")
+        return (len(Ship.SHIP_SIZES), 2, int(rows), int(cols))
+    
+    def record_board(self, key, board):
+        """
+        Buffer the fleet layout of a board.
+        Ships restored from a saved game have no known placement and are skipped.
+        
+        Args:
+            key (str): Store key
+            board (Board): A board whose ships were placed this game
+        """
+        import numpy as np
+        
+        with self._lock:
+            counts = self._pending.get(key)
+            if counts is None:
+                counts = self._pending[key] = np.zeros(self._shape(key), dtype="<i8")
+            for index, name in enumerate(Ship.SHIP_SIZES):
+                placement = board.ships[name].placement
+                if placement is not None:
+                    row, col, orientation = placement
+                    counts[index, self.ORIENTATIONS.index(orientation), row, col] += 1
+            
+            self._pending_boards += 1
+            if self._pending_boards >= self.batch_size:
+                self.flush()
+    
+    def priors(self, key):
+        """
+        Turn the placement tables into the chance of each cell holding a ship,
+        as relative weights with mean 1.
+        
+        Args:
+            key (str): Store key
+            
+        Returns:
+            list: Rows of float weights, or None if no fleet is stored yet.
+                The rows are cached and shared, callers must copy before changing them.
+        """
+        cache = self._priors
+        stamp = self._stamp(key)
+        cached = cache.get(key)
+        if stamp is not None and cached is not None and cached[0] == stamp:
+            METRICS.inc("battleships_cache_requests_total", cache="placements", result="hit")
+            return cached[1]
+        METRICS.inc("battleships_cache_requests_total", cache="placements", result="miss")
+        table = self.view(key)
+        if table is None or not table.any():
+            weights = None
+        else:
+            import numpy as np
+            
+            rows, cols = table.shape[2:]
+            occupancy = np.zeros((rows, cols))
+            for index, size in enumerate(Ship.SHIP_SIZES.values()):
+                legal = np.zeros((2, rows, cols))
+                legal[0, :, :cols - size + 1] = 1
+                legal[1, :rows - size + 1, :] = 1
+                counts = table[index] * legal + self.PSEUDO_COUNT * legal
+                chance = counts / counts.sum()
+                # A placement covers the bow cell and the next size - 1 cells
+                for i in range(size):
+                    occupancy[:, i:] += chance[0, :, :cols - i]
+                    occupancy[i:, :] += chance[1, :rows - i, :]
+            weights = (occupancy / occupancy.mean()).tolist()
+        if stamp is not None:
+            cache[key] = (stamp, weights)
+        return weights
+
+
+def _lock_file(f):
+    """Take an exclusive, blocking lock on an open file."""
+    if os.name == "nt":
+        import msvcrt
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+    else:
+        import fcntl
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+
+
+def _unlock_file(f):
+    """Release a lock taken with _lock_file."""
+    if os.name == "nt":
+        import msvcrt
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+    else:
+        import fcntl
+        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+class CareerStore:
+    """
+    Career statistics in a local SQLite database.
+    One row per finished game plus running totals per player. The database
+    runs in WAL mode so reads never block the writer. Results are queued and
+    a background thread commits them in batches, one transaction each, so
+    recording a game never waits on the disk.
+    """
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS games (
+            id INTEGER PRIMARY KEY,
+            game_id TEXT,
+            player TEXT NOT NULL,
+            difficulty TEXT NOT NULL,
+            winner TEXT NOT NULL,
+            turns INTEGER NOT NULL,
+            shots INTEGER NOT NULL,
+            hits INTEGER NOT NULL,
+            cpu_shots INTEGER NOT NULL,
+            cpu_hits INTEGER NOT NULL,
+            duration REAL NOT NULL,
+            finished_at REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS games_by_player ON games (player, finished_at);
+        CREATE TABLE IF NOT EXISTS players (
+            player TEXT NOT NULL,
+            difficulty TEXT NOT NULL,
+            games INTEGER NOT NULL,
+            wins INTEGER NOT NULL,
+            shots INTEGER NOT NULL,
+            hits INTEGER NOT NULL,
+            best_turns INTEGER,
+            PRIMARY KEY (player, difficulty)
+        );
+        CREATE INDEX IF NOT EXISTS players_by_wins ON players (difficulty, wins);
+    """
+    
+    _INSERT_GAME = """
+        INSERT INTO games (game_id, player, difficulty, winner, turns, shots, hits,
+                           cpu_shots, cpu_hits, duration, finished_at)
+        VALUES (:game_id, :player, :difficulty, :winner, :turns, :shots, :hits,
+                :cpu_shots, :cpu_hits, :duration, :finished_at)
+    """
+    _UPDATE_PLAYER = """
+        INSERT INTO players (player, difficulty, games, wins, shots, hits, best_turns)
+        VALUES (:player, :difficulty, 1, :won, :shots, :hits, CASE WHEN :won THEN :turns END)
+        ON CONFLICT (player, difficulty) DO UPDATE SET
+            games = games + 1,
+            wins = wins + excluded.wins,
+            shots = shots + excluded.shots,
+            hits = hits + excluded.hits,
+            best_turns = CASE WHEN excluded.best_turns IS NULL THEN best_turns
+                              ELSE min(coalesce(best_turns, excluded.best_turns), excluded.best_turns) END
+    """
+    
+    def __init__(self, path=None, batch_size=256, flush_interval=0.5):
+        """
+        Initialize the store. The database is opened when first used.
+        
+        Args:
+            path (str): Database file, defaults to the user data folder
+            batch_size (int): Most games committed in one transaction
+            flush_interval (float): Seconds the writer waits to fill a batch
+        """
+        import queue
+        
+        self.path = path or user_data_path("career.sqlite3")
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue = queue.Queue()
+        self._writer = None
+        self._lock = threading.Lock()
+    
+    def record_game(self, player, difficulty, winner, turns, shots, hits, cpu_shots, cpu_hits,
+                    duration, game_id=None):
+        """
+        Queue the result of a finished game. Returns immediately.
+        
+        Args:
+            player (str): Player name
+            difficulty (str): The AI difficulty
+            winner (str): "player" or "cpu"
+            turns (int): Rounds played
+            shots (int): Shots fired by the player
+            hits (int): Player shots that hit
+            cpu_shots (int): Shots fired by the AI
+            cpu_hits (int): AI shots that hit
+            duration (float): Game length in seconds
+            game_id (str): Replay game id, if the game was recorded
+        """
+        self._start_writer()
+        self._queue.put({
+            "game_id": game_id, "player": player, "difficulty": difficulty, "winner": winner,
+            "won": winner == "player", "turns": turns, "shots": shots, "hits": hits,
+            "cpu_shots": cpu_shots, "cpu_hits": cpu_hits, "duration": duration,
+            "finished_at": time.time()
+        })
+    
+    def record_boards(self, player, ai, turns, duration, game_id=None, name=None):
+        """
+        Queue a finished game, counting shots and hits from both boards.
+        
+        Args:
+            player (Player): The human player
+            ai (AIPlayer): The computer player
+            turns (int): Rounds played
+            duration (float): Game length in seconds
+            game_id (str): Replay game id, if the game was recorded
+            name (str): Name to record the game under, defaults to the player's name
+        """
+        def count(board, symbol):
+            return sum(row.count(symbol) for row in board.visible_grid)
+        
+        hits = count(ai.board, "X")
+        cpu_hits = count(player.board, "X")
+        winner = "player" if ai.board.all_ships_sunk() else "cpu"
+        self.record_game(name or player.name, ai.difficulty, winner, turns, hits + count(ai.board, "O"), hits,
+                         cpu_hits + count(player.board, "O"), cpu_hits, duration, game_id)
+    
+    def flush(self):
+        """Wait until every queued game has been committed."""
+        if self._writer is not None:
+            self._queue.join()
+    
+    def close(self):
+        """Commit queued games and stop the writer thread."""
+        with self._lock:
+            writer, self._writer = self._writer, None
+        if writer is not None:
+            self._queue.put(None)
+            writer.join()
+    
+    def totals(self, player=None):
         """
-        Execute a random attack strategy.
+        Career totals over every difficulty.
         
         Args:
-            opponent_board (Board): The opponent's board to attack
-            sound_manager (SoundManager): Sound manager for audio feedback
+            player (str): Only count this player's games
             
         Returns:
-            tuple: (attack result message, attack coordinates)
+            dict: games, wins, shots, hits and accuracy (percent)
         """
-        # Choose random coordinates until finding an unattacked cell
-        while True:
-            row = random.randint(0, 9)
-            col = random.randint(0, 9)
-            if opponent_board.visible_grid[row][col] not in ["X", "O"]:
-                break
-        
-        # Announce and execute the attack
-        cprint(f"AI attacks at ({row}, {col})", "magenta", attrs=["bold"])
-        result, hit_ship = opponent_board.register_attack(row, col, sound_manager)
-        
-        return result, (row, col)
+        query = "SELECT coalesce(sum(games), 0), coalesce(sum(wins), 0), coalesce(sum(shots), 0), " \
+                "coalesce(sum(hits), 0) FROM players"
+        args = ()
+        if player is not None:
+            query += " WHERE player = ?"
+            args = (player,)
+        games, wins, shots, hits = self._query(query, args)[0]
+        return {"games": games, "wins": wins, "shots": shots, "hits": hits,
+                "accuracy": hits / shots * 100 if shots else 0.0}
     
-    def _hard_attack(self, opponent_board, sound_manager):
+    def leaderboard(self, difficulty="hard", limit=10):
         """
-        Execute an intelligent attack strategy that targets ships.
+        Players with the most wins at a difficulty.
         
         Args:
-            opponent_board (Board): The opponent's board to attack
-            sound_manager (SoundManager): Sound manager for audio feedback
+            difficulty (str): The AI difficulty
+            limit (int): Number of players to return
             
         Returns:
-            tuple: (attack result message, attack coordinates)
+            list: (player, wins, games, accuracy, best_turns) tuples, best first
         """
-        # Print debug info
-        #print(f"DEBUG: Hard AI is thinking...")
-        #print(f"DEBUG: Current hits: {self.hits}")
-        #print(f"DEBUG: Potential targets: {self.potential_targets}")
-        
-        # Choose attack coordinates
-        row, col = None, None
-        
-        # If we have potential targets, use them
-        if self.potential_targets:
-            # Use the highest priority target
-            row, col = self.potential_targets.pop(0)
-            #print(f"DEBUG: Using potential target: ({row}, {col})")
+        return self._query("""
+            SELECT player, wins, games, CASE WHEN shots THEN 100.0 * hits / shots ELSE 0 END, best_turns
+            FROM players WHERE difficulty = ? ORDER BY wins DESC, best_turns LIMIT ?
+        """, (difficulty, limit))
+    
+    def history(self, player, limit=20):
+        """
+        A player's most recent games.
         
-        # If we have hits but no targets, analyze ship direction
-        elif self.hits and not self.potential_targets:
-            #print("DEBUG: Analyzing ship direction...")
-            self._analyze_ship_direction(opponent_board)
+        Args:
+            player (str): Player name
+            limit (int): Number of games to return
             
-            if self.potential_targets:
-                row, col = self.potential_targets.pop(0)
-                #print(f"DEBUG: Using direction-based target: ({row}, {col})")
-            else:
-                # Fall back to probability-based targeting
-                row, col = self._probability_based_attack(opponent_board)
-        
-        # Otherwise use probability-based targeting
-        else:
-            #print("DEBUG: Using probability-based targeting")
-            row, col = self._probability_based_attack(opponent_board)
-        
-        # Announce and execute the attack
-        cprint(f"AI attacks at ({row}, {col})", "magenta", attrs=["bold"])
-        result, hit_ship = opponent_board.register_attack(row, col, sound_manager)
-        result_text = str(result)
+        Returns:
+            list: (finished_at, difficulty, winner, turns, shots, hits, duration) tuples, newest first
+        """
+        return self._query("""
+            SELECT finished_at, difficulty, winner, turns, shots, hits, duration
+            FROM games WHERE player = ? ORDER BY finished_at DESC LIMIT ?
+        """, (player, limit))
+    
+    def _connect(self):
+        """
+        Open the database, creating the schema if needed.
         
-        # Update AI tracking based on result
-        if ("Hit" in result_text or "destroyed" in result_text) and "Already" not in result_text:
-            #print(f"DEBUG: Hit confirmed at ({row}, {col})")
-            self.hits.append((row, col))
-            
-            # Add adjacent cells as potential targets
-            self._update_potential_targets(row, col, opponent_board)
-            
-            # If a ship was completely destroyed, clear related targets
-            if hit_ship and hit_ship.is_sunk():
-                self._clear_sunk_ship_targets()
-        else:
-            # Update probability map for misses
-            if opponent_board.visible_grid[row][col] == "O":
-                self._update_probability_map(row, col, -1)
+        Returns:
+            sqlite3.Connection: The connection
+        """
+        import sqlite3
         
-        #print(f"DEBUG: After attack - Hits: {self.hits}, Targets: {self.potential_targets}")
-        return result, (row, col)
+        connection = sqlite3.connect(self.path, timeout=10)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.executescript(self.SCHEMA)
+        return connection
     
-    def _analyze_ship_direction(self, opponent_board):
+    def _query(self, query, args):
         """
-        Analyze hit patterns to determine ship direction.
-        Updates potential targets based on alignment.
+        Run a read query on a short-lived connection.
         
         Args:
-            opponent_board (Board): The opponent's board
+            query (str): SQL query
+            args (tuple): Query parameters
+            
+        Returns:
+            list: Result rows
         """
-        if len(self.hits) >= 2:
-            # Check if hits are aligned horizontally or vertically
-            rows = [hit[0] for hit in self.hits]
-            cols = [hit[1] for hit in self.hits]
+        connection = self._connect()
+        try:
+            return connection.execute(query, args).fetchall()
+        finally:
+            connection.close()
+    
+    def _start_writer(self):
+        """Start the background writer thread on first use."""
+        with self._lock:
+            if self._writer is None:
+                self._writer = threading.Thread(target=self._write_batches, name="career-writer", daemon=True)
+                self._writer.start()
+    
+    def _write_batches(self):
+        """Writer thread: commit queued games in batches until closed."""
+        import queue
+        import sqlite3
+        
+        connection = None
+        running = True
+        while running:
+            batch = [self._queue.get()]
+            # Gather whatever else arrives shortly, up to a full batch
+            deadline = time.monotonic() + self.flush_interval
+            while batch[-1] is not None and len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get(timeout=max(0, deadline - time.monotonic())))
+                except queue.Empty:
+                    break
+            if batch[-1] is None:
+                running = False
+                batch.pop()
             
-            if len(set(rows)) == 1:  # Horizontal alignment
-                row = rows[0]
-                min_col = min(cols)
-                max_col = max(cols)
-                
-                # Try left side
-                if min_col > 0 and opponent_board.visible_grid[row][min_col-1] not in ["X", "O"]:
-                    self.potential_targets.insert(0, (row, min_col-1))
-                
-                # Try right side
-                if max_col < 9 and opponent_board.visible_grid[row][max_col+1] not in ["X", "O"]:
-                    self.potential_targets.insert(0, (row, max_col+1))
-            
-            elif len(set(cols)) == 1:  # Vertical alignment
-                col = cols[0]
-                min_row = min(rows)
-                max_row = max(rows)
-                
-                # Try top
-                if min_row > 0 and opponent_board.visible_grid[min_row-1][col] not in ["X", "O"]:
-                    self.potential_targets.insert(0, (min_row-1, col))
-                
-                # Try bottom
-                if max_row < 9 and opponent_board.visible_grid[max_row+1][col] not in ["X", "O"]:
-                    self.potential_targets.insert(0, (max_row+1, col))
+            try:
+                if batch:
+                    connection = connection or self._connect()
+                    with connection:
+                        connection.executemany(self._INSERT_GAME, batch)
+                        connection.executemany(self._UPDATE_PLAYER, batch)
+            except sqlite3.Error as e:
+                # Statistics are optional, never interrupt a game because of them
+                print(f"Warning: Could not save career statistics to {self.path}")
+                print(f"Error details: {e}")
+                connection = None
+            finally:
+                for _ in range(len(batch) + (0 if running else 1)):
+                    self._queue.task_done()
+        if connection is not None:
+            connection.close()
+
+
+class SaveGame:
+    """
+    Compact, versioned binary snapshot of an in-progress game.
+    Layout (little-endian): header, then the player and CPU boards as one byte
+    per cell for the hidden and visible grids, then the AI tracking state.
+    Ship positions are not stored, they are rebuilt from the hidden grid where
+    every unhit ship cell still carries that ship's emoji. Version 2 adds the
+    ships the AI has sunk, version 1 files are still read.
+    """
+    MAGIC = b"BSAV"
+    VERSION = 2
+    READABLE_VERSIONS = (1, 2)
+    DIFFICULTIES = ["normal", "hard"]
+    # Cell code for every symbol that can appear in a grid
+    CELL_SYMBOLS = ["~", "X", "O"] + list(Ship.SHIP_EMOJIS.values())
+    CELL_CODES = {symbol: code for code, symbol in enumerate(CELL_SYMBOLS)}
     
-    def _update_potential_targets(self, row, col, opponent_board):
+    # magic, version, difficulty, turn, replay game id
+    _HEADER = struct.Struct("<4sBBH16s")
+    _PROBABILITIES = struct.Struct("<100f")
+    # Sunk ship: sinking shot's cell, ship length, mask of all hits at that moment
+    _SINK_MASK_BYTES = 13
+    _SINK = struct.Struct(f"<BB{_SINK_MASK_BYTES}s")
+    
+    @classmethod
+    def encode(cls, player, ai, turn=0, game_id=None):
         """
-        Add adjacent cells to potential targets after a hit.
+        Serialize both players into bytes.
         
         Args:
-            row (int): Row of the hit
-            col (int): Column of the hit
-            opponent_board (Board): The opponent's board
-        """
-        # Check cells in four directions (up, right, down, left)
-        for dr, dc in [(-1, 0), (0, 1), (1, 0), (0, -1)]:
-            nr, nc = row + dr, col + dc
-            if (0 <= nr < 10 and 0 <= nc < 10 and 
-                opponent_board.visible_grid[nr][nc] not in ["X", "O"] and
-                (nr, nc) not in self.potential_targets):
-                self.potential_targets.append((nr, nc))
-    
-    def _clear_sunk_ship_targets(self):
-        """
-        Clear targeting data after sinking a ship.
-        Resets AI strategy for finding the next ship.
+            player (Player): The human player
+            ai (AIPlayer): The computer player
+            turn (int): Current turn number
+            game_id (str): Replay game id (hex) to continue recording under
+            
+        Returns:
+            bytes: The encoded snapshot
         """
-        self.hits = []
-        # Keep other potential targets but prioritize differently
-        self.potential_targets = [target for target in self.potential_targets 
-                                 if not any(abs(target[0]-h[0]) + abs(target[1]-h[1]) <= 1 
-                                           for h in self.hits)]
+        parts = [cls._HEADER.pack(cls.MAGIC, cls.VERSION, cls.DIFFICULTIES.index(ai.difficulty),
+                                  turn, bytes.fromhex(game_id) if game_id else bytes(16))]
+        for board in (player.board, ai.board):
+            parts.append(cls._encode_grid(board.hidden_grid))
+            parts.append(cls._encode_grid(board.visible_grid))
+        
+        parts.append(cls._encode_cells(ai.hits))
+        parts.append(cls._encode_cells(ai.potential_targets))
+        parts.append(cls._PROBABILITIES.pack(*[p for row in ai.probability_map for p in row]))
+        if ai.prior_map is None:
+            parts.append(b"\x00")
+        else:
+            parts.append(b"\x01" + cls._PROBABILITIES.pack(*[p for row in ai.prior_map for p in row]))
+        parts.append(bytes([len(ai.sinks)]))
+        for cell, length, hit_mask in ai.sinks:
+            parts.append(cls._SINK.pack(cell, length, hit_mask.to_bytes(cls._SINK_MASK_BYTES, "little")))
+        return b"".join(parts)
     
-    def _probability_based_attack(self, opponent_board):
+    @classmethod
+    def decode(cls, data):
         """
-        Choose a target based on probability density.
-        Higher probability cells are more likely to contain ships.
+        Rebuild both players from bytes produced by encode().
         
         Args:
-            opponent_board (Board): The opponent's board
+            data (bytes): The encoded snapshot
             
         Returns:
-            tuple: (row, col) coordinates for attack
+            tuple: (player, ai, turn, game_id)
+            
+        Raises:
+            ValueError: If the data is not a snapshot or has an unsupported version
         """
-        # Find valid cells (not already attacked)
-        valid_cells = []
-        for r in range(10):
-            for c in range(10):
-                if opponent_board.visible_grid[r][c] not in ["X", "O"]:
-                    valid_cells.append((r, c, self.probability_map[r][c]))
-        
-        # If using checkerboard pattern for efficiency
-        if not self.hits:
-            # Prioritize cells with even parity (checkerboard pattern)
-            parity_cells = [(r, c, prob*1.5) for r, c, prob in valid_cells if (r + c) % 2 == 0]
-            if parity_cells:
-                valid_cells = parity_cells
-        
-        # Select cell based on probability weighting
-        if valid_cells:
-            total_prob = sum(prob for _, _, prob in valid_cells)
-            target_value = random.uniform(0, total_prob)
-            cumulative = 0
+        try:
+            magic, version, difficulty, turn, game_id = cls._HEADER.unpack_from(data, 0)
+            if magic != cls.MAGIC:
+                raise ValueError("not a Battleships save file")
+            if version not in cls.READABLE_VERSIONS:
+                raise ValueError(f"unsupported save format version {version}")
+            offset = cls._HEADER.size
             
-            for r, c, prob in valid_cells:
-                cumulative += prob
-                if cumulative >= target_value:
-                    return r, c
+            player = Player("Player")
+            ai = AIPlayer(cls.DIFFICULTIES[difficulty])
+            for board in (player.board, ai.board):
+                board.hidden_grid, offset = cls._decode_grid(data, offset)
+                board.visible_grid, offset = cls._decode_grid(data, offset)
+                board.rebuild_untried()
+                for ship in board.ships.values():
+                    ship.positions = {(r, c) for r in range(10) for c in range(10)
+                                      if board.hidden_grid[r][c] == ship.emoji}
+            
+            ai.hits, offset = cls._decode_cells(data, offset)
+            ai.potential_targets, offset = cls._decode_cells(data, offset)
+            ai.probability_map = cls._decode_probabilities(data, offset)
+            offset += cls._PROBABILITIES.size
+            if data[offset]:
+                ai.prior_map = cls._decode_probabilities(data, offset + 1)
+                offset += cls._PROBABILITIES.size
+            offset += 1
+            
+            ai.hit_mask = ShipConstraints.mask((r, c) for r in range(10) for c in range(10)
+                                               if player.board.visible_grid[r][c] == "X")
+            if version >= 2:
+                for _ in range(data[offset]):
+                    cell, length, hit_mask = cls._SINK.unpack_from(data, offset + 1 + len(ai.sinks) * cls._SINK.size)
+                    ai.sinks.append((cell, length, int.from_bytes(hit_mask, "little")))
+        except (struct.error, IndexError) as e:
+            raise ValueError(f"truncated or corrupt save file ({e})") from e
         
-        # Fallback to random selection if no valid cells (shouldn't happen)
-        return random.randint(0, 9), random.randint(0, 9)
+        return player, ai, turn, game_id.hex() if any(game_id) else None
     
-    def _update_probability_map(self, row, col, change):
+    @classmethod
+    def write(cls, path, data):
         """
-        Update the probability map based on attack results.
+        Write a snapshot atomically so a crash never leaves a half-written save.
         
         Args:
-            row (int): Row of the attack
-            col (int): Column of the attack
-            change (int): Value to add to probability (negative for miss)
+            path (str): Destination file
+            data (bytes): The encoded snapshot
         """
-        # Update the targeted cell
-        self.probability_map[row][col] = max(0, self.probability_map[row][col] + change)
+        temp_path = path + ".tmp"
+        with open(temp_path, "wb") as f:
+            f.write(data)
+        os.replace(temp_path, path)
+    
+    @classmethod
+    def read(cls, path):
+        """
+        Read a snapshot file.
         
-        # For misses, also reduce probability in adjacent cells
-        if change < 0:
-            for dr in [-1, 0, 1]:
-                for dc in [-1, 0, 1]:
-                    nr, nc = row + dr, col + dc
-                    if 0 <= nr < 10 and 0 <= nc < 10:
-                        self.probability_map[nr][nc] = max(0, self.probability_map[nr][nc] + change//2)
+        Args:
+            path (str): Save file path
+            
+        Returns:
+            tuple: (player, ai, turn, game_id), see decode()
+        """
+        with open(path, "rb") as f:
+            return cls.decode(f.read())
     
-    def reset(self):
-        """Reset AI tracking data for a new game."""
-        self.hits = []
-        self.potential_targets = []
-        self.probability_map = [[1 for _ in range(10)] for _ in range(10)]
-
+    @classmethod
+    def _encode_grid(cls, grid):
+        """Encode a 10x10 grid as 100 cell codes."""
+        codes = cls.CELL_CODES
+        return bytes(codes[cell] for row in grid for cell in row)
+    
+    @classmethod
+    def _decode_grid(cls, data, offset):
+        """Decode 100 cell codes into a 10x10 grid."""
+        symbols = cls.CELL_SYMBOLS
+        cells = data[offset:offset + 100]
+        if len(cells) != 100:
+            raise ValueError("truncated grid in save file")
+        grid = [[symbols[code] for code in cells[r * 10:(r + 1) * 10]] for r in range(10)]
+        return grid, offset + 100
+    
+    @staticmethod
+    def _encode_cells(cells):
+        """Encode a list of (row, col) tuples as a count followed by cell indices."""
+        return bytes([len(cells)] + [r * 10 + c for r, c in cells])
+    
+    @staticmethod
+    def _decode_cells(data, offset):
+        """Decode a list of (row, col) tuples written by _encode_cells."""
+        count = data[offset]
+        cells = [divmod(index, 10) for index in data[offset + 1:offset + 1 + count]]
+        if len(cells) != count:
+            raise ValueError("truncated cell list in save file")
+        return cells, offset + 1 + count
+    
+    @classmethod
+    def _decode_probabilities(cls, data, offset):
+        """Decode 100 floats into a 10x10 grid."""
+        values = cls._PROBABILITIES.unpack_from(data, offset)
+        return [list(values[r * 10:(r + 1) * 10]) for r in range(10)]
 
 
 class BattleshipGame:
@@ -1307,19 +3925,31 @@ class BattleshipGame:
     Main game controller class that manages the overall game flow.
     Coordinates all components and handles the game loop.
     """
-    def __init__(self):
-        """Initialize the game with necessary components."""
-
-        self.sound_manager = SoundManager()
-        self.ui = UI(self.sound_manager)
+    def __init__(self, pacer=None, audio_backend=None, input_source=None):
+        """
+        Initialize the game with necessary components.
+        
+        Args:
+            pacer (Pacer): Scheduler for all delays, defaults to normal speed
+            audio_backend (AudioBackend): Audio output, defaults to pygame
+            input_source (ConsoleInput): Player input, defaults to the console
+        """
+        self.pacer = pacer or Pacer()
+        self.sound_manager = SoundManager(audio_backend)
+        self.ui = UI(self.sound_manager, self.pacer, input_source)
+        self.recorder = GameRecorder()
+        self.heatmaps = HeatmapStore()
+        self.placements = PlacementStore()
+        self.career = CareerStore()
+        self.pool = GamePool(self.heatmaps, max_size=1, placements=self.placements)
+        self.save_path = user_data_path("saves", "autosave.bsav")
         self.player = None
         self.ai = None
+        self._ai_move = None  # Task computing the AI's next target in the background
+        self.in_progress = False  # True while a battle is being played, for the metrics
     
     def initialize_game(self):
         """Set up a new game by initializing players and boards."""
-        # Create the human player
-        self.player = Player("Player")
-        
         # Show intro screens and play sound
         self.ui.attempt_fullscreen()    
         self.ui.loading_screen()
@@ -1330,8 +3960,8 @@ class BattleshipGame:
         self.ui.display_rules()
         difficulty = self.ui.select_difficulty()
         
-        # Create AI with selected difficulty
-        self.ai = AIPlayer(difficulty)
+        # Get both players with the selected difficulty
+        self._new_players(difficulty)
         
         # Ask how player wants to place ships
         placement_method = self.ui.get_placement_choice()
@@ -1344,71 +3974,200 @@ class BattleshipGame:
         self.sound_manager.stop_intro()
         self.ui.clear_screen()
     
-    def play_game(self):
+    def save_game(self, path=None):
+        """
+        Save the full in-progress game state.
+        
+        Args:
+            path (str): Destination file, defaults to the autosave slot
+        """
+        data = SaveGame.encode(self.player, self.ai, self.recorder.turn, self.recorder.game_id)
+        SaveGame.write(path or self.save_path, data)
+    
+    def load_game(self, path=None):
+        """
+        Restore a game saved with save_game().
+        
+        Args:
+            path (str): Save file, defaults to the autosave slot
+            
+        Returns:
+            int: The last completed turn of the restored game
+        """
+        player, ai, turn, game_id = SaveGame.read(path or self.save_path)
+        ai.heatmaps = self.heatmaps
+        ai.placements = self.placements
+        self._release_players()
+        self.player, self.ai = player, ai
+        self.recorder.resume_game(game_id, self.ai.difficulty, turn)
+        return turn
+    
+    def _discard_saved_game(self):
+        """Remove the autosave once its game is over."""
+        try:
+            os.remove(self.save_path)
+        except OSError:
+            pass
+    
+    def play_game(self, resumed=False):
         """
         Main game loop that manages player and AI turns.
         Continues until a win condition is met.
+        
+        Args:
+            resumed (bool): True if the game was restored with load_game()
+        """
+        import asyncio
+        
+        asyncio.run(self.play_game_async(resumed))
+    
+    async def play_game_async(self, resumed=False):
+        """
+        Event-loop version of the game loop.
+        Input and AI computation run in worker threads while the status line
+        keeps animating and sounds play from their own task.
+        
+        Args:
+            resumed (bool): True if the game was restored with load_game()
         """
+        import asyncio
+        
+        sounds = AudioQueue(self.sound_manager)
+        audio_task = asyncio.create_task(sounds.run())
         game_over = False
+        started = time.monotonic()
+        if not resumed:
+            self.recorder.start_game(self.ai.difficulty)
         
-        while not game_over:
-            # Player's turn
-            self._player_turn()
-            
-            # Check if player won
-            if  self.ai.board.all_ships_sunk():
-                self._handle_player_win()
-                game_over = True
-                continue
-            
-            # AI's turn
-            self._ai_turn()
-            
-            # Check if AI won
-            if self.player.board.all_ships_sunk():
-                self._handle_ai_win()
-                game_over = True
+        self.in_progress = True
+        try:
+            while not game_over:
+                self.recorder.next_turn()
+                
+                # Player's turn
+                await self._player_turn(sounds)
+                
+                # Check if player won
+                if  self.ai.board.all_ships_sunk():
+                    # The AI's speculative move will not be played, but its thread still works on self.ai
+                    await self._settle_ai_move()
+                    self.recorder.end_game("player")
+                    self._record_heatmaps()
+                    self._record_career(started)
+                    self._discard_saved_game()
+                    await asyncio.to_thread(self._handle_player_win)
+                    game_over = True
+                    continue
+                
+                # AI's turn
+                await self._ai_turn(sounds)
+                
+                # Check if AI won
+                if self.player.board.all_ships_sunk():
+                    self.recorder.end_game("cpu")
+                    self._record_heatmaps()
+                    self._record_career(started)
+                    self._discard_saved_game()
+                    await asyncio.to_thread(self._handle_ai_win)
+                    game_over = True
+                else:
+                    # Checkpoint after every full round so a crash loses at most one turn
+                    self.save_game()
+        finally:
+            await self._settle_ai_move()
+            self.in_progress = False
+            audio_task.cancel()
+    
+    def _record_career(self, started):
+        """
+        Queue the finished game for the career statistics.
+        
+        Args:
+            started (float): time.monotonic() when play started or resumed
+        """
+        self.career.record_boards(self.player, self.ai, self.recorder.turn,
+                                  time.monotonic() - started, self.recorder.game_id)
+    
+    def _record_heatmaps(self):
+        """Add both finished boards to the cumulative heatmap store, and a hand-placed fleet to the placement model."""
+        self.heatmaps.record_board(HeatmapStore.key(10, 10, "human"), self.player.board)
+        self.heatmaps.record_board(HeatmapStore.key(10, 10, "cpu"), self.ai.board)
+        self.heatmaps.flush()
+        # Random deployments say nothing about how people place ships
+        if self.player.board.placed_by_hand:
+            self.placements.record_board(HeatmapStore.key(10, 10, "human"), self.player.board)
     
-    def _player_turn(self):
-        """Handle the player's turn including attack and result display."""
+    async def _player_turn(self, sounds):
+        """
+        Handle the player's turn including attack and result display.
+        
+        Args:
+            sounds (AudioQueue): Queue for sound triggers
+        """
+        import asyncio
+        
         valid_attack = False
         
+        # The AI's next move only depends on the player's board, which this turn
+        # cannot change, so work it out while the human is still typing
+        self._ai_move = asyncio.create_task(asyncio.to_thread(self._timed_ai_target))
+        
         while not valid_attack:
             # Display boards
-            self.ui.clear_screen()
             cpu_ship_parts = {name: ship.positions for name, ship in self.ai.board.ships.items()}
             self.ui.display_boards(self.player.board, self.ai.board, cpu_ship_parts)
             
-            # Get attack coordinates
-            row, col = self.ui.get_attack_coordinates()
+            # Get attack coordinates without blocking the event loop
+            think_start = time.perf_counter()
+            status = asyncio.create_task(self.ui.animate_status("[SELECT TARGET COORDINATES]"))
+            try:
+                row, col = await asyncio.to_thread(self.ui.get_attack_coordinates)
+            finally:
+                status.cancel()
+            think_time = time.perf_counter() - think_start
+            
+            # Check if attack was valid
+            if not self.ai.board.is_untried(row, col):
+                cprint("Already guessed!", "yellow")
+                await self.pacer.sleep_async(0.5)
+                continue
             
             # Process attack
-            result, _ = self.ai.board.register_attack(row, col, self.sound_manager)
+            result, _ = self.ai.board.register_attack(row, col, sounds)
             cprint(result, "green" if "Hit" in str(result) else "red")
-            
-            # Check if attack was valid
-            if "Already guessed!" not in str(result):
-                valid_attack = True
-            else:
-                time.sleep(0.5)
-                self.ui.clear_screen()
+            valid_attack = True
+            self.recorder.record_shot("player", self.ai.board, think_time)
         
         # Pause briefly to let player see result
-        time.sleep(2.0)
+        await self.pacer.sleep_async(2.0)
     
-    def _ai_turn(self):
-        """Handle the AI's turn including attack and result display."""
+    async def _ai_turn(self, sounds):
+        """
+        Handle the AI's turn including attack and result display.
+        
+        Args:
+            sounds (AudioQueue): Queue for sound triggers
+        """
+        import asyncio
+        
         # Display boards before AI turn
-        self.ui.clear_screen()
         cpu_ship_parts = {name: ship.positions for name, ship in self.ai.board.ships.items()}
         self.ui.display_boards(self.player.board, self.ai.board, cpu_ship_parts)
         
         # AI's turn announcement
         cprint("AI Turn", "magenta", attrs=["bold"])
-        time.sleep(0.5)
+        await self.pacer.sleep_async(0.5)
+        
+        # Collect the move computed during the player's turn, waiting only if it is not ready
+        status = asyncio.create_task(self.ui.animate_status("[ENEMY COMPUTING FIRING SOLUTION]"))
+        try:
+            (row, col), think_time = await self._ai_move
+        finally:
+            status.cancel()
         
         # Execute AI attack
-        result, _ = self.ai.attack(self.player.board, self.sound_manager)
+        result, _ = self.ai.fire_at(row, col, self.player.board, sounds)
+        self.recorder.record_shot("cpu", self.player.board, think_time)
         
         # Display attack result
         if result:
@@ -1417,11 +4176,34 @@ class BattleshipGame:
             cprint("AI made an invalid move!", "red")
         
         # Show boards after AI turn
-        time.sleep(2.0)
+        await self.pacer.sleep_async(2.0)
         
         self.ui.display_boards(self.player.board, self.ai.board, cpu_ship_parts)
-        time.sleep(0.5)
-        self.ui.clear_screen()
+        await self.pacer.sleep_async(0.5)
+    
+    async def _settle_ai_move(self):
+        """
+        Wait until the AI's background move, if any, is done and forget it.
+        Its worker thread cannot be interrupted and updates the AI's state,
+        so the game must not be recorded or handed back while it runs.
+        """
+        import asyncio
+        
+        task, self._ai_move = self._ai_move, None
+        if task is not None:
+            # A move nobody plays has no result to report, failures included
+            await asyncio.gather(task, return_exceptions=True)
+    
+    def _timed_ai_target(self):
+        """
+        Choose the AI's next target, timing the computation itself.
+        
+        Returns:
+            tuple: ((row, col), seconds spent thinking)
+        """
+        think_start = time.perf_counter()
+        target = self.ai.choose_target(self.player.board)
+        return target, time.perf_counter() - think_start
     
     def _handle_player_win(self):
         """
@@ -1459,10 +4241,10 @@ class BattleshipGame:
         # Dramatic mission success readout
         for i in range(3):
             self.ui.clear_screen()
-            time.sleep(0.2)
+            self.pacer.sleep(0.2)
             cprint("\n\n  MISSION STATUS: ", "white", end="")
             cprint("CALCULATING...", "yellow", attrs=["blink"])
-            time.sleep(0.3)
+            self.pacer.sleep(0.3)
     
         # Victory animation
         self.ui.clear_screen()
@@ -1473,7 +4255,7 @@ class BattleshipGame:
             self.ui.clear_screen()
             cprint("\n\n  MISSION STATUS: ", "white", end="")
             cprint("ACCOMPLISHED", color, attrs=["bold"])
-            time.sleep(0.2)
+            self.pacer.sleep(0.2)
     
         # Display victory banner with triumphant music
         self.ui.clear_screen()
@@ -1503,7 +4285,7 @@ class BattleshipGame:
         ]
     
         for line in victory_messages:
-            time.sleep(0.3)
+            self.pacer.sleep(0.3)
             cprint(line, "white")
     
         cprint("╚════════════════════════════════════════════════════════════════════════╝", "blue")
@@ -1514,16 +4296,16 @@ class BattleshipGame:
                 cprint("\n              ★★★ MEDAL OF HONOR AWARDED ★★★", "yellow", attrs=["bold"])
             else:
                 cprint("\n              ☆☆☆ MEDAL OF HONOR AWARDED ☆☆☆", "white", attrs=["bold"])
-            time.sleep(0.4)
+            self.pacer.sleep(0.4)
     
         # Final congratulations
         cprint("\nYou have demonstrated exceptional strategic thinking and bravery.", "green")
         cprint("Your country thanks you for your service.", "green")
     
         # Pause to let the player savor the victory
-        time.sleep(1)
+        self.pacer.sleep(1)
         cprint("\n[PRESS ENTER TO CONTINUE]", "white", attrs=["blink"])
-        input()
+        self.ui.wait_for_enter()
     
         self.ui.clear_screen()
     
@@ -1568,10 +4350,10 @@ class BattleshipGame:
         # Dramatic mission failure sequence
         for i in range(3):
             self.ui.clear_screen()
-            time.sleep(0.2)
+            self.pacer.sleep(0.2)
             cprint("\n\n  FLEET STATUS: ", "white", end="")
             cprint("CRITICAL", "red", attrs=["blink"])
-            time.sleep(0.4)
+            self.pacer.sleep(0.4)
     
         # Alarm sequence
         self.ui.clear_screen()
@@ -1580,16 +4362,16 @@ class BattleshipGame:
                 cprint("\n\n\n            !!! ALERT - VESSELS UNDER HEAVY FIRE !!!", "red", attrs=["bold"])
             else:
                 cprint("\n\n\n            --- ALERT - VESSELS UNDER HEAVY FIRE ---", "white", attrs=["bold"])
-            time.sleep(0.3)
+            self.pacer.sleep(0.3)
     
         # Loss confirmation with dramatic effect
         self.ui.clear_screen()
-        time.sleep(0.5)
+        self.pacer.sleep(0.5)
     
         cprint("\n\n  FLEET STATUS: ", "white", end="")
-        time.sleep(0.7)
+        self.pacer.sleep(0.7)
         cprint("LOST", "red", attrs=["bold"])
-        time.sleep(1.5)
+        self.pacer.sleep(1.5)
     
         # Display defeat banner with somber music continuing
         self.ui.clear_screen()
@@ -1619,7 +4401,7 @@ class BattleshipGame:
         ]
     
         for line in defeat_messages:
-            time.sleep(0.3)
+            self.pacer.sleep(0.3)
             cprint(line, "white")
     
         cprint("╚════════════════════════════════════════════════════════════════════════╝", "red")
@@ -1627,7 +4409,7 @@ class BattleshipGame:
         # Slow static effect to simulate damaged communications
         for i in range(3):
             cprint("\n*kzzzt* ... *static* ... *communication unstable*", "white")
-            time.sleep(0.5)
+            self.pacer.sleep(0.5)
     
         # Encouragement for next attempt
         cprint("\n╔════════════════════════════════════════════════════════════════════════╗", "yellow")
@@ -1643,20 +4425,16 @@ class BattleshipGame:
         cprint("╚════════════════════════════════════════════════════════════════════════╝", "yellow")
     
         # Pause to let the player absorb the defeat
-        time.sleep(1)
+        self.pacer.sleep(1)
         cprint("\n[PRESS ENTER TO CONTINUE]", "white", attrs=["blink"])
-        input()
+        self.ui.wait_for_enter()
     
         self.ui.clear_screen()
     
     def reset_game(self):
         """Reset the game for another round."""
-        # Create new boards
-        self.player = Player("Player")
-    
-        # Keep the same difficulty but reset the AI
-        difficulty = self.ai.difficulty
-        self.ai = AIPlayer(difficulty)
+        # Keep the same difficulty, reusing the boards of the last game
+        self._new_players(self.ai.difficulty)
     
         # Ask how player wants to place ships
         placement_method = self.ui.get_placement_choice()
@@ -1665,6 +4443,22 @@ class BattleshipGame:
         self.ai.setup()  # AI always uses random placement
         self.player.setup(placement_method, self.ui, self.sound_manager)
 
+    def _new_players(self, difficulty):
+        """
+        Replace the current players with fresh ones from the pool.
+        
+        Args:
+            difficulty (str): The AI difficulty - "normal" or "hard"
+        """
+        self._release_players()
+        self.player, self.ai = self.pool.acquire(difficulty)
+    
+    def _release_players(self):
+        """Hand the current players back to the pool for reuse."""
+        if self.player is not None and self.ai is not None:
+            self.pool.release(self.player, self.ai)
+        self.player = self.ai = None
+    
     def post_game_menu(self):
         """Display the post-game menu with options to restart or quit."""
         while True:
@@ -1693,8 +4487,7 @@ class BattleshipGame:
             cprint("└─────────────────────────────────────────────────────────────────────────────┘", "red")
         
             # Get player choice
-            cprint("\n[AWAITING COMMAND] Enter your selection (1 or 2): ", "cyan", attrs=["bold"])
-            choice = input().strip()
+            choice = self.ui.ask("\n[AWAITING COMMAND] Enter your selection (1 or 2): ", attrs=["bold"]).strip()
         
             if choice == "1":
                 return "main_menu"
@@ -1702,7 +4495,7 @@ class BattleshipGame:
                 return "quit"
             else:
                 cprint("\nInvalid selection. Please enter 1 or 2.", "red")
-                time.sleep(1.5)
+                self.pacer.sleep(1.5)
     def show_exit_screen(self):
         """
         Display a visually impressive exit screen when player quits the game.
@@ -1732,19 +4525,19 @@ class BattleshipGame:
     
     
         # Game credits with military formatting
-        time.sleep(0.5)
+        self.pacer.sleep(0.5)
         cprint("\n╔══════════════════════════════════════════════════════════════════════════════╗", "cyan")
         cprint("║                              MISSION CREDITS                                 ║", "cyan", attrs=["bold"])
         cprint("╠══════════════════════════════════════════════════════════════════════════════╣", "cyan")
         cprint("║  BATTLESHIP TACTICAL COMMAND SYSTEM v1.0                                     ║", "white")
         cprint("║  DEVELOPED BY ZYLO_X STUDIOS                                                 ║", "white")
         cprint("║                                                                              ║", "white")
-        cprint("║  COMBAT ENGAGEMENTS: CLASSIFIED                                              ║", "white")
+        cprint(f"║  {self._career_summary():<76}║", "white")
         cprint("║  MISSION STATUS: COMPLETE                                                    ║", "white")
         cprint("╚══════════════════════════════════════════════════════════════════════════════╝", "cyan")
     
         # System shutdown sequence
-        time.sleep(1)
+        self.pacer.sleep(1)
         cprint("\n[SYSTEM SHUTDOWN SEQUENCE]", "red")
     
         shutdown_sequence = [
@@ -1756,16 +4549,16 @@ class BattleshipGame:
         ]
     
         for line in shutdown_sequence:
-            time.sleep(0.2)
+            self.pacer.sleep(0.2)
             cprint("  " + line, "white")
             # Display dots for processing effect
             for _ in range(3):
                 cprint(".", "white", end="", flush=True)
-                time.sleep(0.1)
+                self.pacer.sleep(0.1)
             cprint(" [COMPLETE]", "green")
     
         # Final goodbye
-        time.sleep(0.2)
+        self.pacer.sleep(0.2)
         cprint("\n[FINAL MESSAGE]", "cyan", attrs=["bold"])
     
         final_message = "THANK YOU FOR YOUR SERVICE, COMMANDER. SYSTEM SHUTTING DOWN."
@@ -1773,26 +4566,45 @@ class BattleshipGame:
         # Type out the final message character by character
         for char in final_message:
             cprint(char, "cyan", end="", flush=True)
-            time.sleep(0.05)
+            self.pacer.sleep(0.05)
     
         # Wait for a moment before final exit
-        time.sleep(1)
+        self.pacer.sleep(1)
         self.ui.clear_screen()
     
         # One last flashing message
         for i in range(4):
             self.ui.clear_screen()
-            time.sleep(0.2)
+            self.pacer.sleep(0.2)
             if i % 2 == 0:
                 cprint("\n\n\n            >>> BATTLESHIP COMMAND TERMINATED <<<", "red", attrs=["bold"])
             else:
                 cprint("\n\n\n            --- BATTLESHIP COMMAND TERMINATED ---", "white", attrs=["bold"])
-            time.sleep(0.2)
+            self.pacer.sleep(0.2)
 
+    def _career_summary(self):
+        """
+        Summarize the player's career for the exit screen.
+        
+        Returns:
+            str: Engagements, victories and accuracy, or CLASSIFIED if unavailable
+        """
+        import sqlite3
+        
+        try:
+            self.career.flush()
+            totals = self.career.totals()
+        except sqlite3.Error:
+            return "COMBAT ENGAGEMENTS: CLASSIFIED"
+        return (f"COMBAT ENGAGEMENTS: {totals['games']} | VICTORIES: {totals['wins']} | "
+                f"ACCURACY: {totals['accuracy']:.1f}%")
+    
     def start(self):
         """
         Main game loop with proper menu flow.
         """
+        # Decode the sounds in the background while the title screens run
+        self.sound_manager.load()
         show_intro = True
         running = True
     
@@ -1806,26 +4618,37 @@ class BattleshipGame:
                 self.ui.display_rules()
                 show_intro = False  # Don't show intro again
         
-            # Get difficulty
-            difficulty = self.ui.select_difficulty()
-            self.ai = AIPlayer(difficulty)
-        
-            # Create the player
-            self.player = Player("Player")
+            # Offer to continue a game that was interrupted mid-battle
+            resumed = False
+            if os.path.exists(self.save_path):
+                if self.ui.ask_resume_game():
+                    try:
+                        self.load_game()
+                        resumed = True
+                    except (OSError, ValueError) as e:
+                        cprint(f"Saved game could not be restored: {e}", "red")
+                        self.pacer.sleep(1.5)
+                if not resumed:
+                    self._discard_saved_game()
         
-            # Get placement method
-            placement_method = self.ui.get_placement_choice()
-        
-            # Set up boards
-            self.ai.setup()  # AI always uses random placement
-            self.player.setup(placement_method, self.ui, self.sound_manager)
+            if not resumed:
+                # Get difficulty, then both players (reused from the last game if there was one)
+                difficulty = self.ui.select_difficulty()
+                self._new_players(difficulty)
+            
+                # Get placement method
+                placement_method = self.ui.get_placement_choice()
+            
+                # Set up boards
+                self.ai.setup()  # AI always uses random placement
+                self.player.setup(placement_method, self.ui, self.sound_manager)
         
             # Stop intro sound if still playing
             self.sound_manager.stop_intro()
             self.ui.clear_screen()
         
             # Play the game
-            self.play_game()
+            self.play_game(resumed)
         
             # Show post-game menu
             choice = self.post_game_menu()
@@ -1834,8 +4657,49 @@ class BattleshipGame:
                 self.show_exit_screen()  # Show the goodbye screen
                 running = False  # Exit the game
             # If choice is "main_menu", the loop continues
+        
+        # Commit any statistics still queued
+        self.career.close()
     # Run the game when script is executed
 if __name__ == "__main__":
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Battleships Tactical Command System")
+    parser.add_argument("--speed", type=float, default=1.0,
+                        help="Animation speed multiplier (2 = twice as fast)")
+    parser.add_argument("--no-delay", action="store_true",
+                        help="Skip every pause and animation delay (for scripted runs)")
+    parser.add_argument("--no-skip", action="store_true",
+                        help="Do not let a keypress skip running animations")
+    parser.add_argument("--mute", action="store_true",
+                        help="Play without sound and without opening an audio device")
+    parser.add_argument("--script", metavar="FILE",
+                        help="Read commands from FILE ('-' for stdin) with no prompts or delays")
+    parser.add_argument("--metrics-port", type=int, metavar="PORT",
+                        help="Serve Prometheus metrics at http://127.0.0.1:PORT/metrics")
+    parser.add_argument("--metrics-file", metavar="FILE",
+                        help="Keep FILE updated with the metrics in Prometheus text format")
+    args = parser.parse_args()
+    
+    input_source = None
+    pacer = Pacer(args.speed, args.no_delay, not args.no_skip)
+    if args.script:
+        input_source = ScriptInput(sys.stdin if args.script == "-" else open(args.script, encoding="utf-8"))
+        pacer = Pacer(instant=True, skip_on_keypress=False)
     
-    game = BattleshipGame()
-    game.start()
+    game = BattleshipGame(pacer, NullAudioBackend() if args.mute else None, input_source)
+    METRICS.gauge("battleships_games_active", lambda: int(game.in_progress))
+    if args.metrics_port is not None:
+        METRICS.serve(args.metrics_port)
+    if args.metrics_file:
+        METRICS.write_periodically(args.metrics_file)
+    try:
+        game.start()
+        if args.metrics_file:
+            METRICS.write(args.metrics_file)  # Final totals, the dump thread dies with the process
+    except EOFError:
+        # The input ran out before the player quit
+        if args.script:
+            print(f"Script ended after line {input_source.line_number} before the game was finished.",
+                  file=sys.stderr)
+        sys.exit(1)
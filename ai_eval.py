@@ -0,0 +1,244 @@
+# Battleships AI Evaluation - Seeded strength and latency regression gate
+import argparse
+import json
+import math
+import os
+import random
+import sys
+import time
+
+from Battleships import GamePool, SaveGame
+
+# Think-time percentiles reported for every difficulty
+PERCENTILES = (50, 90, 99)
+
+# Default number of games per difficulty, enough to detect a shift of about one shot
+DEFAULT_GAMES = 500
+
+# Think-time slack (ms) added on top of the relative tolerance, so sub-millisecond noise never fails a run
+LATENCY_SLACK_MS = 0.05
+
+BASELINE_VERSION = 1
+
+# Committed baseline, recorded with the default --games and --seed
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "ai_baseline.json")
+
+
+def play_corpus(difficulty, games=DEFAULT_GAMES, seed=0):
+    """
+    Play a fixed corpus of silent games of the AI against randomly placed fleets.
+    Game i always starts from the same random state, so two runs of the same
+    code shoot the same games and any change in the results comes from the AI.
+
+    Args:
+        difficulty (str): The AI difficulty - "normal" or "hard"
+        games (int): Number of games
+        seed (int): Corpus seed
+
+    Returns:
+        tuple: (shots, think_ms) where shots lists the shots each game needed
+            and think_ms every choose_target() call in milliseconds
+    """
+    pool = GamePool()
+    shots = []
+    think_ms = []
+    for game in range(games):
+        random.seed(seed * 1_000_003 + game)
+        player, ai = pool.acquire(difficulty)
+        board = player.board
+        board.place_ships_randomly()
+        fired = 0
+        while not board.all_ships_sunk():
+            started = time.perf_counter()
+            row, col = ai.choose_target(board)
+            think_ms.append((time.perf_counter() - started) * 1000)
+            ai.fire_at(row, col, board, announce=False)
+            fired += 1
+        pool.release(player, ai)
+        shots.append(fired)
+    return shots, think_ms
+
+
+def percentile(values, p):
+    """
+    Nearest-rank percentile.
+
+    Args:
+        values (list): Samples
+        p (float): Percentile between 0 and 100
+
+    Returns:
+        float: The percentile, or 0.0 for no samples
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, math.ceil(p / 100 * len(ordered)) - 1))]
+
+
+def mann_whitney(sample, reference):
+    """
+    One-sided Mann-Whitney U test that sample tends to be larger than reference.
+    Uses the normal approximation with tie and continuity corrections, which is
+    accurate for corpora of a few dozen games or more.
+
+    Args:
+        sample (list): New measurements
+        reference (list): Baseline measurements
+
+    Returns:
+        tuple: (u, p) where u is the U statistic of sample and p the p-value
+    """
+    n1, n2 = len(sample), len(reference)
+    if not n1 or not n2:
+        return 0.0, 1.0
+    combined = sorted([(value, 0) for value in sample] + [(value, 1) for value in reference])
+    rank_sum = 0.0
+    tie_term = 0
+    i = 0
+    while i < len(combined):
+        j = i
+        while j < len(combined) and combined[j][0] == combined[i][0]:
+            j += 1
+        # Tied values share the average of the ranks i+1 .. j
+        average_rank = (i + 1 + j) / 2
+        rank_sum += average_rank * sum(1 for _, group in combined[i:j] if group == 0)
+        tie_term += (j - i) ** 3 - (j - i)
+        i = j
+
+    n = n1 + n2
+    u = rank_sum - n1 * (n1 + 1) / 2
+    variance = n1 * n2 / 12 * ((n + 1) - tie_term / (n * (n - 1)))
+    if variance <= 0:
+        return u, 1.0
+    z = (u - n1 * n2 / 2 - 0.5) / math.sqrt(variance)
+    return u, 0.5 * math.erfc(z / math.sqrt(2))
+
+
+def evaluate(difficulties, games=DEFAULT_GAMES, seed=0):
+    """
+    Run the corpus for every difficulty.
+
+    Args:
+        difficulties (list): Difficulties to evaluate
+        games (int): Games per difficulty
+        seed (int): Corpus seed
+
+    Returns:
+        dict: Report in the baseline format
+    """
+    report = {"version": BASELINE_VERSION, "games": games, "seed": seed, "difficulties": {}}
+    for difficulty in difficulties:
+        shots, think_ms = play_corpus(difficulty, games, seed)
+        report["difficulties"][difficulty] = {
+            "shots": shots,
+            "mean_shots": sum(shots) / len(shots),
+            "think_ms": {f"p{p}": percentile(think_ms, p) for p in PERCENTILES},
+            "moves": len(think_ms),
+        }
+    return report
+
+
+def compare(report, baseline, alpha=0.01, strength_tolerance=0.5, latency_tolerance=0.5):
+    """
+    Check a report against a stored baseline.
+
+    Args:
+        report (dict): Result of evaluate()
+        baseline (dict): An earlier report
+        alpha (float): Significance level for the strength test
+        strength_tolerance (float): Extra mean shots per game allowed before a
+            significant difference counts as a regression
+        latency_tolerance (float): Allowed relative rise of the p99 think time
+
+    Returns:
+        list: (difficulty, message, failed) per check
+    """
+    results = []
+    for difficulty, current in report["difficulties"].items():
+        reference = baseline.get("difficulties", {}).get(difficulty)
+        if reference is None:
+            results.append((difficulty, "no baseline for this difficulty, record a new one", True))
+            continue
+
+        _, p_value = mann_whitney(current["shots"], reference["shots"])
+        shift = current["mean_shots"] - reference["mean_shots"]
+        weaker = p_value < alpha and shift > strength_tolerance
+        results.append((difficulty, f"mean shots {reference['mean_shots']:.2f} -> {current['mean_shots']:.2f} "
+                                    f"({shift:+.2f}, p={p_value:.4f})", weaker))
+
+        limit = reference["think_ms"]["p99"] * (1 + latency_tolerance) + LATENCY_SLACK_MS
+        p99 = current["think_ms"]["p99"]
+        results.append((difficulty, f"p99 think {reference['think_ms']['p99']:.3f}ms -> {p99:.3f}ms "
+                                    f"(limit {limit:.3f}ms)", p99 > limit))
+    return results
+
+
+def format_report(report, results=None):
+    """
+    Format a report and its baseline comparison for the terminal.
+
+    Args:
+        report (dict): Result of evaluate()
+        results (list): Result of compare(), if a baseline was given
+
+    Returns:
+        str: The formatted report
+    """
+    lines = [f"AI evaluation: {report['games']} games per difficulty, seed {report['seed']}"]
+    for difficulty, current in report["difficulties"].items():
+        shots = current["shots"]
+        think = " ".join(f"{name}={value:.3f}ms" for name, value in current["think_ms"].items())
+        lines.append(f"  {difficulty:<7} shots mean={current['mean_shots']:.2f} p50={percentile(shots, 50)} "
+                     f"p90={percentile(shots, 90)} max={max(shots)}  think {think}")
+    if results is not None:
+        lines.append("Baseline comparison:")
+        for difficulty, message, failed in results:
+            lines.append(f"  {'FAIL' if failed else 'ok  '} {difficulty:<7} {message}")
+    return "\n".join(lines)
+
+
+def main():
+    """Command-line entry point for the AI regression gate."""
+    parser = argparse.ArgumentParser(description="Measure Battleships AI strength and think time on a seeded corpus.")
+    parser.add_argument("--difficulty", nargs="+", choices=SaveGame.DIFFICULTIES, default=list(SaveGame.DIFFICULTIES),
+                        help="Difficulties to evaluate (default: all)")
+    parser.add_argument("--games", type=int, default=DEFAULT_GAMES, help="Games per difficulty")
+    parser.add_argument("--seed", type=int, default=0, help="Corpus seed")
+    parser.add_argument("--baseline", metavar="PATH", default=DEFAULT_BASELINE,
+                        help="Compare against this baseline and fail on regressions (default: ai_baseline.json)")
+    parser.add_argument("--save-baseline", metavar="PATH", help="Write this run as the new baseline")
+    parser.add_argument("--alpha", type=float, default=0.01, help="Significance level for the strength test")
+    parser.add_argument("--strength-tolerance", type=float, default=0.5,
+                        help="Extra mean shots per game tolerated (default: 0.5)")
+    parser.add_argument("--latency-tolerance", type=float, default=0.5,
+                        help="Relative p99 think-time rise tolerated (default: 0.5 = 50%%)")
+    args = parser.parse_args()
+
+    baseline = None
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        if baseline.get("version") != BASELINE_VERSION:
+            parser.error(f"{args.baseline} is not a version {BASELINE_VERSION} baseline")
+        if (baseline["games"], baseline["seed"]) != (args.games, args.seed):
+            print(f"Note: baseline was recorded with {baseline['games']} games and seed {baseline['seed']}",
+                  file=sys.stderr)
+    elif not args.save_baseline:
+        parser.error(f"no baseline at {args.baseline}, record one with --save-baseline")
+
+    report = evaluate(args.difficulty, args.games, args.seed)
+    results = None
+    if baseline is not None:
+        results = compare(report, baseline, args.alpha, args.strength_tolerance, args.latency_tolerance)
+    print(format_report(report, results))
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w", encoding="utf-8") as f:
+            json.dump(report, f)
+    if results is not None and any(failed for _, _, failed in results):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,985 @@
+# Battleships Game Server - Many independent sessions over a line protocol
+import argparse
+import asyncio
+import os
+import random
+import secrets
+import sys
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+
+from Battleships import (METRICS, AIPlayer, CareerStore, GamePool, HeatmapStore, PlacementStore, SaveGame,
+                         Ship, UI)
+
+PROTOCOL_VERSION = 1
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 7878
+
+# Longest command line a client may send
+MAX_LINE = 256
+
+# Latency samples kept per session for percentiles (count, mean and max cover every command)
+LATENCY_WINDOW = 1024
+
+# Updates queued for one spectator before it is dropped back to a fresh snapshot
+SPECTATOR_QUEUE = 256
+
+# Seconds an AI move may take in a worker before the session falls back to a random shot
+AI_TIMEOUT = 0.25
+
+METRICS.describe("battleships_ai_requests_total", "counter",
+                 "Hard AI moves sent to workers, by result (planned, saturated or timeout)")
+METRICS.describe("battleships_sessions_connected", "gauge", "Client connections with a session")
+
+# AI moves waiting for or running in workers, per worker, before new requests fall back.
+# Servers size their pool from max_sessions instead, since each session waits for one move at most
+AI_QUEUE_PER_WORKER = 4
+
+# Ship index used in spectator deltas
+SHIP_INDEX = {name: index for index, name in enumerate(Ship.SHIP_SIZES)}
+
+HELP = [
+    "HELP                  this list",
+    "NEW [normal|hard]     start a game against the AI, fleets are placed randomly",
+    "FIRE <target>         shoot at the AI fleet, e.g. FIRE 3,7 or FIRE D7",
+    "BOARD                 both boards, 100 cells each (~ water, S ship, X hit, O miss)",
+    "STATS                 latency of this session's commands and its AI moves that fell back",
+    "RESUME <session>      continue a game that was parked after going idle",
+    "WATCH <session>       spectate another session (turns this connection into a feed)",
+    "NAME <name>           name your results are recorded under (default: guest)",
+    "LEADERBOARD [level]   most wins at a difficulty (default: hard)",
+    "QUIT                  close the session",
+]
+
+
+class LatencyStats:
+    """
+    Running latency figures for a stream of commands.
+    Count, mean and max cover every sample, percentiles use a recent window.
+    """
+    def __init__(self, window=LATENCY_WINDOW):
+        """
+        Initialize empty statistics.
+
+        Args:
+            window (int): Number of recent samples kept for percentiles
+        """
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.recent = deque(maxlen=window)
+
+    def add(self, seconds):
+        """
+        Record one command.
+
+        Args:
+            seconds (float): Time from receiving the command to sending the reply
+        """
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        self.recent.append(seconds)
+
+    def percentile(self, fraction):
+        """
+        Look up a percentile of the recent samples.
+
+        Args:
+            fraction (float): Percentile as a fraction, e.g. 0.99
+
+        Returns:
+            float: The latency in seconds, 0 if nothing was recorded
+        """
+        if not self.recent:
+            return 0.0
+        ordered = sorted(self.recent)
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+    def summary(self):
+        """
+        Format the statistics as protocol key=value pairs.
+
+        Returns:
+            str: Space separated fields with millisecond values
+        """
+        mean = self.total / self.count if self.count else 0.0
+        return (f"commands={self.count} mean_ms={mean * 1000:.3f} "
+                f"p50_ms={self.percentile(0.5) * 1000:.3f} p99_ms={self.percentile(0.99) * 1000:.3f} "
+                f"max_ms={self.max * 1000:.3f}")
+
+
+def _warm_worker():
+    """
+    Run once in each worker at startup, so the process is spawned and the game
+    imported before the first real move is timed.
+
+    Returns:
+        int: The worker's process id
+    """
+    return os.getpid()
+
+
+class AIWorkerPool:
+    """
+    Bounded pool of worker processes that choose AI targets.
+    Requests carry the compact AIPlayer.observe() tuple instead of boards.
+    A request that would overfill the pool, or whose worker misses the
+    deadline, falls back to the cheap random strategy, so one expensive
+    opponent can never stall the other sessions. The counters are guarded
+    by a lock, so sessions on several event loops or threads can share one pool.
+    """
+    def __init__(self, workers=None, timeout=AI_TIMEOUT, max_pending=None):
+        """
+        Initialize the pool.
+
+        Args:
+            workers (int): Worker processes (default: CPU count, 0 = choose targets inline)
+            timeout (float): Seconds to wait for a worker before falling back
+            max_pending (int): Requests allowed in flight, defaults to a few per worker
+        """
+        self.workers = os.cpu_count() if workers is None else workers
+        self.timeout = timeout
+        self.max_pending = max_pending or max(1, self.workers) * AI_QUEUE_PER_WORKER
+        self.pending = 0
+        self.planned = 0
+        self.saturated = 0
+        self.timeouts = 0
+        self._lock = threading.Lock()
+        self._executor = None
+        if self.workers:
+            self._executor = ProcessPoolExecutor(self.workers, initializer=random.seed)
+
+    async def warm(self):
+        """Start every worker process and wait until each has imported the game."""
+        if self._executor is None:
+            return
+        await asyncio.gather(*(asyncio.wrap_future(self._executor.submit(_warm_worker))
+                               for _ in range(self.workers)))
+
+    async def choose_target(self, ai, board):
+        """
+        Pick the AI's next target, in a worker when the strategy is expensive.
+
+        Args:
+            ai (AIPlayer): The AI whose move it is
+            board (Board): The board it attacks
+
+        Returns:
+            tuple: (row, col, fallback) where fallback is None for a move made
+                by the AI's own strategy, or "saturated" or "timeout" when the
+                cheap random strategy had to stand in
+        """
+        if self._executor is None or ai.difficulty == "normal":
+            return (*ai.choose_target(board), None)
+        # The slot stays taken until the worker really finishes, even after a timeout
+        with self._lock:
+            full = self.pending >= self.max_pending
+            if full:
+                self.saturated += 1
+            else:
+                self.pending += 1
+        if full:
+            METRICS.inc("battleships_ai_requests_total", result="saturated")
+            return (*ai._normal_target(board), "saturated")
+
+        started = time.perf_counter()
+        future = asyncio.wrap_future(self._executor.submit(AIPlayer.plan, ai.observe(board)))
+        future.add_done_callback(self._release)
+        try:
+            plan = await asyncio.wait_for(asyncio.shield(future), self.timeout)
+        except asyncio.TimeoutError:
+            with self._lock:
+                self.timeouts += 1
+            METRICS.inc("battleships_ai_requests_total", result="timeout")
+            return (*ai._normal_target(board), "timeout")
+        with self._lock:
+            self.planned += 1
+        # Timed here, including the trip to the worker, since worker processes have their own registry
+        METRICS.observe("battleships_ai_think_seconds", time.perf_counter() - started,
+                        difficulty=ai.difficulty)
+        METRICS.inc("battleships_ai_requests_total", result="planned")
+        return (*ai.adopt_plan(plan), None)
+
+    def _release(self, future):
+        """Free a request slot once its worker is done."""
+        with self._lock:
+            self.pending -= 1
+        if not future.cancelled():
+            future.exception()  # Retrieved, so a plan that failed after its timeout is not logged as lost
+
+    def summary(self):
+        """
+        Format the pool counters as protocol key=value pairs.
+
+        Returns:
+            str: Space separated fields
+        """
+        return (f"ai_workers={self.workers} ai_planned={self.planned} "
+                f"ai_saturated={self.saturated} ai_timeouts={self.timeouts}")
+
+    def shutdown(self):
+        """Stop the worker processes."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+class Spectator:
+    """
+    Bounded outgoing feed for one observer of a session.
+    Updates that do not fit in the queue are dropped and replaced by a single
+    resync marker, so a slow observer gets a fresh snapshot instead of
+    holding up the game or growing an unbounded backlog.
+    """
+    def __init__(self, max_pending=SPECTATOR_QUEUE):
+        """
+        Initialize an empty feed.
+
+        Args:
+            max_pending (int): Updates queued before falling back to a snapshot
+        """
+        self.queue = asyncio.Queue(max_pending)
+        self.resyncs = 0
+
+    def offer(self, line):
+        """
+        Queue an update without ever blocking the game.
+
+        Args:
+            line (str): Update line, or None to request a fresh snapshot
+        """
+        try:
+            self.queue.put_nowait(line)
+        except asyncio.QueueFull:
+            # Everything queued is now stale, replace it with one snapshot request
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(None)
+            self.resyncs += 1
+
+
+class Session:
+    """
+    One player's game against the AI.
+    Every session owns its boards and AI state while a game runs, only the
+    heatmap priors are shared. Players come from and go back to a shared pool.
+    
+    Concurrency: a session's game only changes on the event loop thread,
+    one command at a time. Spectator snapshots and BOARD replies are built
+    from the boards' published views, so they stay consistent even when
+    read elsewhere. What sessions share, the game pool, the learned stores,
+    the solver cache and the AI worker counters, is safe from any thread.
+    """
+    def __init__(self, session_id, pool, career=None):
+        """
+        Initialize a session without a game.
+
+        Args:
+            session_id (str): Identifier sent to the client
+            pool (GamePool): Shared pool of reusable players
+            career (CareerStore): Shared store finished games are recorded in
+        """
+        self.id = session_id
+        self.pool = pool
+        self.career = career
+        self.name = "guest"
+        self.started = 0.0
+        self.player = None
+        self.ai = None
+        self.turn = 0
+        self.winner = None
+        self.latency = LatencyStats()
+        self.spectators = set()
+        self.seq = 0  # Number of the last update published to spectators
+        self.ai_moves = 0
+        self.ai_fallbacks = {"saturated": 0, "timeout": 0}  # AI moves the random strategy stood in for
+
+    @property
+    def in_progress(self):
+        """bool: True while a game has been started and not yet won."""
+        return self.player is not None and self.winner is None
+
+    def new_game(self, difficulty):
+        """
+        Start a game with both fleets placed randomly.
+
+        Args:
+            difficulty (str): The AI difficulty - "normal" or "hard"
+        """
+        self.close()
+        self.player, self.ai = self.pool.acquire(difficulty)
+        self.player.setup()
+        self.ai.setup()
+        self.turn = 0
+        self.winner = None
+        self.started = time.monotonic()
+        self._publish_snapshot()
+
+    async def fire(self, row, col, ai_workers):
+        """
+        Play one round: the player's shot, then the AI's reply.
+
+        Args:
+            row (int): Target row
+            col (int): Target column
+            ai_workers (AIWorkerPool): Where the AI's target is chosen
+
+        Returns:
+            list: Response lines, ending with OK or ERR
+        """
+        if not self.ai.board.is_untried(row, col):
+            return [f"ERR already targeted {row},{col}"]
+        return await self._play_round(row, col, ai_workers) + ["OK"]
+
+    async def _play_round(self, row, col, ai_workers):
+        """
+        Fire the player's shot and, unless that won the game, the AI's reply.
+
+        Args:
+            row (int): Target row
+            col (int): Target column
+            ai_workers (AIWorkerPool): Where the AI's target is chosen
+
+        Returns:
+            list: SHOT lines and an OVER line if the game ended
+        """
+        self.turn += 1
+        METRICS.inc("battleships_turns_total")
+        self.ai.board.register_attack(row, col)
+        lines = [self._shot_line("player", self.ai.board)]
+        self._publish_shot("player", self.ai.board)
+        if self.ai.board.all_ships_sunk():
+            self._finish("player")
+            return lines + ["OVER player"]
+
+        ai_row, ai_col, fallback = await ai_workers.choose_target(self.ai, self.player.board)
+        self.ai_moves += 1
+        if fallback is not None:
+            self.ai_fallbacks[fallback] += 1
+        self.ai.fire_at(ai_row, ai_col, self.player.board, announce=False)
+        lines.append(self._shot_line("cpu", self.player.board))
+        self._publish_shot("cpu", self.player.board)
+        if self.player.board.all_ships_sunk():
+            self._finish("cpu")
+            lines.append("OVER cpu")
+        return lines
+
+    def _finish(self, winner):
+        """
+        End the game and tell spectators who won.
+
+        Args:
+            winner (str): "player" or "cpu"
+        """
+        self.winner = winner
+        if self.career is not None:
+            self.career.record_boards(self.player, self.ai, self.turn,
+                                      time.monotonic() - self.started, name=self.name)
+        self.seq += 1
+        self._broadcast(f"E {self.seq} {winner}")
+
+    def ai_summary(self):
+        """
+        Format how many of this session's AI moves were degraded to the random strategy.
+
+        Returns:
+            str: Space separated key=value fields
+        """
+        return (f"ai_moves={self.ai_moves} ai_saturated={self.ai_fallbacks['saturated']} "
+                f"ai_timeouts={self.ai_fallbacks['timeout']}")
+
+    def board_lines(self):
+        """
+        Encode both boards as one character per cell.
+        The player sees their own ships, the AI fleet only shows hits and misses.
+
+        Returns:
+            list: Response lines
+        """
+        own = "".join(cell if cell in ["~", "X", "O"] else "S"
+                      for row in self.player.board.view.hidden for cell in row)
+        enemy = "".join(cell for row in self.ai.board.view.visible for cell in row)
+        return [f"BOARD player {own}", f"BOARD cpu {enemy}"]
+
+    def park(self):
+        """
+        Snapshot an unfinished game so it can be resumed after an idle disconnect.
+
+        Returns:
+            bytes: SaveGame encoding of the session
+        """
+        return SaveGame.encode(self.player, self.ai, self.turn)
+
+    def restore(self, data):
+        """
+        Continue a game parked with park().
+
+        Args:
+            data (bytes): SaveGame encoding of the session
+        """
+        player, ai, turn, _ = SaveGame.decode(data)
+        self.close()
+        self.player, self.ai, self.turn = player, ai, turn
+        self.winner = None
+        self.started = time.monotonic()
+        self._publish_snapshot()
+
+    def snapshot(self):
+        """
+        Encode what spectators may see: hits and misses on both boards, no ships.
+
+        Returns:
+            str: SNAP line with the update number and 100 cells per board
+        """
+        player, ai, seq = self.player, self.ai, self.seq
+        if player is None or ai is None:
+            return f"SNAP {seq} - -"
+        cells = ["".join(cell if cell in ["X", "O"] else "~" for row in board.view.visible for cell in row)
+                 for board in (player.board, ai.board)]
+        return f"SNAP {seq} {cells[0]} {cells[1]}"
+
+    def _publish_snapshot(self):
+        """Send every spectator a full snapshot, after the boards changed wholesale."""
+        self.seq += 1
+        self._broadcast(None)
+
+    def _publish_shot(self, shooter, board):
+        """
+        Send spectators a delta for the attack just registered on a board.
+        Deltas look like "D 12 p37h2": shooter (p/c), row, column, outcome
+        (m/h/s) and, for hits, the index of the ship in Ship.SHIP_SIZES.
+
+        Args:
+            shooter (str): "player" or "cpu"
+            board (Board): The board that was attacked
+        """
+        if not self.spectators:
+            return
+        row, col, hit_ship = board.last_attack
+        self.seq += 1
+        delta = f"D {self.seq} {shooter[0]}{row}{col}{board.last_attack_outcome()[0]}"
+        self._broadcast(f"{delta}{SHIP_INDEX[hit_ship.name]}" if hit_ship else delta)
+
+    def _broadcast(self, line):
+        """
+        Queue an update for every spectator.
+
+        Args:
+            line (str): Update line, or None for a snapshot
+        """
+        for spectator in self.spectators:
+            spectator.offer(line)
+
+    def close(self):
+        """Hand the current players back to the pool."""
+        if self.player is not None:
+            self.pool.release(self.player, self.ai)
+        self.player = self.ai = None
+
+    @staticmethod
+    def _shot_line(shooter, board):
+        """
+        Describe the attack just registered on a board.
+
+        Args:
+            shooter (str): "player" or "cpu"
+            board (Board): The board that was attacked
+
+        Returns:
+            str: SHOT line with the coordinates, outcome and any ship hit
+        """
+        row, col, hit_ship = board.last_attack
+        line = f"SHOT {shooter} {row} {col} {board.last_attack_outcome()}"
+        return f"{line} {hit_ship.name}" if hit_ship else line
+
+
+class GameServer:
+    """
+    Asyncio TCP server hosting independent game sessions.
+    Commands and replies are UTF-8 lines, and every reply ends with one OK,
+    ERR, BYE or HELLO line. Each connection is one session;
+    sessions that stay idle too long are disconnected and their unfinished
+    game is parked in memory so RESUME can pick it up again.
+    """
+    def __init__(self, host=DEFAULT_HOST, port=DEFAULT_PORT, max_sessions=256,
+                 idle_timeout=300.0, max_parked=1024, heatmaps=None, ai_workers=None):
+        """
+        Initialize the server.
+
+        Args:
+            host (str): Interface to listen on
+            port (int): TCP port, 0 picks a free one
+            max_sessions (int): Connections served at once, later ones are turned away
+            idle_timeout (float): Seconds without a command before a session is evicted
+            max_parked (int): Parked games kept for RESUME, oldest dropped first
+            heatmaps (HeatmapStore): Shared store for AI priors, defaults to the user store
+            ai_workers (AIWorkerPool): Where AI targets are chosen, defaults to a pool per CPU
+                with room for one pending move per session
+        """
+        self.host = host
+        self.port = port
+        self.max_sessions = max_sessions
+        self.idle_timeout = idle_timeout
+        self.max_parked = max_parked
+        self.heatmaps = heatmaps or HeatmapStore()
+        self.pool = GamePool(self.heatmaps, max_size=max_sessions, placements=PlacementStore())
+        self.ai_workers = ai_workers or AIWorkerPool(max_pending=max_sessions)
+        self.career = CareerStore()
+        self.sessions = {}
+        self.parked = OrderedDict()
+        self.latency = LatencyStats()
+        self._server = None
+        METRICS.gauge("battleships_games_active",
+                      lambda: sum(session.in_progress for session in list(self.sessions.values())))
+        METRICS.gauge("battleships_sessions_connected", lambda: len(self.sessions))
+
+    async def start(self):
+        """
+        Start listening.
+
+        Returns:
+            int: The port the server is bound to
+        """
+        # Spawning workers can take longer than a move's deadline, so it happens before the first move
+        await self.ai_workers.warm()
+        self._server = await asyncio.start_server(self.handle, self.host, self.port, limit=MAX_LINE)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self.port
+
+    async def serve_forever(self):
+        """Start the server if needed and serve until cancelled."""
+        if self._server is None:
+            await self.start()
+        try:
+            async with self._server:
+                await self._server.serve_forever()
+        finally:
+            print(f"server stopped: {self.latency.summary()} {self.ai_workers.summary()}", file=sys.stderr)
+            self.ai_workers.shutdown()
+            self.career.close()
+
+    async def handle(self, reader, writer):
+        """
+        Serve one connection as one session.
+
+        Args:
+            reader (asyncio.StreamReader): Incoming command stream
+            writer (asyncio.StreamWriter): Outgoing reply stream
+        """
+        if len(self.sessions) >= self.max_sessions:
+            writer.write(b"ERR server full\n")
+            await self._close(writer)
+            return
+
+        session = Session(secrets.token_hex(8), self.pool, self.career)
+        self.sessions[session.id] = session
+        try:
+            await self._send(writer, [f"HELLO battleships {PROTOCOL_VERSION} {session.id}"])
+            while True:
+                try:
+                    raw = await asyncio.wait_for(reader.readline(), self.idle_timeout)
+                except asyncio.TimeoutError:
+                    if session.in_progress:
+                        self._park(session)
+                    await self._send(writer, [f"BYE idle {session.id}"])
+                    break
+                except ValueError:
+                    await self._send(writer, ["ERR line too long"])
+                    break
+                if not raw:
+                    break
+
+                line = raw.decode("utf-8", "replace").strip()
+                if line.upper().startswith("WATCH "):
+                    await self.watch(line[6:].strip(), reader, writer)
+                    break
+
+                started = time.perf_counter()
+                replies = await self.dispatch(session, line)
+                await self._send(writer, replies)
+                elapsed = time.perf_counter() - started
+                session.latency.add(elapsed)
+                self.latency.add(elapsed)
+                if replies and replies[-1] == "BYE":
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            for spectator in session.spectators:
+                spectator.offer("BYE ended")
+            session.close()
+            del self.sessions[session.id]
+            print(f"session {session.id} closed: {session.latency.summary()} {session.ai_summary()}",
+                  file=sys.stderr)
+            await self._close(writer)
+
+    async def watch(self, session_id, reader, writer):
+        """
+        Stream a session's updates to this connection until either side goes away.
+        The feed starts with a snapshot and continues with one delta per shot.
+        After a resync snapshot, deltas numbered at or below the snapshot's
+        number are already included in it and can be skipped.
+
+        Args:
+            session_id (str): The session to watch
+            reader (asyncio.StreamReader): Incoming stream, only watched for disconnects
+            writer (asyncio.StreamWriter): Outgoing update stream
+        """
+        session = self.sessions.get(session_id)
+        if session is None:
+            await self._send(writer, [f"ERR no session {session_id}"])
+            return
+
+        spectator = Spectator()
+        session.spectators.add(spectator)
+        hangup = asyncio.create_task(self._wait_for_hangup(reader))
+        try:
+            await self._send(writer, [f"OK WATCH {session_id}", session.snapshot()])
+            while True:
+                update = asyncio.create_task(spectator.queue.get())
+                await asyncio.wait([update, hangup], return_when=asyncio.FIRST_COMPLETED)
+                if not update.done():
+                    update.cancel()
+                    break
+                line = update.result()
+                await self._send(writer, [line if line is not None else session.snapshot()])
+                if line is not None and line.startswith("BYE"):
+                    break
+        finally:
+            hangup.cancel()
+            session.spectators.discard(spectator)
+
+    @staticmethod
+    async def _wait_for_hangup(reader):
+        """Discard anything a spectator sends until it disconnects."""
+        while await reader.read(MAX_LINE):
+            pass
+
+    async def dispatch(self, session, line):
+        """
+        Run one protocol command.
+
+        Args:
+            session (Session): The session the command belongs to
+            line (str): The command line
+
+        Returns:
+            list: Response lines
+        """
+        command, _, argument = line.partition(" ")
+        command = command.upper()
+        argument = argument.strip()
+
+        if command == "HELP":
+            return HELP + ["OK"]
+        if command == "NEW":
+            difficulty = argument.lower() or "normal"
+            if difficulty not in SaveGame.DIFFICULTIES:
+                return [f"ERR unknown difficulty {difficulty}"]
+            session.new_game(difficulty)
+            return [f"OK NEW {difficulty}"]
+        if command == "FIRE":
+            if not session.in_progress:
+                return ["ERR no game in progress"]
+            target = UI.parse_coordinates(argument)
+            if target is None:
+                return [f"ERR bad target {argument}"]
+            return await session.fire(*target, self.ai_workers)
+        if command == "BOARD":
+            if session.player is None:
+                return ["ERR no game in progress"]
+            return session.board_lines() + ["OK"]
+        if command == "STATS":
+            return [f"STATS {session.latency.summary()} {session.ai_summary()}", "OK"]
+        if command == "RESUME":
+            data = self.parked.pop(argument, None)
+            if data is None:
+                return [f"ERR no parked game {argument}"]
+            session.restore(data)
+            return [f"OK RESUME {session.turn}"]
+        if command == "NAME":
+            if not argument or len(argument) > 32:
+                return ["ERR name must be 1-32 characters"]
+            session.name = argument
+            return [f"OK NAME {argument}"]
+        if command == "LEADERBOARD":
+            difficulty = argument.lower() or "hard"
+            rows = await asyncio.to_thread(self.career.leaderboard, difficulty)
+            # Players without a win have no best game, sent as "-" so the field never reads None
+            return [f"RANK {rank} {name} wins={wins} games={games} accuracy={accuracy:.1f} "
+                    f"best_turns={'-' if best is None else best}"
+                    for rank, (name, wins, games, accuracy, best) in enumerate(rows, 1)] + ["OK"]
+        if command == "QUIT":
+            return ["BYE"]
+        return [f"ERR unknown command {command}"]
+
+    def _park(self, session):
+        """
+        Keep an evicted session's game for RESUME, dropping the oldest if full.
+
+        Args:
+            session (Session): The session being evicted
+        """
+        self.parked[session.id] = session.park()
+        while len(self.parked) > self.max_parked:
+            self.parked.popitem(last=False)
+
+    @staticmethod
+    async def _send(writer, lines):
+        """
+        Write reply lines and wait until they are flushed.
+
+        Args:
+            writer (asyncio.StreamWriter): Outgoing stream
+            lines (list): Lines without newlines
+        """
+        writer.write("".join(line + "\n" for line in lines).encode("utf-8"))
+        await writer.drain()
+
+    @staticmethod
+    async def _close(writer):
+        """Close a connection, ignoring a peer that is already gone."""
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except ConnectionError:
+            pass
+
+
+async def read_reply(reader):
+    """
+    Read the response lines to one command.
+    Every reply ends with exactly one OK, ERR, BYE or HELLO line.
+
+    Args:
+        reader (asyncio.StreamReader): Stream from the server
+
+    Returns:
+        list: Response lines
+    """
+    lines = []
+    while True:
+        raw = await reader.readline()
+        if not raw:
+            return lines
+        line = raw.decode("utf-8").rstrip("\n")
+        lines.append(line)
+        if line.partition(" ")[0] in ("OK", "ERR", "BYE", "HELLO"):
+            return lines
+
+
+def format_board_line(line):
+    """
+    Render a BOARD reply as a grid.
+
+    Args:
+        line (str): "BOARD <owner> <100 cells>"
+
+    Returns:
+        str: Multi-line grid with row and column labels
+    """
+    _, owner, cells = line.split(" ", 2)
+    rows = [f"{owner.upper()} FLEET", "  " + " ".join(str(c) for c in range(10))]
+    for r in range(10):
+        rows.append(f"{r} " + " ".join(cells[r * 10:(r + 1) * 10]))
+    return "\n".join(rows)
+
+
+async def run_client(host, port):
+    """
+    Interactive client: type protocol commands, see the replies.
+
+    Args:
+        host (str): Server address
+        port (int): Server port
+    """
+    reader, writer = await asyncio.open_connection(host, port, limit=MAX_LINE * 4)
+    for line in await read_reply(reader):
+        print(line)
+    while True:
+        try:
+            command = await asyncio.to_thread(input, "> ")
+        except EOFError:
+            command = "QUIT"
+        if not command.strip():
+            continue
+        writer.write(command.encode("utf-8") + b"\n")
+        await writer.drain()
+        replies = await read_reply(reader)
+        for line in replies:
+            print(format_board_line(line) if line.startswith("BOARD ") else line)
+        if not replies or replies[-1].startswith("BYE"):
+            break
+    writer.close()
+
+
+async def run_watch(host, port, session_id):
+    """
+    Spectate a session, redrawing both boards from snapshots and deltas.
+
+    Args:
+        host (str): Server address
+        port (int): Server port
+        session_id (str): The session to watch
+    """
+    reader, writer = await asyncio.open_connection(host, port, limit=MAX_LINE * 4)
+    await read_reply(reader)
+    writer.write(f"WATCH {session_id}\n".encode("utf-8"))
+    await writer.drain()
+
+    boards = {"p": list("~" * 100), "c": list("~" * 100)}
+    seen = 0
+    while True:
+        raw = await reader.readline()
+        if not raw:
+            break
+        kind, _, rest = raw.decode("utf-8").strip().partition(" ")
+        if kind == "SNAP":
+            seq, player, cpu = rest.split(" ")
+            seen = int(seq)
+            if player != "-":
+                boards = {"p": list(player), "c": list(cpu)}
+        elif kind == "D":
+            seq, delta = rest.split(" ")
+            if int(seq) <= seen:
+                continue
+            seen = int(seq)
+            # Boards are keyed by who was shot at, the other side of the shooter
+            board = boards["c" if delta[0] == "p" else "p"]
+            board[int(delta[1]) * 10 + int(delta[2])] = "O" if delta[3] == "m" else "X"
+        elif kind == "E":
+            print(f"Game over, winner: {rest.split(' ')[1]}")
+            continue
+        else:
+            print(kind, rest)
+            if kind in ("ERR", "BYE"):
+                break
+            continue
+        print(format_board_line("BOARD player " + "".join(boards["p"])))
+        print(format_board_line("BOARD cpu " + "".join(boards["c"])))
+        print()
+    writer.close()
+
+
+async def run_bot(host, port, games, difficulty):
+    """
+    Play full games with random shots, timing every round trip.
+
+    Args:
+        host (str): Server address
+        port (int): Server port
+        games (int): Games to play on this connection
+        difficulty (str): AI difficulty
+
+    Returns:
+        LatencyStats: Round-trip latency of every command
+    """
+    stats = LatencyStats(window=games * 128)
+    reader, writer = await asyncio.open_connection(host, port, limit=MAX_LINE * 4)
+    await read_reply(reader)
+
+    async def request(command):
+        started = time.perf_counter()
+        writer.write(command.encode("utf-8") + b"\n")
+        await writer.drain()
+        replies = await read_reply(reader)
+        stats.add(time.perf_counter() - started)
+        return replies
+
+    for _ in range(games):
+        await request(f"NEW {difficulty}")
+        targets = [(r, c) for r in range(10) for c in range(10)]
+        random.shuffle(targets)
+        for row, col in targets:
+            replies = await request(f"FIRE {row},{col}")
+            if any(line.startswith("OVER") for line in replies):
+                break
+    await request("QUIT")
+    writer.close()
+    return stats
+
+
+async def run_load(host, port, bots, games, difficulty):
+    """
+    Run many bots at once and report the combined latency.
+
+    Args:
+        host (str): Server address
+        port (int): Server port
+        bots (int): Concurrent connections
+        games (int): Games per connection
+        difficulty (str): AI difficulty
+    """
+    started = time.perf_counter()
+    results = await asyncio.gather(*(run_bot(host, port, games, difficulty) for _ in range(bots)))
+    elapsed = time.perf_counter() - started
+
+    combined = LatencyStats(window=sum(len(s.recent) for s in results))
+    for stats in results:
+        for sample in stats.recent:
+            combined.add(sample)
+    print(f"{bots} bots x {games} games in {elapsed:.2f}s "
+          f"({combined.count / elapsed:.0f} commands/s)")
+    print(f"round trip: {combined.summary()}")
+
+
+def main():
+    """Command-line entry point for the server, the clients and the load generator."""
+    parser = argparse.ArgumentParser(description="Battleships multi-session game server.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    serve = commands.add_parser("serve", help="Run the server")
+    serve.add_argument("--host", default=DEFAULT_HOST)
+    serve.add_argument("--port", type=int, default=DEFAULT_PORT)
+    serve.add_argument("--max-sessions", type=int, default=256,
+                       help="Connections served at once")
+    serve.add_argument("--idle-timeout", type=float, default=300.0,
+                       help="Seconds without a command before a session is evicted")
+    serve.add_argument("--ai-workers", type=int, default=None,
+                       help="Processes choosing AI targets (default: CPU count, 0 = inline)")
+    serve.add_argument("--ai-timeout", type=float, default=AI_TIMEOUT,
+                       help="Seconds an AI move may take before a random shot is used")
+    serve.add_argument("--ai-max-pending", type=int, default=None,
+                       help="AI moves queued for workers before a random shot is used (default: --max-sessions)")
+    serve.add_argument("--metrics-port", type=int, default=None,
+                       help="Serve Prometheus metrics at http://HOST:PORT/metrics")
+
+    connect = commands.add_parser("connect", help="Play interactively against a server")
+    connect.add_argument("--host", default=DEFAULT_HOST)
+    connect.add_argument("--port", type=int, default=DEFAULT_PORT)
+
+    watch = commands.add_parser("watch", help="Spectate a session on a server")
+    watch.add_argument("session", help="Session id, as shown in the session's HELLO line")
+    watch.add_argument("--host", default=DEFAULT_HOST)
+    watch.add_argument("--port", type=int, default=DEFAULT_PORT)
+
+    load = commands.add_parser("load", help="Drive a server with bot players")
+    load.add_argument("--host", default=DEFAULT_HOST)
+    load.add_argument("--port", type=int, default=DEFAULT_PORT)
+    load.add_argument("--bots", type=int, default=50, help="Concurrent connections")
+    load.add_argument("--games", type=int, default=5, help="Games per connection")
+    load.add_argument("--difficulty", choices=SaveGame.DIFFICULTIES, default="normal")
+    args = parser.parse_args()
+
+    try:
+        if args.command == "serve":
+            server = GameServer(args.host, args.port, args.max_sessions, args.idle_timeout,
+                                ai_workers=AIWorkerPool(args.ai_workers, args.ai_timeout,
+                                                        args.ai_max_pending or args.max_sessions))
+            if args.metrics_port is not None:
+                METRICS.serve(args.metrics_port, args.host)
+            asyncio.run(server.serve_forever())
+        elif args.command == "connect":
+            asyncio.run(run_client(args.host, args.port))
+        elif args.command == "watch":
+            asyncio.run(run_watch(args.host, args.port, args.session))
+        else:
+            asyncio.run(run_load(args.host, args.port, args.bots, args.games, args.difficulty))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,464 @@
+# Battleships Replay Analytics - Streaming aggregation over recorded games
+import argparse
+import glob
+import gzip
+import json
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from Battleships import Ship, user_data_path
+
+GRID_SIZE = 10
+MAX_TURNS = GRID_SIZE * GRID_SIZE
+SHOOTERS = ("player", "cpu")
+OUTCOMES = ("miss", "hit", "sunk")
+
+# Upper bounds (ms) of the log-spaced think-time histogram buckets, 0.01ms up to ~22 minutes
+THINK_BUCKETS_MS = [0.01 * (2 ** i) for i in range(28)]
+
+# Default size of the byte ranges handed to each worker
+CHUNK_SIZE = 8 * 1024 * 1024
+
+# Chunks submitted per worker at a time, enough to keep workers busy without reading ahead of them
+CHUNKS_IN_FLIGHT_PER_WORKER = 2
+
+
+class ReplayStats:
+    """
+    Mergeable aggregate over a stream of replay records.
+    Every field has a fixed size (bounded by the grid, the turn limit and the
+    histogram buckets), so memory stays flat no matter how many records are fed in.
+    """
+    def __init__(self):
+        """Initialize empty counters for both shooters."""
+        cells = GRID_SIZE * GRID_SIZE
+        self.records = 0
+        self.malformed = 0
+        self.games = 0
+        self.wins = {shooter: 0 for shooter in SHOOTERS}
+        self.shots = {shooter: [0] * cells for shooter in SHOOTERS}
+        self.hits = {shooter: [0] * cells for shooter in SHOOTERS}
+        self.turn_shots = {shooter: [0] * MAX_TURNS for shooter in SHOOTERS}
+        self.turn_hits = {shooter: [0] * MAX_TURNS for shooter in SHOOTERS}
+        # sinks[shooter][ship][turn - 1] = ships of that class sunk by shooter on that turn
+        self.sinks = {shooter: {name: [0] * MAX_TURNS for name in Ship.SHIP_SIZES}
+                      for shooter in SHOOTERS}
+        # think[label] = histogram over THINK_BUCKETS_MS plus one overflow bucket
+        self.think = {}
+
+    def add(self, record):
+        """
+        Fold a single replay record into the aggregate.
+
+        Args:
+            record (dict): A decoded replay line
+        """
+        self.records += 1
+        kind = record.get("type")
+
+        if kind == "start":
+            self.games += 1
+        elif kind == "end":
+            if record.get("winner") in self.wins:
+                self.wins[record["winner"]] += 1
+        elif kind == "shot":
+            try:
+                shooter, cell, turn, outcome, ship = _shot_fields(record)
+            except (KeyError, TypeError, ValueError, OverflowError):
+                self.malformed += 1
+                return
+
+            # Every field is valid, so the record is counted completely or not at all
+            self.shots[shooter][cell] += 1
+            self.turn_shots[shooter][turn] += 1
+            if outcome in ("hit", "sunk"):
+                self.hits[shooter][cell] += 1
+                self.turn_hits[shooter][turn] += 1
+            if outcome == "sunk":
+                self.sinks[shooter][ship][turn] += 1
+
+            think_ms = record.get("think_ms")
+            if isinstance(think_ms, (int, float)):
+                label = "player" if shooter == "player" else f"cpu/{record.get('difficulty')}"
+                histogram = self.think.setdefault(label, [0] * (len(THINK_BUCKETS_MS) + 1))
+                histogram[_bucket_index(think_ms)] += 1
+        else:
+            self.malformed += 1
+
+    def merge(self, other):
+        """
+        Add another partial aggregate into this one.
+
+        Args:
+            other (ReplayStats): The aggregate to merge in
+
+        Returns:
+            ReplayStats: self, to allow chaining
+        """
+        self.records += other.records
+        self.malformed += other.malformed
+        self.games += other.games
+        for shooter in SHOOTERS:
+            self.wins[shooter] += other.wins[shooter]
+            _add_into(self.shots[shooter], other.shots[shooter])
+            _add_into(self.hits[shooter], other.hits[shooter])
+            _add_into(self.turn_shots[shooter], other.turn_shots[shooter])
+            _add_into(self.turn_hits[shooter], other.turn_hits[shooter])
+            for name, counts in other.sinks[shooter].items():
+                _add_into(self.sinks[shooter][name], counts)
+        for label, histogram in other.think.items():
+            _add_into(self.think.setdefault(label, [0] * len(histogram)), histogram)
+        return self
+
+    def heatmap(self, shooter, kind="shots"):
+        """
+        Get a heatmap as a GRID_SIZE x GRID_SIZE list of rows.
+
+        Args:
+            shooter (str): "player" or "cpu"
+            kind (str): "shots", "hits" or "hit_rate"
+
+        Returns:
+            list: Rows of counts (or ratios for "hit_rate")
+        """
+        shots = self.shots[shooter]
+        hits = self.hits[shooter]
+        if kind == "shots":
+            flat = shots
+        elif kind == "hits":
+            flat = hits
+        else:
+            flat = [h / s if s else 0.0 for h, s in zip(hits, shots)]
+        return [flat[r * GRID_SIZE:(r + 1) * GRID_SIZE] for r in range(GRID_SIZE)]
+
+    def hit_rate_by_turn(self, shooter):
+        """
+        Get the hit rate for each turn that saw at least one shot.
+
+        Args:
+            shooter (str): "player" or "cpu"
+
+        Returns:
+            list: (turn, shots, hit rate) tuples
+        """
+        return [(turn + 1, shots, self.turn_hits[shooter][turn] / shots)
+                for turn, shots in enumerate(self.turn_shots[shooter]) if shots]
+
+    def survival_curve(self, shooter, ship_name):
+        """
+        Fraction of ships of one class still afloat after each turn.
+        Games that ended early count as survivals (right-censored).
+
+        Args:
+            shooter (str): The side doing the sinking
+            ship_name (str): Ship class, e.g. "Carrier"
+
+        Returns:
+            list: Survival fraction for turns 1..MAX_TURNS
+        """
+        if not self.games:
+            return []
+        curve = []
+        sunk = 0
+        for count in self.sinks[shooter][ship_name]:
+            sunk += count
+            curve.append(1.0 - sunk / self.games)
+        return curve
+
+    def think_percentiles(self, label, percentiles=(50, 90, 99)):
+        """
+        Estimate think-time percentiles from the histogram (bucket upper bounds).
+
+        Args:
+            label (str): "player" or "cpu/<difficulty>"
+            percentiles (tuple): Percentiles to compute
+
+        Returns:
+            dict: Percentile to milliseconds (None for the overflow bucket)
+        """
+        histogram = self.think.get(label)
+        total = sum(histogram) if histogram else 0
+        if not total:
+            return {}
+        result = {}
+        for pct in percentiles:
+            threshold = total * pct / 100
+            cumulative = 0
+            for index, count in enumerate(histogram):
+                cumulative += count
+                if cumulative >= threshold:
+                    result[pct] = THINK_BUCKETS_MS[index] if index < len(THINK_BUCKETS_MS) else None
+                    break
+        return result
+
+    def to_dict(self):
+        """
+        Convert the aggregate into plain data for JSON reports.
+
+        Returns:
+            dict: Report data
+        """
+        return {
+            "records": self.records,
+            "malformed": self.malformed,
+            "games": self.games,
+            "wins": self.wins,
+            "heatmaps": {shooter: {kind: self.heatmap(shooter, kind)
+                                   for kind in ("shots", "hits", "hit_rate")}
+                         for shooter in SHOOTERS},
+            "hit_rate_by_turn": {shooter: self.hit_rate_by_turn(shooter) for shooter in SHOOTERS},
+            "survival": {shooter: {name: self.survival_curve(shooter, name)
+                                   for name in Ship.SHIP_SIZES}
+                         for shooter in SHOOTERS},
+            "think_ms": {label: {"buckets_ms": THINK_BUCKETS_MS, "counts": histogram,
+                                 "percentiles": self.think_percentiles(label)}
+                         for label, histogram in self.think.items()}
+        }
+
+    def format_report(self):
+        """
+        Render a plain-text nightly report.
+
+        Returns:
+            str: The report
+        """
+        lines = [f"Replay records: {self.records} ({self.malformed} malformed)",
+                 f"Games: {self.games} | Player wins: {self.wins['player']} | CPU wins: {self.wins['cpu']}"]
+
+        for shooter in SHOOTERS:
+            lines.append(f"\n[{shooter.upper()} SHOT HEATMAP - hit rate per cell]")
+            lines.append("    " + " ".join(f"{c:>4}" for c in range(GRID_SIZE)))
+            for r, row in enumerate(self.heatmap(shooter, "hit_rate")):
+                lines.append(f"{r:>2}  " + " ".join(f"{value:4.2f}" for value in row))
+
+            lines.append(f"\n[{shooter.upper()} HIT RATE BY TURN]")
+            for turn, shots, rate in self.hit_rate_by_turn(shooter)[::10]:
+                lines.append(f"  turn {turn:>3}: {rate:6.1%} over {shots} shots")
+
+            target = "CPU" if shooter == "player" else "PLAYER"
+            lines.append(f"\n[{target} FLEET SURVIVAL - afloat after turn 10/25/50/75]")
+            for name in Ship.SHIP_SIZES:
+                curve = self.survival_curve(shooter, name)
+                if curve:
+                    points = " ".join(f"{curve[t - 1]:6.1%}" for t in (10, 25, 50, 75))
+                    lines.append(f"  {name.ljust(10)} {points}")
+
+        lines.append("\n[THINK TIME PERCENTILES (ms, bucket upper bounds)]")
+        for label in sorted(self.think):
+            pcts = self.think_percentiles(label)
+            lines.append(f"  {label.ljust(12)} " + "  ".join(
+                f"p{pct}={'>max' if value is None else f'{value:.2f}'}" for pct, value in pcts.items()))
+        return "\n".join(lines)
+
+
+def _add_into(target, source):
+    """Element-wise add source into target in place."""
+    for index, value in enumerate(source):
+        target[index] += value
+
+
+def _shot_fields(record):
+    """
+    Extract and validate every field of a shot record before anything is counted.
+
+    Args:
+        record (dict): A decoded replay line of type "shot"
+
+    Returns:
+        tuple: (shooter, cell index, turn index, outcome, sunk ship name or None)
+
+    Raises:
+        KeyError: If a field is missing
+        ValueError: If a field is out of range
+    """
+    shooter = record["shooter"]
+    row = record["row"]
+    col = record["col"]
+    outcome = record["outcome"]
+    if shooter not in SHOOTERS:
+        raise ValueError(f"unknown shooter {shooter!r}")
+    # bool is an int, but True is no row
+    for value in (row, col):
+        if not isinstance(value, int) or isinstance(value, bool) or not 0 <= value < GRID_SIZE:
+            raise ValueError(f"cell {row!r},{col!r} is off the grid")
+    turn = min(max(int(record["turn"]), 1), MAX_TURNS) - 1
+    if outcome not in OUTCOMES:
+        raise ValueError(f"unknown outcome {outcome!r}")
+    ship = None
+    if outcome == "sunk":
+        ship = record["ship"]
+        if ship not in Ship.SHIP_SIZES:
+            raise ValueError(f"unknown ship {ship!r}")
+    return shooter, row * GRID_SIZE + col, turn, outcome, ship
+
+
+def _bucket_index(value):
+    """Find the histogram bucket for a think time in milliseconds."""
+    for index, bound in enumerate(THINK_BUCKETS_MS):
+        if value <= bound:
+            return index
+    return len(THINK_BUCKETS_MS)
+
+
+def expand_paths(paths):
+    """
+    Expand directories into the replay files they contain.
+
+    Args:
+        paths (list): Files and/or directories
+
+    Returns:
+        list: Replay file paths
+    """
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(sorted(glob.glob(os.path.join(path, "*.jsonl"))))
+            files.extend(sorted(glob.glob(os.path.join(path, "*.jsonl.gz"))))
+        else:
+            files.append(path)
+    return files
+
+
+def iter_chunks(files, chunk_size=CHUNK_SIZE):
+    """
+    Split replay files into byte ranges that can be processed independently.
+    Compressed files cannot be seeked and are always one chunk.
+
+    Args:
+        files (list): Replay file paths
+        chunk_size (int): Target bytes per chunk
+
+    Yields:
+        tuple: (path, start offset, end offset) with end=None meaning end of file
+    """
+    for path in files:
+        if path.endswith(".gz"):
+            yield (path, 0, None)
+            continue
+        size = os.path.getsize(path)
+        for start in range(0, max(size, 1), chunk_size):
+            yield (path, start, min(start + chunk_size, size))
+
+
+def iter_records(chunk):
+    """
+    Stream decoded records from one chunk.
+    A record belongs to the chunk its first byte falls in, so chunks never overlap.
+
+    Args:
+        chunk (tuple): (path, start offset, end offset)
+
+    Yields:
+        dict or None: Each decoded record, None for undecodable lines
+    """
+    for line in _iter_lines(chunk):
+        if line.strip():
+            yield _decode(line)
+
+
+def _iter_lines(chunk):
+    """Yield the raw lines that start inside a chunk."""
+    path, start, end = chunk
+    if end is None:
+        with gzip.open(path, "rb") as f:
+            yield from f
+        return
+
+    with open(path, "rb") as f:
+        if start > 0:
+            # Skip the tail of the line that began in the previous chunk
+            f.seek(start - 1)
+            f.readline()
+        position = f.tell()
+        while position < end:
+            line = f.readline()
+            if not line:
+                break
+            position += len(line)
+            yield line
+
+
+def _decode(line):
+    """Decode a single JSON line, returning None if it is malformed."""
+    try:
+        return json.loads(line)
+    except ValueError:
+        return None
+
+
+def analyze_chunk(chunk):
+    """
+    Aggregate a single chunk (runs inside worker processes).
+
+    Args:
+        chunk (tuple): (path, start offset, end offset)
+
+    Returns:
+        ReplayStats: The partial aggregate
+    """
+    stats = ReplayStats()
+    for record in iter_records(chunk):
+        if isinstance(record, dict):
+            stats.add(record)
+        else:
+            stats.malformed += 1
+    return stats
+
+
+def analyze(paths, workers=None, chunk_size=CHUNK_SIZE):
+    """
+    Aggregate replay files, processing chunks in parallel and merging the results.
+    Only a few chunks per worker are in flight at once, so memory stays bounded
+    however many replays there are.
+
+    Args:
+        paths (list): Replay files and/or directories
+        workers (int): Worker processes, 1 to run in-process, None for CPU count
+        chunk_size (int): Target bytes per chunk
+
+    Returns:
+        ReplayStats: The merged aggregate
+    """
+    chunks = iter_chunks(expand_paths(paths), chunk_size)
+    total = ReplayStats()
+    if workers == 1:
+        for chunk in chunks:
+            total.merge(analyze_chunk(chunk))
+    else:
+        window = (workers or os.cpu_count() or 1) * CHUNKS_IN_FLIGHT_PER_WORKER
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            in_flight = set()
+            for chunk in chunks:
+                if len(in_flight) >= window:
+                    done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        total.merge(future.result())
+                in_flight.add(executor.submit(analyze_chunk, chunk))
+            for future in wait(in_flight).done:
+                total.merge(future.result())
+    return total
+
+
+def main():
+    """Command-line entry point for nightly replay reports."""
+    default_dir = os.path.dirname(user_data_path("replays", "replays.jsonl"))
+    parser = argparse.ArgumentParser(description="Aggregate Battleships replay files.")
+    parser.add_argument("paths", nargs="*", default=[default_dir],
+                        help="Replay files or folders (default: the user replay folder)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Worker processes (default: CPU count, 1 = no subprocesses)")
+    parser.add_argument("--chunk-mb", type=float, default=CHUNK_SIZE / (1024 * 1024),
+                        help="Chunk size in megabytes")
+    parser.add_argument("--json", metavar="PATH", help="Also write the full report as JSON")
+    args = parser.parse_args()
+
+    stats = analyze(args.paths, args.workers, max(1, int(args.chunk_mb * 1024 * 1024)))
+    print(stats.format_report())
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(stats.to_dict(), f)
+
+
+if __name__ == "__main__":
+    main()
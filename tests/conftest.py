@@ -0,0 +1,5 @@
+# Battleships Tests - Make the game modules in the project folder importable
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,31 @@
+# Battleships Board Tests - Attack bookkeeping at the edges of the grid
+import pytest
+
+from Battleships import Board
+
+
+@pytest.mark.parametrize("row, col", [(0, 10), (10, 0), (-1, 0), (0, -1), (10, 10), (-1, -1)])
+def test_off_board_cells_are_not_untried(row, col):
+    board = Board(is_player=False)
+    assert not board.is_untried(row, col)
+
+
+def test_off_board_cell_does_not_alias_a_board_cell():
+    board = Board(is_player=False)
+    board.place_ships_randomly()
+    board.register_attack(1, 0)
+    assert not board.is_untried(1, 0)
+    for row, col in [(0, 10), (-1, 0)]:
+        result, hit_ship = board.register_attack(row, col)
+        assert "Out of range" in result and hit_ship is None
+    assert len(board.untried) == 99
+    assert board.last_attack[:2] == (1, 0)
+
+
+def test_corner_cells_are_untried_until_attacked():
+    board = Board(is_player=False)
+    board.place_ships_randomly()
+    for row, col in [(0, 0), (0, 9), (9, 0), (9, 9)]:
+        assert board.is_untried(row, col)
+        board.register_attack(row, col)
+        assert not board.is_untried(row, col)
@@ -0,0 +1,79 @@
+# Battleships Game Loop Tests - The event-loop game against its background AI move
+import asyncio
+import threading
+import time
+
+import pytest
+
+from Battleships import BattleshipGame, NullAudioBackend, Pacer
+
+# How long the background AI move keeps working on the AI's state
+AI_THINK_SECONDS = 0.3
+
+
+@pytest.fixture
+def game(tmp_path, monkeypatch):
+    """A silent, instant game one player shot away from a win, with its files in tmp_path."""
+    monkeypatch.setenv("XDG_DATA_HOME", str(tmp_path / "data"))
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    game = BattleshipGame(Pacer(instant=True, skip_on_keypress=False), NullAudioBackend())
+    game.player, game.ai = game.pool.acquire("hard")
+    game.player.board.place_ships_randomly()
+    game.ai.board.place_ships_randomly()
+    *sunk, last = [cell for ship in game.ai.board.ships.values() for cell in ship.positions]
+    for row, col in sunk:
+        game.ai.board.register_attack(row, col)
+    game.ui.get_attack_coordinates = lambda: last
+    game.ui.display_boards = lambda *args: None
+    game._handle_player_win = lambda: None
+    yield game
+    game.career.close()
+
+
+def test_player_win_waits_for_background_ai_move(game):
+    thinking = threading.Event()
+
+    def slow_ai_target():
+        thinking.set()
+        time.sleep(AI_THINK_SECONDS)
+        thinking.clear()
+        return (0, 0), AI_THINK_SECONDS
+
+    def type_winning_shot():
+        # The human answers while the AI is still working on its next move
+        thinking.wait()
+        return last
+
+    last = game.ui.get_attack_coordinates()
+    recorded_while_thinking = []
+    game._timed_ai_target = slow_ai_target
+    game.ui.get_attack_coordinates = type_winning_shot
+    game._record_heatmaps = lambda: recorded_while_thinking.append(thinking.is_set())
+
+    asyncio.run(game.play_game_async())
+
+    assert recorded_while_thinking == [False]
+    assert game._ai_move is None
+
+
+def test_failed_turn_waits_for_background_ai_move(game):
+    finished = threading.Event()
+
+    def slow_ai_target():
+        time.sleep(AI_THINK_SECONDS)
+        finished.set()
+        return (0, 0), AI_THINK_SECONDS
+
+    def no_more_input():
+        raise EOFError
+
+    async def play_until_input_ends():
+        with pytest.raises(EOFError):
+            await game.play_game_async()
+        # Checked inside the loop, asyncio.run() itself joins leftover threads on the way out
+        return finished.is_set()
+
+    game._timed_ai_target = slow_ai_target
+    game.ui.get_attack_coordinates = no_more_input
+
+    assert asyncio.run(play_until_input_ends())
@@ -0,0 +1,24 @@
+# Battleships Game Pool Tests - Pooled players after resuming a saved game
+import os
+
+from Battleships import GamePool, HeatmapStore, PlacementStore, SaveGame
+
+
+def test_resumed_players_keep_learned_priors(tmp_path):
+    heatmaps = HeatmapStore(os.path.join(tmp_path, "heatmaps"))
+    placements = PlacementStore(os.path.join(tmp_path, "placements"))
+    key = HeatmapStore.key(10, 10, "human")
+    pool = GamePool(heatmaps, max_size=1, placements=placements)
+
+    player, ai = pool.acquire("hard")
+    player.setup()
+    ai.setup()
+    placements.record_board(key, player.board)
+    ai.fire_at(*ai.choose_target(player.board), player.board, announce=False)
+    # load_game() hands a restored game's players back to the pool like this
+    pool.release(*SaveGame.decode(SaveGame.encode(player, ai, 1))[:2])
+
+    player, ai = pool.acquire("hard")
+    assert ai.heatmaps is heatmaps
+    assert ai.placements is placements
+    assert ai.prior_map is not None
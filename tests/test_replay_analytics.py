@@ -0,0 +1,49 @@
+# Battleships Replay Analytics Tests - Malformed shot records are never partly counted
+import pytest
+
+from replay_analytics import ReplayStats
+
+SHOT = {"type": "shot", "game": "g", "turn": 3, "shooter": "cpu", "difficulty": "hard",
+        "row": 4, "col": 5, "outcome": "sunk", "ship": "Destroyer", "think_ms": 1.5}
+
+
+def counters(stats):
+    """Everything a report shows except the record counts."""
+    report = stats.to_dict()
+    del report["records"], report["malformed"]
+    return report
+
+
+def test_valid_shot_is_counted():
+    stats = ReplayStats()
+    stats.add(SHOT)
+    assert stats.malformed == 0
+    assert stats.shots["cpu"][45] == stats.hits["cpu"][45] == 1
+    assert stats.sinks["cpu"]["Destroyer"][2] == 1
+
+
+@pytest.mark.parametrize("change", [
+    {"ship": "Dinghy"},
+    {"ship": None},
+    {"shooter": "spectator"},
+    {"row": 10},
+    {"col": -1},
+    {"row": True},
+    {"col": "5"},
+    {"turn": "soon"},
+    {"turn": float("inf")},
+    {"outcome": "graze"},
+])
+def test_malformed_shot_changes_nothing(change):
+    stats = ReplayStats()
+    stats.add({**SHOT, **change})
+    assert stats.records == stats.malformed == 1
+    assert counters(stats) == counters(ReplayStats())
+
+
+@pytest.mark.parametrize("field", ["shooter", "row", "col", "turn", "outcome", "ship"])
+def test_shot_missing_a_field_changes_nothing(field):
+    stats = ReplayStats()
+    stats.add({name: value for name, value in SHOT.items() if name != field})
+    assert stats.malformed == 1
+    assert counters(stats) == counters(ReplayStats())
@@ -0,0 +1,53 @@
+# Battleships Startup Tests - Import time budget and deferred heavy dependencies
+import os
+import py_compile
+import subprocess
+import sys
+
+import pytest
+
+# Import-time budget for the game module in milliseconds
+STARTUP_BUDGET_MS = 100
+
+# Fresh interpreters measured, the fastest run counts
+RUNS = 5
+
+# Dependencies only the features that use them may import
+HEAVY_MODULES = ("pygame", "pyfiglet", "keyboard", "numpy", "asyncio")
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROBE = ("import sys, time; t = time.perf_counter(); import Battleships; "
+         "print((time.perf_counter() - t) * 1000); "
+         f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))")
+
+
+def import_game():
+    """
+    Import the game module in a fresh interpreter.
+
+    Returns:
+        tuple: (import time in milliseconds, list of heavy modules loaded)
+    """
+    output = subprocess.run([sys.executable, "-c", PROBE], cwd=ROOT, check=True,
+                            capture_output=True, text=True).stdout.splitlines()
+    heavy = output[1].split(",") if len(output) > 1 and output[1] else []
+    return float(output[0]), heavy
+
+
+@pytest.fixture(scope="module")
+def imports():
+    """Import timings and heavy modules of several fresh interpreters."""
+    # Installed games run from cached bytecode, so a stale .pyc must not count as startup time
+    py_compile.compile(os.path.join(ROOT, "Battleships.py"), doraise=True)
+    return [import_game() for _ in range(RUNS)]
+
+
+def test_import_within_budget(imports):
+    best = min(ms for ms, _ in imports)
+    assert best <= STARTUP_BUDGET_MS, f"importing Battleships took {best:.1f} ms, budget {STARTUP_BUDGET_MS} ms"
+
+
+def test_no_heavy_modules_at_import(imports):
+    for _, heavy in imports:
+        assert heavy == [], f"heavy modules loaded at import: {', '.join(heavy)}"
@@ -0,0 +1,51 @@
+# Battleships Store Tests - Learned priors shared between processes through their files
+import os
+import time
+
+import pytest
+
+from Battleships import Board, HeatmapStore, PlacementStore
+
+KEY = HeatmapStore.key(10, 10, "human")
+
+
+def finished_board():
+    """A randomly placed board with every cell attacked."""
+    board = Board(is_player=True)
+    board.place_ships_randomly()
+    for row in range(10):
+        for col in range(10):
+            board.register_attack(row, col)
+    return board
+
+
+def age(store):
+    """Backdate a store's file past the racy window, as if it was written long ago."""
+    path = store._path(KEY)
+    past = time.time_ns() - 10 * 10 ** 9
+    os.utime(path, ns=(past, past))
+
+
+@pytest.mark.parametrize("store_type", [HeatmapStore, PlacementStore])
+def test_priors_follow_writes_by_another_process(tmp_path, store_type):
+    # Two stores on one folder stand in for two processes sharing it
+    reader = store_type(str(tmp_path))
+    writer = store_type(str(tmp_path))
+    writer.record_board(KEY, finished_board())
+    age(writer)
+
+    first = reader.priors(KEY)
+    assert first is not None
+    assert reader.priors(KEY) is first
+
+    for _ in range(3):
+        writer.record_board(KEY, finished_board())
+    age(writer)
+    assert reader.priors(KEY) is not first
+    assert reader.priors(KEY) == store_type(str(tmp_path)).priors(KEY)
+
+
+def test_recently_written_priors_are_not_cached(tmp_path):
+    reader = HeatmapStore(str(tmp_path))
+    HeatmapStore(str(tmp_path)).record_board(KEY, finished_board())
+    assert reader.priors(KEY) is not reader.priors(KEY)
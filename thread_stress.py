@@ -0,0 +1,209 @@
+# Battleships Thread Stress - Many games on many threads sharing one set of caches
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+import traceback
+
+from Battleships import EndgameSolver, GamePool, HeatmapStore, PlacementStore, Ship
+
+# Shots on a full fleet, the most hits any board can show
+FLEET_CELLS = 17
+
+# Thread switch interval while stressing, far below the default 5 ms so races surface quickly
+SWITCH_INTERVAL = 1e-5
+
+
+def check_view(view, seen, board_id):
+    """
+    Check that a board view is internally consistent and newer than the last one read.
+
+    Args:
+        view (BoardView): The view to check
+        seen (dict): Last version read per board, updated in place
+        board_id (int): Identity of the board the view came from
+
+    Returns:
+        str: Description of the first problem found, or None
+    """
+    if view.version < seen.get(board_id, -1):
+        return f"view version went back from {seen[board_id]} to {view.version}"
+    seen[board_id] = view.version
+
+    hits = sum(row.count("X") for row in view.visible)
+    if hits != sum(row.count("X") for row in view.hidden):
+        return "visible and hidden grids disagree on hits"
+    if hits > FLEET_CELLS:
+        return f"{hits} hits on a fleet of {FLEET_CELLS} cells"
+    if view.last_attack is not None:
+        row, col, outcome, _ = view.last_attack
+        if view.visible[row][col] != ("O" if outcome == "miss" else "X"):
+            return f"last attack {row},{col} ({outcome}) is not on the grid"
+    return None
+
+
+def play_games(pool, stores, difficulty, games, slot, live, errors, shots_fired):
+    """
+    Play silent games on one thread, checking every published view against the grids.
+
+    Args:
+        pool (GamePool): Pool shared by every thread
+        stores (tuple): (heatmaps, placements) shared by every thread
+        difficulty (str): The AI difficulty - "normal" or "hard"
+        games (int): Games to play
+        slot (int): Index in live where the current game is published for readers
+        live (list): Games in progress, one (player, ai) pair or None per writer
+        errors (list): Problems found, appended to
+        shots_fired (list): Shots per writer, updated in place for the final store check
+    """
+    heatmaps, placements = stores
+    key = HeatmapStore.key(10, 10, "human")
+    for _ in range(games):
+        player, ai = pool.acquire(difficulty)
+        if any(game is not None and (game[0] is player or game[1] is ai) for game in live):
+            errors.append(f"writer {slot}: pool handed out a pair that is still in play")
+        board = player.board
+        board.place_ships_randomly()
+        live[slot] = (player, ai)
+        shots = 0
+        while not board.all_ships_sunk():
+            row, col = ai.choose_target(board)
+            ai.fire_at(row, col, board, announce=False)
+            shots += 1
+            if board.view.visible != tuple(map(tuple, board.visible_grid)):
+                errors.append(f"writer {slot}: view differs from the grid after shot {shots}")
+        if shots != 100 - len(board.untried):
+            errors.append(f"writer {slot}: {shots} shots but {100 - len(board.untried)} cells tried")
+        shots_fired[slot] += shots
+        live[slot] = None
+        heatmaps.record_board(key, board)
+        placements.record_board(key, board)
+        pool.release(player, ai)
+
+
+def read_views(live, stop, errors, reads):
+    """
+    Read board views like a spectator until told to stop, without any locks.
+
+    Args:
+        live (list): Games in progress, filled by the writers
+        stop (threading.Event): Set once the writers are done
+        errors (list): Problems found, appended to
+        reads (list): Views checked, one counter per reader, updated in place
+    """
+    seen = {}
+    index = len(reads)
+    reads.append(0)
+    while not stop.is_set():
+        for game in list(live):
+            if game is None:
+                continue
+            for board in (game[0].board, game[1].board):
+                problem = check_view(board.view, seen, id(board))
+                if problem is not None:
+                    errors.append(f"reader {index}: {problem}")
+                reads[index] += 1
+
+
+def run_stress(threads=8, games=25, readers=4, difficulty="hard", solver_cache=64, directory=None):
+    """
+    Play games on many threads at once and watch them from reader threads.
+    The writers share one game pool, one heatmap and placement store and the
+    endgame solver cache, which is shrunk so evictions race constantly.
+    The stores flush after every game, and their files must end up holding
+    exactly the shots and fleets played, so a lost or doubled update fails.
+
+    Args:
+        threads (int): Writer threads, each playing its own games
+        games (int): Games per writer
+        readers (int): Reader threads checking views while the games run
+        difficulty (str): The AI difficulty - "normal" or "hard"
+        solver_cache (int): Endgame solver cache size during the run
+        directory (str): Folder for the shared stores, a temporary one if None
+
+    Returns:
+        dict: games, seconds, reads and the list of errors
+    """
+    with tempfile.TemporaryDirectory() as scratch:
+        directory = directory or scratch
+        stores = (HeatmapStore(os.path.join(directory, "heatmaps")),
+                  PlacementStore(os.path.join(directory, "placements")))
+        pool = GamePool(stores[0], max_size=threads, placements=stores[1])
+        live = [None] * threads
+        shots_fired = [0] * threads
+        errors = []
+        reads = []
+        stop = threading.Event()
+
+        def guarded(target, *args):
+            try:
+                target(*args)
+            except Exception:
+                errors.append(traceback.format_exc())
+
+        cache_size = EndgameSolver.CACHE_SIZE
+        switch_interval = sys.getswitchinterval()
+        EndgameSolver.CACHE_SIZE = solver_cache
+        sys.setswitchinterval(SWITCH_INTERVAL)
+        try:
+            watchers = [threading.Thread(target=guarded, args=(read_views, live, stop, errors, reads))
+                        for _ in range(readers)]
+            writers = [threading.Thread(target=guarded,
+                                        args=(play_games, pool, stores, difficulty, games, slot, live, errors,
+                                              shots_fired))
+                       for slot in range(threads)]
+            started = time.perf_counter()
+            for thread in watchers + writers:
+                thread.start()
+            for thread in writers:
+                thread.join()
+            seconds = time.perf_counter() - started
+            stop.set()
+            for thread in watchers:
+                thread.join()
+        finally:
+            EndgameSolver.CACHE_SIZE = cache_size
+            sys.setswitchinterval(switch_interval)
+
+        key = HeatmapStore.key(10, 10, "human")
+        heatmap = stores[0].view(key)
+        table = stores[1].view(key)
+        expected = {"heatmap shots": sum(shots_fired), "heatmap hits": threads * games * FLEET_CELLS,
+                    "placed ships": threads * games * len(Ship.SHIP_SIZES)}
+        found = {"heatmap shots": int(heatmap[HeatmapStore.SHOTS].sum()) if heatmap is not None else 0,
+                 "heatmap hits": int(heatmap[HeatmapStore.HITS].sum()) if heatmap is not None else 0,
+                 "placed ships": int(table.sum()) if table is not None else 0}
+        for name, count in expected.items():
+            if found[name] != count:
+                errors.append(f"stores hold {found[name]} {name}, {count} were played")
+        del heatmap, table
+    return {"games": threads * games, "seconds": seconds, "reads": sum(reads), "errors": errors}
+
+
+def main():
+    """Command-line entry point for the thread stress run."""
+    parser = argparse.ArgumentParser(description="Stress Battleships games, views and shared caches on many threads.")
+    parser.add_argument("--threads", type=int, default=8, help="Writer threads (default: 8)")
+    parser.add_argument("--games", type=int, default=25, help="Games per writer thread (default: 25)")
+    parser.add_argument("--readers", type=int, default=4, help="Lock-free view reader threads (default: 4)")
+    parser.add_argument("--difficulty", choices=["normal", "hard"], default="hard", help="AI difficulty")
+    parser.add_argument("--solver-cache", type=int, default=64,
+                        help="Endgame solver cache size during the run, small to force evictions (default: 64)")
+    args = parser.parse_args()
+
+    gil = getattr(sys, "_is_gil_enabled", lambda: True)()
+    result = run_stress(args.threads, args.games, args.readers, args.difficulty, args.solver_cache)
+    print(f"Thread stress: {result['games']} {args.difficulty} games on {args.threads} threads "
+          f"in {result['seconds']:.2f}s ({result['games'] / result['seconds']:.1f} games/s), "
+          f"{result['reads']} views read by {args.readers} readers, GIL {'on' if gil else 'off'}")
+    for problem in result["errors"]:
+        print(f"  FAIL {problem}")
+    if result["errors"]:
+        sys.exit(1)
+    print("  ok   no races detected")
+
+
+if __name__ == "__main__":
+    main()